@@ -20,12 +20,17 @@ from PyQt6.QtWidgets import QToolButton
 from PyQt6.QtWidgets import QVBoxLayout
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import pyqtSignal, QObject
+from PyQt6 import sip
 
 import style_sheet as ss
 from logger import Logger
-from utils import run, get_controller_interface_details, get_controllers_connected
+from utils import get_controller_interface_details, get_controllers_connected
 from UI_lib.uihost import TestApplication
 from UI_lib.test_controller import TestControllerUI
+from UI_lib.controller_watcher import ControllerWatcher
+from UI_lib.results_dialog import ResultsTableDialog
+from UI_lib.background_task import BackgroundTask
+from Backend_lib.Linux.controller_probe import bring_up, probe_controllers, health_headers, health_rows, health_summary
 
 class CustomDialog(QDialog):
 
@@ -73,12 +78,17 @@ class BluetoothUIApp(QMainWindow):
         self.controllers_list_widget = None
         self.controllers_list_layout = None
         self.test_application = None
+        self.probe_controllers_button = None
+        self.probe_task = None
         self.test_controller = None
         self.previous_row_selected = None
         self.bd_address = None
         self.interface = None
         self.background_path = None
         self.controllers_list = {}
+        self.controller_watcher = ControllerWatcher(self.log, self)
+        self.controller_watcher.controller_added.connect(self.controller_plugged)
+        self.controller_watcher.controller_removed.connect(self.controller_unplugged)
         self.list_controllers()
 
     def logger_init(self):
@@ -158,6 +168,17 @@ class BluetoothUIApp(QMainWindow):
         self.test_application.setStyleSheet(ss.select_button_style_sheet)
         button_layout1.addWidget(self.test_application)
         buttons_layout.addLayout(button_layout1, 0, 1)
+        button_layout2 = QHBoxLayout()
+        self.probe_controllers_button = QToolButton()
+        self.probe_controllers_button.setText("Probe Controllers")
+        self.probe_controllers_button.clicked.connect(self.probe_controllers_clicked)
+        self.probe_controllers_button.setFixedSize(200, 80)
+        self.probe_controllers_button.setStyleSheet(ss.select_button_style_sheet)
+        button_layout2.addWidget(self.probe_controllers_button)
+        if self.probe_task is not None and self.probe_task.is_running():
+            # A probe started from an earlier main screen is still running
+            self.show_probe_running()
+        buttons_layout.addLayout(button_layout2, 0, 2)
         main_layout.addLayout(buttons_layout)
         main_layout.addStretch(1)
         widget = QWidget()
@@ -210,7 +231,7 @@ class BluetoothUIApp(QMainWindow):
         if controller in self.controllers_list:
             self.interface = self.controllers_list[controller]
 
-        run(self.log, f"hciconfig -a {self.interface} up")
+        bring_up(self.interface, self.log)
 
         if self.previous_row_selected:
             self.controllers_list_widget.takeItem(self.previous_row_selected)
@@ -221,6 +242,50 @@ class BluetoothUIApp(QMainWindow):
         self.controllers_list_widget.insertItem(row + 1, item)
         self.previous_row_selected = row + 1
 
+    def _visible_controllers_list(self):
+        widget = self.controllers_list_widget
+        # The list is deleted with the main screen when a test view replaces it
+        return None if widget is None or sip.isdeleted(widget) else widget
+
+    def controller_plugged(self, address, interface):
+        """
+        Adds a controller that was plugged in to the list shown on the main screen.
+
+        Args:
+            address (str): Controller BD address.
+            interface (str): Controller interface name.
+        returns: None
+        """
+        widget = self._visible_controllers_list()
+        if widget is None or widget.findItems(address, Qt.MatchFlag.MatchExactly):
+            return
+        self.add_items(widget, [address], Qt.AlignmentFlag.AlignHCenter)
+
+    def controller_unplugged(self, address, interface):
+        """
+        Removes a controller that was unplugged from the list shown on the main screen,
+        with its details row if it was selected.
+
+        Args:
+            address (str): Controller BD address.
+            interface (str): Controller interface name.
+        returns: None
+        """
+        if self.bd_address == address:
+            self.bd_address = None
+            self.interface = None
+        widget = self._visible_controllers_list()
+        if widget is None:
+            return
+        for item in widget.findItems(address, Qt.MatchFlag.MatchExactly):
+            row = widget.row(item)
+            if self.previous_row_selected == row + 1:
+                widget.takeItem(self.previous_row_selected)
+                self.previous_row_selected = None
+            elif self.previous_row_selected and row < self.previous_row_selected:
+                self.previous_row_selected -= 1
+            widget.takeItem(row)
+
     def check_controller_selected(self):
         """
         Checks if a controller is selected before navigating to the controller testing screen.
@@ -230,7 +295,7 @@ class BluetoothUIApp(QMainWindow):
         returns: None
         """
         if self.bd_address:
-            run(self.log, f"hciconfig -a {self.interface} up")
+            bring_up(self.interface, self.log)
             self.setWindowTitle('Test Controller')
             self.setCentralWidget(TestControllerUI(interface=self.interface, back_callback=self.show_main, log_path=self.log_path))
 
@@ -240,6 +305,72 @@ class BluetoothUIApp(QMainWindow):
             if not dlg.exec():
                 self.list_controllers()
 
+    def probe_controllers_clicked(self):
+        """
+        Brings every attached controller up and probes them in parallel in a BackgroundTask; their health
+        table is shown when the probe finishes.
+
+        args: None
+        returns: None
+        """
+        if self.probe_task is not None and self.probe_task.is_running():
+            return
+        self.show_probe_running()
+        self.probe_task = BackgroundTask(self.timed_probe, self.log)
+        self.probe_task.finished.connect(self.probe_finished)
+        self.probe_task.failed.connect(self.probe_failed)
+        self.probe_task.start()
+
+    @staticmethod
+    def timed_probe(log):
+        """
+        Probes every controller; runs in the probe task's thread.
+
+        Args:
+            log (Logger): Logger instance used for logging.
+
+        Returns:
+            tuple: (ProbeResult list, elapsed seconds).
+        """
+        start = time.perf_counter()
+        results = probe_controllers(log=log)
+        return results, time.perf_counter() - start
+
+    def probe_finished(self, outcome):
+        """
+        Shows the health table of a finished probe.
+
+        args: outcome (tuple): (ProbeResult list, elapsed seconds) from timed_probe.
+        returns: None
+        """
+        self.reset_probe_button()
+        results, elapsed = outcome
+        summary = health_summary(results, elapsed)
+        self.log.info(f"[INFO] {summary}")
+        ResultsTableDialog("Controller health", health_headers, health_rows(results), summary=summary,
+                           parent=self).exec()
+
+    def probe_failed(self, error):
+        self.reset_probe_button()
+        self.log.error(f"[ERROR] Probing controllers failed: {error}")
+
+    def _visible_probe_button(self):
+        button = self.probe_controllers_button
+        # The button is deleted with the main screen when a test view replaces it
+        return None if button is None or sip.isdeleted(button) else button
+
+    def show_probe_running(self):
+        button = self._visible_probe_button()
+        if button:
+            button.setEnabled(False)
+            button.setText("Probing...")
+
+    def reset_probe_button(self):
+        button = self._visible_probe_button()
+        if button:
+            button.setEnabled(True)
+            button.setText("Probe Controllers")
+
     def check_application_selected(self):
         """
         Checks if controller is selected before navigating to the application testing screen.
@@ -265,7 +396,7 @@ class BluetoothUIApp(QMainWindow):
         if self.centralWidget():
             self.centralWidget().deleteLater()
 
-        run(self.log, f"hciconfig -a {self.interface} up")
+        bring_up(self.interface, self.log)
         self.setWindowTitle('Test Host')
         print(f"[DEBUG] self.log_path before setting TestApplication: {self.log_path}")
 
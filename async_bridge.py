@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class AsyncBridge(QObject):
+
+    """
+    Runs coroutines (e.g. AsyncBluetoothDeviceManager calls) on an asyncio
+    event loop in a background thread and hands their results back to the GUI
+    thread.
+
+    A slot submits a coroutine and returns at once; when it finishes, its
+    callback (or errback) is called in the GUI thread through a queued
+    signal, so it may update widgets. Submitted coroutines run concurrently.
+    """
+
+    _completed = pyqtSignal(object, object, object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, log=None, parent=None):
+        """
+        Starts the event loop thread.
+
+        Args:
+            log (Logger, optional): Logger instance used for logging.
+            parent (QObject, optional): Parent object.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.log = log
+        self.loop = asyncio.new_event_loop()
+        self._completed.connect(self._dispatch)
+        self.thread = threading.Thread(target=self._run_loop, name="asyncio-bridge", daemon=True)
+        self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine, callback=None, errback=None):
+        """
+        Schedules a coroutine on the bridge's event loop.
+
+        Args:
+            coroutine (coroutine): Coroutine to run.
+            callback (callable, optional): Called in the GUI thread with the coroutine's result.
+            errback (callable, optional): Called in the GUI thread with the exception if it raised; the
+                failed signal is emitted instead if omitted.
+
+        Returns:
+            concurrent.futures.Future: Future of the coroutine's result, e.g. to cancel it.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+        def done(finished):
+            if finished.cancelled():
+                return
+            error = finished.exception()
+            self._completed.emit(callback, errback, None if error else finished.result(), error)
+
+        future.add_done_callback(done)
+        return future
+
+    def _dispatch(self, callback, errback, result, error):
+        if error is None:
+            if callback is not None:
+                callback(result)
+        elif errback is not None:
+            errback(error)
+        else:
+            if self.log:
+                self.log.info(f"[ERROR] Background operation failed: {error!r}")
+            self.failed.emit(str(error))
+
+    def close(self, timeout=5.0):
+        """
+        Cancels pending coroutines and stops the event loop thread.
+
+        args: timeout (float): Seconds to wait for the thread.
+        returns: None
+        """
+        if not self.loop.is_running():
+            return
+
+        async def cancel_all():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.loop.stop()
+
+        asyncio.run_coroutine_threadsafe(cancel_all(), self.loop)
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self.loop.close()
@@ -0,0 +1,81 @@
+from PyQt6.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+
+# Tasks still running; keeps them (and their QThreads) alive until they finish
+_running = set()
+
+
+class _TaskWorker(QObject):
+
+    done = pyqtSignal(object, object)
+
+    def __init__(self, function, args, kwargs):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            self.done.emit(None, e)
+            return
+        self.done.emit(result, None)
+
+
+class BackgroundTask(QObject):
+
+    """
+    Runs one blocking call (an HCI fan-out, a script, a probe) in its own
+    QThread, the way HciDecodeWorker runs off the GUI thread.
+
+    The task object lives in the thread that created it, so finished and
+    failed are emitted there: slots connected to them may update widgets.
+    The task keeps itself alive until the call returns.
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, function, *args, **kwargs):
+        """
+        Prepares the task; nothing runs until start().
+
+        Args:
+            function (callable): Blocking function to call in the worker thread.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+        returns:
+            None
+        """
+        super().__init__()
+        self.thread = QThread()
+        self.worker = _TaskWorker(function, args, kwargs)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.done.connect(self._done)
+
+    def start(self):
+        """
+        Starts the call in the worker thread.
+
+        args: None
+        returns: None
+        """
+        _running.add(self)
+        self.thread.start()
+
+    def is_running(self):
+        return self in _running
+
+    @pyqtSlot(object, object)
+    def _done(self, result, error):
+        self.thread.quit()
+        self.thread.wait()
+        _running.discard(self)
+        if error is None:
+            self.finished.emit(result)
+        else:
+            self.failed.emit(f"{type(error).__name__}: {error}")
@@ -2,7 +2,6 @@ import dbus
 import dbus.service
 import dbus.mainloop.glib
 import os
-import re
 import subprocess
 import time
 from threading import Thread
@@ -10,8 +9,12 @@ from gi.repository import GLib
 import socket
 
 from logger import Logger
-from Backend_lib.Linux import hci_commands as hci
-from utils import run
+from utils import run, run_hci_cmd, convert_to_little_endian
+from Backend_lib.Linux.process_supervisor import ProcessSupervisor, kill_matching
+from Backend_lib.Linux.controller_registry import ControllerRegistry
+from Backend_lib.Linux.controller_details import ControllerDetailsCache
+from Backend_lib.Linux.bluez_object_cache import BluezObjectCache
+from Backend_lib.Linux.bluez_async import AsyncBluetoothDeviceManager
 import constants
 
 try:
@@ -22,6 +25,9 @@ except ImportError:
 # Set the D-Bus main loop
 dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
 
+a2dp_source_uuid = "0000110a-0000-1000-8000-00805f9b34fb"
+a2dp_sink_uuid = "0000110b-0000-1000-8000-00805f9b34fb"
+
 
 
 class BluetoothDeviceManager:
@@ -45,18 +51,18 @@ class BluetoothDeviceManager:
         self.agent = None
         self.bus = None
         self.device_address = None
-        self.stream_process = None
         self.device_path = None
         self.device_sink = None
         self.devices = {}
         self.last_session_path = None
-        self.opp_process = None
         self.bd_address = None
         self.controllers_list = {}
         self.handles = None
-        self.bluetoothd_process = None
-        self.pulseaudio_process = None
-        self.hcidump_process = None
+        # Mirror of the BlueZ object tree, created once BlueZ is on the bus
+        self.object_cache = None
+        # Owns dbus-daemon, bluetoothd, pulseaudio, hcidump, obexpushd and aplay
+        self.supervisor = ProcessSupervisor.get_instance(self.log)
+        self.hcidump_interface = None
         self.bluetoothd_log_name = None
         self.pulseaudio_log_name = None
         self.hcidump_log_name = None
@@ -104,7 +110,7 @@ class BluetoothDeviceManager:
         """
 
         self.log.info("Starting D-Bus service...")
-        self.dbus_process = subprocess.Popen(constants.dbus_command, shell=True)
+        self.supervisor.start("dbus", constants.dbus_command, shell=True)
 
         # Wait for D-Bus system socket to become available
         dbus_socket_path = '/usr/local/bluez/dbus-1.12.20/var/run/dbus/system_bus_socket'
@@ -141,6 +147,24 @@ class BluetoothDeviceManager:
             self.adapter_proxy = self.bus.get_object(constants.bluez_service, self.adapter_path)
             self.adapter = dbus.Interface(self.adapter_proxy, constants.adapter_iface)
 
+    def get_async_manager(self, timeout=30.0):
+        """
+        Returns the asyncio variant of this manager's device operations for the current adapter.
+
+        Its coroutines do not block, so from Qt slots they are run through
+        UI_lib.async_bridge.AsyncBridge instead of calling connect, pair, etc. here.
+
+        Args:
+            timeout (float): Seconds to wait for each D-Bus reply.
+
+        Returns:
+            AsyncBluetoothDeviceManager: Manager bound to self.interface.
+
+        Raises:
+            RuntimeError: If dbus_next is not installed.
+        """
+        return AsyncBluetoothDeviceManager(self.interface, self.log, timeout)
+
     def setup_bluetooth_agent(self):
         """
         Waits for BlueZ to appear on D-Bus and registers the Bluetooth agent.
@@ -149,6 +173,7 @@ class BluetoothDeviceManager:
         self._wait_for_bluez()
         self.register_agent()
         self.log.info("Bluetooth agent registered successfully.")
+        self.object_cache = BluezObjectCache(self.bus, self.log)
 
     def start_discovery(self):
         """
@@ -368,13 +393,7 @@ class BluetoothDeviceManager:
         Returns:
             dict: Dictionary with BD address as key and interface as value.
         """
-        result = run(self.log, 'hciconfig -a | grep -B 2 \"BD A\"')
-        result = result.stdout.split("--")
-        if result[0]:
-            for res in result:
-                res = res.strip("\n").replace('\n', '')
-                if match := re.match('(.*):	Type:.+BD Address: (.*)  ACL(.*)', res):
-                    self.controllers_list[match[2]] = match[1]
+        self.controllers_list.update(ControllerRegistry.get_instance(self.log).addresses())
         self.log.info("Controllers {} found on host".format(self.controllers_list))
         return self.controllers_list
 
@@ -387,8 +406,8 @@ class BluetoothDeviceManager:
             str: Interface and Bus information.
         """
         self.interface = self.controllers_list[self.bd_address]
-        result = run(self.log, f"hciconfig -a {self.interface} | grep Bus")
-        return f"Interface: {self.interface} \t Bus: {result.stdout.split('Bus:')[1].strip()}"
+        controller = ControllerRegistry.get_instance(self.log).get(self.interface)
+        return controller.details() if controller else f"Interface: {self.interface} \t Bus: "
 
     def convert_mac_little_endian(self, address):
         """
@@ -415,25 +434,11 @@ class BluetoothDeviceManager:
         Returns:
             str: Little-endian formatted hex string.
         """
-        data = None
-        if isinstance(num, str) and '0x' in num:
-            data = num.replace("0x", "")
-        elif isinstance(num, str) and '0x' not in num:
-            data = int(num)
-            data = str(hex(data)).replace("0x", "")
-        elif isinstance(num, int):
-            data = str(hex(num)).replace("0x", "")
-        while True:
-            if len(data) == (num_of_octets * 2):
-                break
-            data = "0" + data
-        out = [(data[i:i + 2]) for i in range(0, len(data), 2)]
-        out.reverse()
-        return ' '.join(out)
+        return convert_to_little_endian(num, num_of_octets)
 
     def run_hci_cmd(self, ogf, command, parameters=None):
         """
-        Executes an HCI command with provided parameters.
+        Executes an HCI command with provided parameters on the current interface.
 
         Args:
             ogf (str): Opcode Group Field (e.g., '0x03').
@@ -441,21 +446,9 @@ class BluetoothDeviceManager:
             parameters (list): List of parameters for the command.
 
         Returns:
-            subprocess.CompletedProcess: Result of command execution.
-        """
-        _ogf = ogf.lower().replace(' ', '_')
-        _ocf_info = getattr(hci, _ogf)[command]
-        hci_command = 'hcitool -i {} cmd {} {}'.format(self.interface, hci.hci_commands[ogf], _ocf_info[0])
-        for index in range(len(parameters)):
-            param_len = list(_ocf_info[1][index].values())[1] if len(
-                _ocf_info[1][index].values()) > 1 else None
-            if param_len:
-                parameter = self.convert_to_little_endian(parameters[index], param_len)
-            else:
-                parameter = parameters[index].replace('0x', '')
-            hci_command = ' '.join([hci_command, parameter])
-        self.log.info(f"Executing command: {hci_command}")
-        return run(self.log, hci_command)
+            Result: Result of command execution.
+        """
+        return run_hci_cmd(ogf, command, self.interface, self.log, parameters or [])
 
     def get_connection_handles(self):
         """
@@ -506,13 +499,8 @@ class BluetoothDeviceManager:
         subprocess.run("pkill -f bluetoothd", shell=True)
 
         self.log.info(f"[INFO] Starting bluetoothd logs...")
-        self.bluetoothd_process = subprocess.Popen(
-            constants.bluetoothd_command.split(),
-            stdout=open(self.bluetoothd_log_name, 'a+'),
-            stderr=subprocess.STDOUT,
-            bufsize=1,
-            universal_newlines=True
-        )
+        self.supervisor.start("bluetoothd", constants.bluetoothd_command.split(), self.bluetoothd_log_name,
+                              restart=True, timestamp_lines=True)
 
 
         self.log.info(f"[INFO] Bluetoothd logs started: {self.bluetoothd_log_name}")
@@ -530,13 +518,8 @@ class BluetoothDeviceManager:
         subprocess.run("pkill -f pulseaudio", shell=True)
 
         self.log.info(f"[INFO] Starting pulseaudio logs...")
-        self.pulseaudio_process = subprocess.Popen(
-            constants.pulseaudio_command.split(),
-            stdout=open(self.pulseaudio_log_name, 'a+'),
-            stderr=subprocess.STDOUT,
-            bufsize=1,
-            universal_newlines=True
-        )
+        self.supervisor.start("pulseaudio", constants.pulseaudio_command.split(), self.pulseaudio_log_name,
+                              restart=True, timestamp_lines=True)
 
 
         self.log.info(f"[INFO] Pulseaudio logs started: {self.pulseaudio_log_name}")
@@ -565,13 +548,10 @@ class BluetoothDeviceManager:
             self.hcidump_log_name = os.path.join(self.log_path, f"{interface}_hcidump.log")
             self.log.info(f"[INFO] Starting hcidump: {constants.hcidump_command}")
 
-            self.hcidump_process = subprocess.Popen(
-                constants.hcidump_command.format(interface=interface).split(),
-                stdout=open(self.hcidump_log_name, 'a+'),
-                stderr=subprocess.STDOUT,
-                bufsize=1,
-                universal_newlines=True
-            )
+            self.supervisor.start(f"hcidump-{interface}",
+                                  constants.hcidump_command.format(interface=interface).split(),
+                                  self.hcidump_log_name, restart=True)
+            self.hcidump_interface = interface
 
             self.log.info(f"[INFO] hcidump process started: {self.hcidump_log_name}")
             return True
@@ -580,6 +560,26 @@ class BluetoothDeviceManager:
             self.log.info(f"[ERROR] Failed to start hcidump: {e}")
             return False
 
+    def _stop_daemon(self, name):
+        """
+        Stops a supervised daemon and waits for its log to be flushed.
+
+        Args:
+            name (str): Supervisor name of the daemon.
+
+        Returns:
+            bool: True if the process was stopped or had already exited, False if it was never started.
+        """
+        managed = self.supervisor.get(name)
+        if not managed:
+            self.log.info(f"No {name} process to stop.")
+            return False
+        if not managed.running():
+            self.log.info(f"{name} process already terminated.")
+        self.supervisor.stop(name)
+        self.log.info(f"{name} logs stopped successfully.")
+        return True
+
     def stop_bluetoothd_logs(self):
         """
         Stops the bluetoothd logging subprocess if it is running.
@@ -588,29 +588,7 @@ class BluetoothDeviceManager:
             bool: True if the process was terminated or already not running, False otherwise.
         """
         self.log.info("[INFO] Stopping bluetoothd logs...")
-
-        if not self.bluetoothd_process:
-            self.log.info("No bluetoothd process to stop.")
-            return False
-
-        if self.bluetoothd_process.poll() is not None:
-            self.log.info("bluetoothd process already terminated.")
-            self.bluetoothd_process = None
-            return True
-
-        try:
-            self.bluetoothd_process.terminate()
-            self.bluetoothd_process.wait(timeout=5)
-            self.log.info("bluetoothd logs stopped successfully.")
-        except subprocess.TimeoutExpired:
-            self.log.info("Termination timed out. Killing bluetoothd process...")
-            self.bluetoothd_process.kill()
-            self.bluetoothd_process.wait()
-            self.log.info("bluetoothd process killed.")
-
-        self.bluetoothd_process = None
-        return True
-
+        return self._stop_daemon("bluetoothd")
 
     def stop_pulseaudio_logs(self):
         """
@@ -620,29 +598,7 @@ class BluetoothDeviceManager:
             bool: True if the process was terminated or already not running, False otherwise.
         """
         self.log.info("[INFO] Stopping pulseaudio logs...")
-
-        if not self.pulseaudio_process:
-            self.log.info("No pulseaudio process to stop.")
-            return False
-
-        if self.pulseaudio_process.poll() is not None:
-            self.log.info("pulseaudio process already terminated.")
-            self.pulseaudio_process = None
-            return True
-
-        try:
-            self.pulseaudio_process.terminate()
-            self.pulseaudio_process.wait(timeout=5)
-            self.log.info("pulseaudio logs stopped successfully.")
-        except subprocess.TimeoutExpired:
-            self.log.info("Termination timed out. Killing pulseaudio process...")
-            self.pulseaudio_process.kill()
-            self.pulseaudio_process.wait()
-            self.log.info("pulseaudio process killed.")
-
-        self.pulseaudio_process = None
-        return True
-
+        return self._stop_daemon("pulseaudio")
 
     def stop_dump_logs(self):
         """
@@ -651,35 +607,33 @@ class BluetoothDeviceManager:
         Returns:
             bool: True if the process was stopped or not running, False if an error occurred.
         """
+        if not self.hcidump_interface:
+            return True
+        self.log.info("[INFO] Stopping HCI dump logs")
+        self.supervisor.stop(f"hcidump-{self.hcidump_interface}")
+        try:
+            # hcidump instances not started by this session, e.g. left over by a crashed one
+            kill_matching(f'hcidump.*{self.hcidump_interface}')
+        except Exception as e:
+            self.log.info(f"[ERROR] Error killing hcidump: {e}")
+            return False
+        self.hcidump_interface = None
+        self.log.info("[INFO] HCI dump logs stopped successfully")
+        return True
 
-        if self.hcidump_process:
-            self.log.info("[INFO] Stopping HCI dump logs")
-            try:
-                self.hcidump_process.terminate()
-                self.hcidump_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.hcidump_process.kill()
-                self.hcidump_process.wait()
-            self.hcidump_process = None
-            self.log.info("[INFO] HCI dump logs stopped successfully")
-
-        if self.hcidump_process:
-            try:
-                result = subprocess.run(['pgrep', '-f', f'hcidump.*{self.interface}'],
-                                        capture_output=True, text=True)
-                if result.stdout.strip():
-                    pids = result.stdout.strip().split('\n')
-                    for pid in pids:
-                        subprocess.run(['kill', '-TERM', pid])
-                    time.sleep(1)
-                    for pid in pids:
-                        subprocess.run(['kill', '-KILL', pid])
-            except Exception as e:
-                self.log.info(f"[ERROR] Error killing hcidump: {e}")
-                return False
-
+    def shutdown(self):
+        """
+        Stops every process started by the manager in parallel, within one grace period.
 
-        return True
+        args: None
+        returns: None
+        """
+        if self.object_cache is not None:
+            self.object_cache.close()
+            self.object_cache = None
+        self.supervisor.stop_many(["bluetoothd", "pulseaudio", "obexpushd", "a2dp-stream", "dbus"] +
+                                  ([f"hcidump-{self.hcidump_interface}"] if self.hcidump_interface else []))
+        self.hcidump_interface = None
 
     def get_controller_details(self, interface=None):
         """
@@ -707,30 +661,7 @@ class BluetoothDeviceManager:
             raise RuntimeError("Bluetooth interface must be provided")
 
         self.interface = interface
-        details = {}
-
-        # Ensure interface is up before querying
-        #self.run_command(f'hciconfig -a {self.interface} up')
-        result = self.run_command(f'hciconfig -a {self.interface}')
-
-        for line in result.stdout.split('\n'):
-            line = line.strip()
-            if match := re.match('BD Address: (.*) ACL(.*)', line):
-                details['BD_ADDR'] = match[1]
-            elif match := re.match('Link policy: (.*)', line):
-                details['Link policy'] = match[1]
-            elif match := re.match('Link mode: (.*)', line):
-                details['Link mode'] = match[1]
-            elif match := re.match('Name: (.*)', line):
-                details['Name'] = match[1]
-            elif match := re.match('Class: (.*)', line):
-                details['Class'] = match[1]
-            elif match := re.match(r'HCI Version: ([^ ]+ \([^)]+\))', line):
-                details['HCI Version'] = match[1]
-            elif match := re.match(r'LMP Version: ([^ ]+ \([^)]+\))', line):
-                details['LMP Version'] = match[1]
-            elif match := re.match('Manufacturer: (.*)', line):
-                details['Manufacturer'] = match[1]
+        details = ControllerDetailsCache.get_instance(self.log).get(interface)
 
         # Save as object attributes
         self.name = details.get('Name')
@@ -773,18 +704,11 @@ class BluetoothDeviceManager:
         self.stop_discovery()
 
         discovered = []
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"),constants.obj_iface)
-        objects = om.GetManagedObjects()
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                device_props = dbus.Interface(self.bus.get_object(constants.bluez_service, path),
-                                              dbus_interface=constants.props_iface)
-                try:
-                    address = device_props.Get(constants.device_iface, "Address")
-                    alias = device_props.Get(constants.device_iface, "Alias")
-                    discovered.append(f"{alias} ({address})")
-                except:
-                    continue
+        for props in self.object_cache.devices().values():
+            address = props.get("Address")
+            alias = props.get("Alias")
+            if address and alias:
+                discovered.append(f"{alias} ({address})")
         return discovered
 
     def _get_device_path(self, address):
@@ -804,18 +728,7 @@ class BluetoothDeviceManager:
         :param address: Bluetooth device MAC address.
         :return: D-Bus object path or None if not found.
         """
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-        objects = om.GetManagedObjects()
-
-        formatted_interface_path = f"/org/bluez/{self.interface}/"
-
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                if formatted_interface_path in path:  # Make sure it’s under the correct hci
-                    props = interfaces[constants.device_iface]
-                    if props.get("Address") == address:
-                        return path
-        return None
+        return self.object_cache.find_device(f"/org/bluez/{self.interface}", address)
 
     def connect(self, address):
         """
@@ -887,17 +800,7 @@ class BluetoothDeviceManager:
                   False if the removal failed or the device still exists afterward.
         """
         try:
-            obj = self.bus.get_object(constants.bluez_service, "/")
-            manager = dbus.Interface(obj, constants.obj_iface)
-            objects = manager.GetManagedObjects()
-
-            target_path = None
-            for path, interfaces in objects.items():
-                if constants.device_iface in interfaces:
-                    if interfaces[constants.device_iface].get("Address") == address and path.startswith(
-                            self.adapter_path):
-                        target_path = path
-                        break
+            target_path = self.object_cache.find_device(self.adapter_path, address)
 
             if not target_path:
                 self.log.info(f"Device with address {address} not found on {self.interface}")
@@ -911,13 +814,12 @@ class BluetoothDeviceManager:
             adapter.RemoveDevice(target_path)
             self.log.info(f"Requested removal of device {address} at path {target_path}")
 
-            # Wait and confirm the device was actually removed
-            for _ in range(5):  # retry for up to ~2.5 seconds
-                time.sleep(0.5)
-                objects = manager.GetManagedObjects()
-                if target_path not in objects:
+            # Wait for the InterfacesRemoved signal to confirm the device was actually removed
+            for _ in range(25):  # retry for up to ~2.5 seconds
+                if self.object_cache.get_properties(target_path) is None:
                     self.log.info(f"Device {address} removed successfully.")
                     return True
+                time.sleep(0.1)
 
             self.log.error(f"Device {address} still present after attempted removal.")
             return False
@@ -1013,14 +915,8 @@ class BluetoothDeviceManager:
         if not device_path:
             return False
 
-        props = dbus.Interface(
-            self.bus.get_object(constants.bluez_service, device_path),
-            constants.props_iface
-        )
-        try:
-            return props.Get(constants.device_iface, "Paired")
-        except dbus.exceptions.DBusException:
-            return False
+        props = self.object_cache.get_properties(device_path)
+        return bool(props and props.get("Paired", False))
 
     def is_device_connected(self, device_address):
         """
@@ -1037,23 +933,8 @@ class BluetoothDeviceManager:
             self.log.info(f"[DEBUG] Device path not found for {device_address} on {self.interface}")
             return False
 
-        try:
-            props = dbus.Interface(
-                self.bus.get_object(constants.bluez_service, device_path),
-                constants.props_iface
-            )
-            connected = props.Get(constants.device_iface, "Connected")
-
-            # Extra validation: make sure device is under the correct adapter/interface
-            if self.interface not in device_path:
-                self.log.info(f"[DEBUG] Device path {device_path} does not match interface {self.interface}")
-                return False
-
-            return connected
-
-        except dbus.exceptions.DBusException as e:
-            self.log.info(f"[DEBUG] DBusException while checking connection: {e}")
-            return False
+        props = self.object_cache.get_properties(device_path)
+        return bool(props and props.get("Connected", False))
 
     def sync_available_devices(self):
         """
@@ -1063,21 +944,17 @@ class BluetoothDeviceManager:
         returns: None
         """
         self.devices.clear()
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-        objects = om.GetManagedObjects()
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                props = interfaces[constants.device_iface]
-                address = props.get("Address")
-                name = props.get("Name", "Unknown")
-                uuids = props.get("UUIDs", [])
-                connected = props.get("Connected", False)
-                if address:
-                    self.devices[address] = {
-                        "Name": name,
-                        "UUIDs": uuids,
-                        "Connected": connected,
-                    }
+        for props in self.object_cache.devices().values():
+            address = props.get("Address")
+            name = props.get("Name", "Unknown")
+            uuids = props.get("UUIDs", [])
+            connected = props.get("Connected", False)
+            if address:
+                self.devices[address] = {
+                    "Name": name,
+                    "UUIDs": uuids,
+                    "Connected": connected,
+                }
 
     def get_paired_devices(self):
         """
@@ -1088,37 +965,25 @@ class BluetoothDeviceManager:
 
         """
         paired = {}
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-        objects = om.GetManagedObjects()
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                props = interfaces[constants.device_iface]
-                if props.get("Paired", False) and props.get("Adapter") == self.adapter_path:
-                    address = props.get("Address")
-                    name = props.get("Name", "Unknown")
-                    paired[address] = name
+        for props in self.object_cache.devices(self.adapter_path).values():
+            if props.get("Paired", False):
+                paired[props.get("Address")] = props.get("Name", "Unknown")
         return paired
 
     def get_connected_devices(self):
         """
         Retrieves all currently connected Bluetooth devices for the specified adapter.
 
-        This method queries the BlueZ D-Bus object manager and returns a dictionary
+        This method reads the BlueZ object cache and returns a dictionary
         of devices that are actively connected and match the adapter path.
 
         Returns:
             dict: A dictionary of connected devices
         """
         connected = {}
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-        objects = om.GetManagedObjects()
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                props = interfaces[constants.device_iface]
-                if props.get("Connected", False) and props.get("Adapter") == self.adapter_path:
-                    address = props.get("Address")
-                    name = props.get("Name", "Unknown")
-                    connected[address] = name
+        for props in self.object_cache.devices(self.adapter_path).values():
+            if props.get("Connected", False):
+                connected[props.get("Address")] = props.get("Name", "Unknown")
         return connected
 
     #--------------------OPP FUNCTIONS---------------------#
@@ -1207,17 +1072,15 @@ class BluetoothDeviceManager:
             if not os.path.exists(save_directory):
                 os.makedirs(save_directory)
 
-            if self.opp_process and self.opp_process.poll() is None:
-                self.opp_process.terminate()
-                self.opp_process.wait()
+            if self.supervisor.stop("obexpushd"):
                 self.log.info("Previous OPP server stopped.")
 
-            self.opp_process = subprocess.Popen([
+            self.supervisor.start("obexpushd", [
                 "obexpushd",
                 "-B",  # Bluetooth
                 "-o", save_directory,
                 "-n"  # No confirmation prompt
-            ])
+            ], restart=True)
 
             self.log.info(f"OPP server started. Receiving files to {save_directory}")
             return True
@@ -1232,9 +1095,7 @@ class BluetoothDeviceManager:
         args: None
         returns: None
         """
-        if self.opp_process and self.opp_process.poll() is None:
-            self.opp_process.terminate()
-            self.opp_process.wait()
+        if self.supervisor.stop("obexpushd"):
             self.log.info("OPP server stopped.")
 
 # -----------A2DP FUNCTIONS----------------------------#
@@ -1334,11 +1195,7 @@ class BluetoothDeviceManager:
                     return False
                 filepath = wav_file
 
-            self.stream_process = subprocess.Popen(
-                ["aplay", filepath],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            self.supervisor.start("a2dp-stream", ["aplay", filepath])
             return f"Streaming started with {filepath}"
         except Exception as e:
             return f"A2DP stream error: {str(e)}"
@@ -1368,9 +1225,7 @@ class BluetoothDeviceManager:
 
         :return: Status message.
         """
-        if self.stream_process:
-            self.stream_process.terminate()
-            self.stream_process = None
+        if self.supervisor.stop("a2dp-stream"):
             return "A2DP stream stopped"
         return "No active A2DP stream"
 
@@ -1385,19 +1240,9 @@ class BluetoothDeviceManager:
             dict: Dictionary of connected A2DP source devices (MAC -> Name)
         """
         connected = {}
-        #adapter_path = f"/org/bluez/{interface}"
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-        objects = om.GetManagedObjects()
-
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                props = interfaces[constants.device_iface]
-                if props.get("Connected", False) and props.get("Adapter") == self.adapter_path:
-                    uuids = props.get("UUIDs", [])
-                    if any("110a" in uuid.lower() for uuid in uuids):  # A2DP Source UUID
-                        address = props.get("Address")
-                        name = props.get("Name", "Unknown")
-                        connected[address] = name
+        for props in self.object_cache.devices(self.adapter_path, uuid=a2dp_source_uuid).values():
+            if props.get("Connected", False):
+                connected[props.get("Address")] = props.get("Name", "Unknown")
         return connected
 
     def get_connected_a2dp_sink_devices(self):
@@ -1411,19 +1256,9 @@ class BluetoothDeviceManager:
             dict: Dictionary of connected A2DP sink devices (MAC -> Name)
         """
         connected = {}
-        #adapter_path = f"/org/bluez/{interface}"
-        om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-        objects = om.GetManagedObjects()
-
-        for path, interfaces in objects.items():
-            if constants.device_iface in interfaces:
-                props = interfaces[constants.device_iface]
-                if props.get("Connected", False) and props.get("Adapter") == self.adapter_path:
-                    uuids = props.get("UUIDs", [])
-                    if any("110b" in uuid.lower() for uuid in uuids):  # A2DP Sink UUID
-                        address = props.get("Address")
-                        name = props.get("Name", "Unknown")
-                        connected[address] = name
+        for props in self.object_cache.devices(self.adapter_path, uuid=a2dp_sink_uuid).values():
+            if props.get("Connected", False):
+                connected[props.get("Address")] = props.get("Name", "Unknown")
         return connected
 
     def media_control(self, command, address=None):
@@ -1476,21 +1311,16 @@ class BluetoothDeviceManager:
             dbus.Interface or None: The MediaControl1 D-Bus interface if found, otherwise None.
            """
         try:
-            om = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
-            objects = om.GetManagedObjects()
-            formatted_addr = address.replace(":", "_").upper()
-
-
             controller_path = self.adapter_path  # fallback to stored adapter
 
-            for path, interfaces in objects.items():
-                if constants.media_iface in interfaces:
-                    if formatted_addr in path and path.startswith(controller_path):
-                        self.log.info(f" Found MediaControl1 at {path}")
-                        return dbus.Interface(
-                            self.bus.get_object(constants.bluez_service, path),
-                            constants.media_iface
-                        )
+            device_path = self.object_cache.find_device(controller_path, address)
+            if device_path:
+                for path in self.object_cache.paths_with_interface(constants.media_iface, prefix=device_path):
+                    self.log.info(f" Found MediaControl1 at {path}")
+                    return dbus.Interface(
+                        self.bus.get_object(constants.bluez_service, path),
+                        constants.media_iface
+                    )
 
             self.log.info(f" No MediaControl1 interface found for {address} under {controller_path}")
         except Exception as e:
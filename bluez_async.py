@@ -0,0 +1,364 @@
+import asyncio
+import os
+
+try:
+    from dbus_next import BusType, Message, MessageType, Variant
+    from dbus_next.aio import MessageBus
+except ImportError:
+    MessageBus = None
+
+import constants
+
+
+media_commands = {
+    "play": "Play",
+    "pause": "Pause",
+    "next": "Next",
+    "previous": "Previous",
+    "rewind": "Rewind"
+}
+
+
+class BluezCallError(Exception):
+
+    """
+    Error reply to a D-Bus method call.
+
+    Attributes:
+        name: D-Bus error name, e.g. 'org.bluez.Error.Failed'.
+    """
+
+    def __init__(self, name, message=""):
+        super().__init__(f"{name}: {message}" if message else name)
+        self.name = name
+
+
+def _unwrap(value):
+    if isinstance(value, Variant):
+        return _unwrap(value.value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    return value
+
+
+class AsyncBluetoothDeviceManager:
+
+    """
+    asyncio variant of BluetoothDeviceManager's device operations (connect,
+    pair, remove, discovery, OBEX push, media control) on the dbus_next client.
+
+    Every method is a coroutine that only awaits D-Bus replies, so several
+    operations (e.g. connecting to two devices and pushing a file) run
+    concurrently on one event loop and none of them blocks its caller. Device
+    paths are derived from the adapter and address as BlueZ names them, so no
+    method walks the object tree except inquiry. Return values follow the
+    synchronous manager's methods of the same name.
+
+    All calls must be made from the event loop the manager first connected
+    on; from Qt, submit them through UI_lib.async_bridge.AsyncBridge.
+    Process management, logging and the pairing agent stay in
+    BluetoothDeviceManager.
+    """
+
+    def __init__(self, interface, log=None, timeout=30.0):
+        """
+        Initializes the manager for one adapter; the buses are connected on first use.
+
+        Args:
+            interface (str): Adapter interface, e.g. 'hci0'.
+            log (Logger, optional): Logger instance used for logging.
+            timeout (float): Seconds to wait for a D-Bus reply (Pair and Connect can take this long).
+
+        Raises:
+            RuntimeError: If dbus_next is not installed.
+        """
+        if MessageBus is None:
+            raise RuntimeError("dbus_next is required for the asyncio D-Bus backend")
+        self.interface = interface
+        self.adapter_path = f"/org/bluez/{interface}"
+        self.log = log
+        self.timeout = timeout
+        self.system_bus = None
+        self.session_bus = None
+        self.bus_lock = asyncio.Lock()
+        self.last_session_path = None
+
+    def _info(self, message):
+        if self.log:
+            self.log.info(message)
+
+    # ---------- D-Bus plumbing ----------
+    async def _bus(self, session=False):
+        async with self.bus_lock:
+            if session:
+                if self.session_bus is None:
+                    self.session_bus = await MessageBus(bus_type=BusType.SESSION).connect()
+                return self.session_bus
+            if self.system_bus is None:
+                self.system_bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+            return self.system_bus
+
+    async def _call(self, path, interface, member, signature="", body=None, service=None, session=False,
+                    timeout=None):
+        """
+        Calls a method and waits for its reply without blocking the event loop.
+
+        Returns:
+            list: Reply arguments, with variants unwrapped.
+
+        Raises:
+            BluezCallError: On an error reply.
+            asyncio.TimeoutError: If no reply arrives within the timeout.
+        """
+        bus = await self._bus(session)
+        message = Message(destination=service or constants.bluez_service, path=path, interface=interface,
+                          member=member, signature=signature, body=body or [])
+        reply = await asyncio.wait_for(bus.call(message), timeout or self.timeout)
+        if reply.message_type == MessageType.ERROR:
+            raise BluezCallError(reply.error_name, reply.body[0] if reply.body else "")
+        return _unwrap(reply.body)
+
+    async def _get_property(self, path, interface, name, service=None, session=False):
+        reply = await self._call(path, constants.props_iface, "Get", "ss", [interface, name], service, session)
+        return reply[0]
+
+    def close(self):
+        """
+        Disconnects the buses.
+
+        args: None
+        returns: None
+        """
+        for bus in (self.system_bus, self.session_bus):
+            if bus is not None:
+                bus.disconnect()
+        self.system_bus = None
+        self.session_bus = None
+
+    # ---------- Adapter ----------
+    def device_path(self, address):
+        """
+        Returns:
+            str: D-Bus object path BlueZ gives the device under this adapter.
+        """
+        return f"{self.adapter_path}/dev_{address.upper().replace(':', '_')}"
+
+    async def power_on_adapter(self):
+        await self._call(self.adapter_path, constants.props_iface, "Set", "ssv",
+                         [constants.adapter_iface, "Powered", Variant("b", True)])
+
+    async def start_discovery(self):
+        await self._call(self.adapter_path, constants.adapter_iface, "StartDiscovery")
+
+    async def stop_discovery(self):
+        await self._call(self.adapter_path, constants.adapter_iface, "StopDiscovery")
+
+    async def inquiry(self, timeout):
+        """
+        Scans for nearby devices for a duration.
+
+        Args:
+            timeout (float): Scan duration in seconds.
+
+        Returns:
+            list: Discovered devices of this adapter as "Alias (Address)".
+        """
+        await self.start_discovery()
+        try:
+            await asyncio.sleep(timeout)
+        finally:
+            await self.stop_discovery()
+        objects, = await self._call("/", constants.obj_iface, "GetManagedObjects")
+        discovered = []
+        for path, interfaces in objects.items():
+            props = interfaces.get(constants.device_iface)
+            if props and path.startswith(self.adapter_path + "/") and props.get("Address") and props.get("Alias"):
+                discovered.append(f"{props['Alias']} ({props['Address']})")
+        return discovered
+
+    # ---------- Devices ----------
+    async def is_device_connected(self, address):
+        try:
+            return bool(await self._get_property(self.device_path(address), constants.device_iface, "Connected"))
+        except BluezCallError:
+            return False
+
+    async def is_device_paired(self, address):
+        try:
+            return bool(await self._get_property(self.device_path(address), constants.device_iface, "Paired"))
+        except BluezCallError:
+            return False
+
+    async def connect(self, address):
+        """
+        Connects to a device.
+
+        Args:
+            address (str): Bluetooth MAC address.
+
+        Returns:
+            bool: True if connected, False otherwise.
+        """
+        try:
+            await self._call(self.device_path(address), constants.device_iface, "Connect")
+        except (BluezCallError, asyncio.TimeoutError) as e:
+            self._info(f" Connection failed: {e}")
+            return False
+        connected = await self.is_device_connected(address)
+        if connected:
+            self._info(f" Connection successful to {address}")
+        else:
+            self._info(f" Connection attempted but not confirmed for {address}")
+        return connected
+
+    async def disconnect(self, address):
+        """
+        Disconnects a device.
+
+        Args:
+            address (str): Bluetooth MAC address.
+
+        Returns:
+            bool: True if disconnected or already disconnected, False if an error occurred.
+        """
+        try:
+            await self._call(self.device_path(address), constants.device_iface, "Disconnect")
+            return True
+        except (BluezCallError, asyncio.TimeoutError) as e:
+            self._info(f"Error disconnecting device {address}: {e}")
+            return False
+
+    async def pair(self, address):
+        """
+        Pairs with a device; passkey and confirmation requests go to the registered agent.
+
+        Args:
+            address (str): Bluetooth MAC address.
+
+        Returns:
+            bool: True if paired, False otherwise.
+        """
+        try:
+            await self._call(self.device_path(address), constants.device_iface, "Pair")
+        except BluezCallError as e:
+            if e.name != "org.bluez.Error.AlreadyExists":
+                self._info(f"[Bluetooth] Pairing failed with {address} on {self.interface}: {e}")
+                return False
+        except asyncio.TimeoutError:
+            self._info(f"[Bluetooth] Pairing with {address} on {self.interface} timed out")
+            return False
+        paired = await self.is_device_paired(address)
+        if paired:
+            self._info(f"[Bluetooth] Successfully paired with {address} on {self.interface}")
+        else:
+            self._info(f"[Bluetooth] Pairing not confirmed with {address}")
+        return paired
+
+    async def remove_device(self, address):
+        """
+        Removes a known device from the adapter.
+
+        Args:
+            address (str): Bluetooth MAC address.
+
+        Returns:
+            bool: True if the device was removed or was not known, False if the removal failed.
+        """
+        path = self.device_path(address)
+        try:
+            await self._call(self.adapter_path, constants.adapter_iface, "RemoveDevice", "o", [path])
+        except BluezCallError as e:
+            if e.name == "org.bluez.Error.DoesNotExist":
+                self._info(f"Device with address {address} not found on {self.interface}")
+                return True
+            self._info(f"[ERROR] Removing device {address} failed: {e}")
+            return False
+        except asyncio.TimeoutError:
+            self._info(f"[ERROR] Removing device {address} timed out")
+            return False
+        self._info(f"Device {address} removed successfully.")
+        return True
+
+    # ---------- OBEX ----------
+    async def send_file_via_obex(self, device_address, file_path, poll_interval=0.5, max_polls=40):
+        """
+        Sends a file with the Object Push Profile through obexd on the session bus.
+
+        Args:
+            device_address (str): Bluetooth address of the target device.
+            file_path (str): Absolute path to the file to send.
+            poll_interval (float): Seconds between transfer status checks.
+            max_polls (int): Status checks before giving up on the transfer.
+
+        Returns:
+            tuple: (status, message); status is 'complete', 'error' or the last transfer status.
+        """
+        if not os.path.exists(file_path):
+            msg = f"File does not exist: {file_path}"
+            self._info(msg)
+            return "error", msg
+        obex = {"service": constants.obex_service, "session": True}
+        try:
+            if self.last_session_path:
+                try:
+                    await self._call("/org/bluez/obex", constants.obex_client, "RemoveSession", "o",
+                                     [self.last_session_path], **obex)
+                    self._info(f"Removed previous session: {self.last_session_path}")
+                except BluezCallError as e:
+                    self._info(f"Previous session cleanup failed: {e}")
+                self.last_session_path = None
+
+            session_path, = await self._call("/org/bluez/obex", constants.obex_client, "CreateSession", "sa{sv}",
+                                             [device_address, {"Target": Variant("s", "opp")}], **obex)
+            self.last_session_path = session_path
+            self._info(f"Created OBEX session: {session_path}")
+            try:
+                transfer_path, _ = await self._call(session_path, constants.obex_obj_push, "SendFile", "s",
+                                                    [file_path], **obex)
+                self._info(f"Transfer started: {transfer_path}")
+                status = "unknown"
+                for _ in range(max_polls):
+                    status = str(await self._get_property(transfer_path, constants.obex_obj_transfer, "Status",
+                                                          **obex))
+                    if status in ("complete", "error"):
+                        break
+                    await asyncio.sleep(poll_interval)
+                self._info(f"Transfer status: {status}")
+            finally:
+                try:
+                    await self._call("/org/bluez/obex", constants.obex_client, "RemoveSession", "o",
+                                     [session_path], **obex)
+                    self.last_session_path = None
+                except BluezCallError as e:
+                    self._info(f"Error removing session: {e}")
+            return status, f"Transfer finished with status: {status}"
+        except (BluezCallError, asyncio.TimeoutError) as e:
+            msg = f"OBEX file send failed: {e}"
+            self._info(msg)
+            return "error", msg
+
+    # ---------- AVRCP ----------
+    async def media_control(self, command, address):
+        """
+        Sends an AVRCP command (play, pause, next, previous, rewind) to a connected device.
+
+        Args:
+            command (str): AVRCP command.
+            address (str): Bluetooth MAC address of the target device.
+
+        Returns:
+            str: Status message indicating success, failure, or invalid command.
+        """
+        if command not in media_commands:
+            return f"Invalid command: {command}"
+        try:
+            await self._call(self.device_path(address), constants.media_iface, media_commands[command])
+            return f"AVRCP {command} sent to {address}"
+        except BluezCallError as e:
+            if e.name in ("org.freedesktop.DBus.Error.UnknownMethod", "org.freedesktop.DBus.Error.UnknownObject"):
+                return f"MediaControl1 interface not found for {address}"
+            return f"Error sending AVRCP {command}: {e}"
+        except asyncio.TimeoutError:
+            return f"Error sending AVRCP {command}: timed out"
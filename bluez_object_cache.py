@@ -0,0 +1,299 @@
+import threading
+
+import dbus
+
+import constants
+
+
+def _normalize_uuid(uuid):
+    return str(uuid).lower()
+
+
+class BluezObjectCache:
+
+    """
+    In-memory mirror of the BlueZ object tree (what ObjectManager.GetManagedObjects returns).
+
+    The tree is read once and then kept current from the InterfacesAdded,
+    InterfacesRemoved and PropertiesChanged signals, so device queries are
+    dictionary reads instead of a D-Bus round trip over every object. Devices
+    are indexed by path, by (adapter path, address), by adapter and by
+    service UUID, and objects by interface name. The tree is reloaded when
+    bluetoothd restarts.
+
+    Signals are delivered on the GLib main loop thread while queries come
+    from the caller's thread, so every access holds the lock. Signals that
+    arrive while the tree is being read are queued and replayed in order
+    once it is loaded.
+    """
+
+    def __init__(self, bus, log=None):
+        """
+        Subscribes to the BlueZ object signals and loads the tree.
+
+        Args:
+            bus (dbus.Bus): System bus BlueZ is on; a GLib main loop must be running for it.
+            log (Logger, optional): Logger instance used for logging.
+        """
+        self.bus = bus
+        self.log = log
+        self.lock = threading.RLock()
+        self.objects = {}
+        self.devices_by_address = {}
+        self.devices_by_adapter = {}
+        self.devices_by_uuid = {}
+        self.paths_by_interface = {}
+        self.loaded = False
+        self.pending = []
+        self.owner = None
+        self.receivers = [
+            bus.add_signal_receiver(self._interfaces_added, signal_name="InterfacesAdded",
+                                    dbus_interface=constants.obj_iface, bus_name=constants.bluez_service),
+            bus.add_signal_receiver(self._interfaces_removed, signal_name="InterfacesRemoved",
+                                    dbus_interface=constants.obj_iface, bus_name=constants.bluez_service),
+            bus.add_signal_receiver(self._properties_changed, signal_name="PropertiesChanged",
+                                    dbus_interface=constants.props_iface, bus_name=constants.bluez_service,
+                                    path_keyword="path"),
+        ]
+        self.name_watch = bus.watch_name_owner(constants.bluez_service, self._owner_changed)
+        self.reload()
+
+    def _info(self, message):
+        if self.log:
+            self.log.info(message)
+
+    def close(self):
+        """
+        Stops following BlueZ and empties the cache.
+
+        args: None
+        returns: None
+        """
+        for receiver in self.receivers:
+            receiver.remove()
+        self.receivers = []
+        if self.name_watch is not None:
+            self.name_watch.cancel()
+            self.name_watch = None
+        with self.lock:
+            self._clear()
+
+    # ---------- Loading ----------
+    def reload(self):
+        """
+        Reads the whole tree with one GetManagedObjects call, then replays the signals received meanwhile.
+
+        Returns:
+            bool: True if the tree was read, False if BlueZ is not reachable (the cache stays empty until it is).
+        """
+        with self.lock:
+            self.loaded = False
+            self.pending = []
+        try:
+            self.owner = str(self.bus.get_name_owner(constants.bluez_service))
+            manager = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"), constants.obj_iface)
+            objects = manager.GetManagedObjects()
+        except dbus.exceptions.DBusException as e:
+            self._info(f"[WARN] Cannot read the BlueZ object tree: {e}")
+            with self.lock:
+                self._clear()
+                self.loaded = True
+                self.pending = []
+            return False
+        with self.lock:
+            self._clear()
+            for path, interfaces in objects.items():
+                self._add(str(path), interfaces)
+            pending, self.pending = self.pending, []
+            self.loaded = True
+            for handler, args in pending:
+                handler(*args)
+        self._info(f"[INFO] Loaded {len(self.objects)} BlueZ objects")
+        return True
+
+    def _owner_changed(self, owner):
+        # Also called once when the watch starts, with the owner the tree was just read from
+        if owner == self.owner:
+            return
+        self.owner = owner
+        if owner:
+            self._info("[INFO] bluetoothd appeared on D-Bus, reloading its objects")
+            self.reload()
+        else:
+            self._info("[WARN] bluetoothd left D-Bus, dropping its objects")
+            with self.lock:
+                self._clear()
+
+    def _clear(self):
+        self.objects.clear()
+        self.devices_by_address.clear()
+        self.devices_by_adapter.clear()
+        self.devices_by_uuid.clear()
+        self.paths_by_interface.clear()
+
+    # ---------- Signal handlers ----------
+    def _queued(self, handler, args):
+        if not self.loaded:
+            self.pending.append((handler, args))
+            return True
+        return False
+
+    def _interfaces_added(self, path, interfaces):
+        with self.lock:
+            if not self._queued(self._apply_added, (str(path), interfaces)):
+                self._apply_added(str(path), interfaces)
+
+    def _interfaces_removed(self, path, interfaces):
+        with self.lock:
+            if not self._queued(self._apply_removed, (str(path), interfaces)):
+                self._apply_removed(str(path), interfaces)
+
+    def _properties_changed(self, interface, changed, invalidated, path=None):
+        with self.lock:
+            args = (str(path), str(interface), changed, invalidated)
+            if not self._queued(self._apply_changed, args):
+                self._apply_changed(*args)
+
+    def _apply_added(self, path, interfaces):
+        self._unindex_device(path)
+        self._add(path, interfaces)
+
+    def _apply_removed(self, path, interfaces):
+        current = self.objects.get(path)
+        if current is None:
+            return
+        self._unindex_device(path)
+        for interface in interfaces:
+            interface = str(interface)
+            current.pop(interface, None)
+            paths = self.paths_by_interface.get(interface)
+            if paths is not None:
+                paths.discard(path)
+        if current:
+            self._index_device(path)
+        else:
+            del self.objects[path]
+
+    def _apply_changed(self, path, interface, changed, invalidated):
+        properties = self.objects.get(path, {}).get(interface)
+        if properties is None:
+            return
+        if interface == constants.device_iface:
+            self._unindex_device(path)
+        properties.update((str(name), value) for name, value in changed.items())
+        for name in invalidated:
+            properties.pop(str(name), None)
+        if interface == constants.device_iface:
+            self._index_device(path)
+
+    # ---------- Indexes ----------
+    def _add(self, path, interfaces):
+        current = self.objects.setdefault(path, {})
+        for interface, properties in interfaces.items():
+            interface = str(interface)
+            current.setdefault(interface, {}).update((str(name), value) for name, value in properties.items())
+            self.paths_by_interface.setdefault(interface, set()).add(path)
+        self._index_device(path)
+
+    def _index_device(self, path):
+        properties = self.objects.get(path, {}).get(constants.device_iface)
+        if properties is None:
+            return
+        adapter = str(properties.get("Adapter", ""))
+        address = properties.get("Address")
+        if address:
+            self.devices_by_address[(adapter, str(address).upper())] = path
+        self.devices_by_adapter.setdefault(adapter, set()).add(path)
+        for uuid in properties.get("UUIDs", []):
+            self.devices_by_uuid.setdefault(_normalize_uuid(uuid), set()).add(path)
+
+    def _unindex_device(self, path):
+        properties = self.objects.get(path, {}).get(constants.device_iface)
+        if properties is None:
+            return
+        adapter = str(properties.get("Adapter", ""))
+        address = properties.get("Address")
+        if address and self.devices_by_address.get((adapter, str(address).upper())) == path:
+            del self.devices_by_address[(adapter, str(address).upper())]
+        paths = self.devices_by_adapter.get(adapter)
+        if paths is not None:
+            paths.discard(path)
+        for uuid in properties.get("UUIDs", []):
+            paths = self.devices_by_uuid.get(_normalize_uuid(uuid))
+            if paths is not None:
+                paths.discard(path)
+
+    # ---------- Queries ----------
+    def get_managed_objects(self):
+        """
+        Returns:
+            dict: Copy of the tree in the GetManagedObjects layout (path -> interface -> properties).
+        """
+        with self.lock:
+            return {path: {interface: dict(properties) for interface, properties in interfaces.items()}
+                    for path, interfaces in self.objects.items()}
+
+    def get_properties(self, path, interface=None):
+        """
+        Args:
+            path (str): Object path.
+            interface (str, optional): Interface name; org.bluez.Device1 if omitted.
+
+        Returns:
+            dict | None: Copy of the object's properties on that interface, None if it has no such interface.
+        """
+        with self.lock:
+            properties = self.objects.get(str(path), {}).get(interface or constants.device_iface)
+            return dict(properties) if properties is not None else None
+
+    def has_interface(self, path, interface):
+        with self.lock:
+            return interface in self.objects.get(str(path), {})
+
+    def find_device(self, adapter_path, address):
+        """
+        Args:
+            adapter_path (str): Adapter object path, e.g. '/org/bluez/hci0'.
+            address (str): Device address.
+
+        Returns:
+            str | None: Device object path under that adapter, None if BlueZ does not know the device.
+        """
+        with self.lock:
+            return self.devices_by_address.get((adapter_path, address.upper()))
+
+    def devices(self, adapter_path=None, uuid=None):
+        """
+        Returns the devices of an adapter and/or with a service UUID.
+
+        Args:
+            adapter_path (str, optional): Adapter object path; all adapters if omitted.
+            uuid (str, optional): Full 128-bit service UUID; any UUID if omitted.
+
+        Returns:
+            dict: Device path -> copy of its org.bluez.Device1 properties.
+        """
+        with self.lock:
+            if adapter_path is not None:
+                paths = set(self.devices_by_adapter.get(adapter_path, ()))
+                if uuid is not None:
+                    paths &= self.devices_by_uuid.get(_normalize_uuid(uuid), set())
+            elif uuid is not None:
+                paths = set(self.devices_by_uuid.get(_normalize_uuid(uuid), ()))
+            else:
+                paths = set(self.paths_by_interface.get(constants.device_iface, ()))
+            return {path: dict(self.objects[path][constants.device_iface]) for path in paths}
+
+    def paths_with_interface(self, interface, prefix=None):
+        """
+        Args:
+            interface (str): Interface name, e.g. 'org.bluez.MediaControl1'.
+            prefix (str, optional): Only paths under this object path, e.g. a device path.
+
+        Returns:
+            list: Sorted object paths implementing the interface.
+        """
+        with self.lock:
+            paths = self.paths_by_interface.get(interface, ())
+            return sorted(path for path in paths if prefix is None or path == prefix or
+                          path.startswith(prefix + "/"))
@@ -0,0 +1,417 @@
+import bisect
+import mmap
+import os
+import struct
+import time
+from array import array
+
+from Backend_lib.Linux import hci_transport
+
+
+BTSNOOP_MAGIC = b"btsnoop\x00"
+BTSNOOP_VERSION = 1
+
+# Datalink types
+DATALINK_HCI_UART = 1001     # un-encapsulated, packet type implied by the flags
+DATALINK_H4 = 1002           # packets carry the H4 indicator byte
+DATALINK_MONITOR = 2001      # Linux monitor channel (btmon -w), flags = index << 16 | opcode
+
+# Microseconds from 0000-01-01 to the Unix epoch, the btsnoop timestamp origin
+BTSNOOP_EPOCH_DELTA = 0x00dcddb30f2f8000
+
+_header = struct.Struct(">8sII")
+_record_header = struct.Struct(">IIIIq")
+_record_length_time = struct.Struct(">4xI8xq")
+
+# Monitor channel opcodes carrying HCI traffic -> (H4 indicator, received)
+monitor_opcodes = {
+    2: (hci_transport.HCI_COMMAND_PKT, False),
+    3: (hci_transport.HCI_EVENT_PKT, True),
+    4: (hci_transport.HCI_ACLDATA_PKT, False),
+    5: (hci_transport.HCI_ACLDATA_PKT, True),
+    6: (hci_transport.HCI_SCODATA_PKT, False),
+    7: (hci_transport.HCI_SCODATA_PKT, True),
+    18: (hci_transport.HCI_ISODATA_PKT, False),
+    19: (hci_transport.HCI_ISODATA_PKT, True),
+}
+
+
+class BtsnoopError(Exception):
+    """
+    Raised for files that are not btsnoop captures or are truncated.
+    """
+
+
+class BtsnoopRecord:
+
+    """
+    One captured packet, normalized to an H4 packet.
+
+    Attributes:
+        timestamp: capture time as Unix seconds.
+        received: True for controller -> host traffic.
+        packet: H4 packet (indicator byte first).
+        index: controller index for monitor captures, None otherwise.
+        drops: cumulative dropped packets reported by the capture.
+    """
+
+    __slots__ = ("timestamp", "received", "packet", "index", "drops")
+
+    def __init__(self, timestamp, received, packet, index=None, drops=0):
+        self.timestamp = timestamp
+        self.received = received
+        self.packet = packet
+        self.index = index
+        self.drops = drops
+
+    def __repr__(self):
+        return ('BtsnoopRecord(timestamp = %r, received = %r, packet = %s, index = %r)'
+                ) % (self.timestamp, self.received, self.packet.hex(), self.index)
+
+
+def is_btsnoop(path):
+    """
+    Checks the btsnoop magic at the start of a file.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        bool: True if the file is a btsnoop capture.
+    """
+    with open(path, "rb") as fp:
+        return fp.read(len(BTSNOOP_MAGIC)) == BTSNOOP_MAGIC
+
+
+def read_header(fp):
+    """
+    Reads and validates the btsnoop file header.
+
+    Args:
+        fp: Binary file object positioned at the start of the file.
+
+    Returns:
+        int: Datalink type.
+    """
+    data = fp.read(_header.size)
+    if len(data) < _header.size:
+        raise BtsnoopError("Truncated btsnoop header")
+    magic, version, datalink = _header.unpack(data)
+    if magic != BTSNOOP_MAGIC:
+        raise BtsnoopError("Not a btsnoop file")
+    if datalink not in (DATALINK_HCI_UART, DATALINK_H4, DATALINK_MONITOR):
+        raise BtsnoopError(f"Unsupported btsnoop datalink {datalink}")
+    return datalink
+
+
+def to_h4(datalink, flags, data):
+    """
+    Normalizes a captured packet to an H4 packet.
+
+    Args:
+        datalink (int): Datalink type of the capture.
+        flags (int): Record flags.
+        data (bytes): Captured packet data.
+
+    Returns:
+        tuple: (received, H4 packet, controller index), or None for monitor records
+            that do not carry HCI traffic.
+    """
+    if datalink == DATALINK_H4:
+        return bool(flags & 0x01), data, None
+    if datalink == DATALINK_HCI_UART:
+        received = bool(flags & 0x01)
+        if flags & 0x02:
+            indicator = hci_transport.HCI_EVENT_PKT if received else hci_transport.HCI_COMMAND_PKT
+        else:
+            indicator = hci_transport.HCI_ACLDATA_PKT
+        return received, bytes([indicator]) + data, None
+    mapped = monitor_opcodes.get(flags & 0xffff)
+    if mapped is None:
+        return None
+    indicator, received = mapped
+    return received, bytes([indicator]) + data, flags >> 16
+
+
+def iter_records(path):
+    """
+    Streams the records of a btsnoop capture without loading the file.
+
+    Args:
+        path (str): Capture file path.
+
+    Yields:
+        BtsnoopRecord: Records in file order; a truncated last record is ignored.
+    """
+    with open(path, "rb") as fp:
+        datalink = read_header(fp)
+        while True:
+            header = fp.read(_record_header.size)
+            if len(header) < _record_header.size:
+                return
+            _, included_length, flags, drops, timestamp = _record_header.unpack(header)
+            data = fp.read(included_length)
+            if len(data) < included_length:
+                return
+            normalized = to_h4(datalink, flags, data)
+            if normalized is None:
+                continue
+            received, packet, index = normalized
+            yield BtsnoopRecord((timestamp - BTSNOOP_EPOCH_DELTA) / 1e6, received, packet, index, drops)
+
+
+def to_btsnoop_time(timestamp):
+    """
+    Converts Unix seconds to a btsnoop timestamp (microseconds since year 0).
+    """
+    return int(round(timestamp * 1e6)) + BTSNOOP_EPOCH_DELTA
+
+
+def packet_flags(received, packet):
+    """
+    Record flags of an H4 packet for the H4 and HCI UART datalinks.
+
+    Args:
+        received (bool): True for controller -> host traffic.
+        packet (bytes): H4 packet.
+
+    Returns:
+        int: Direction in bit 0, command/event in bit 1.
+    """
+    flags = 0x01 if received else 0x00
+    if packet[0] in (hci_transport.HCI_COMMAND_PKT, hci_transport.HCI_EVENT_PKT):
+        flags |= 0x02
+    return flags
+
+
+class BtsnoopWriter:
+
+    """
+    Appends records to a btsnoop file, writing the header when the file is new.
+    """
+
+    def __init__(self, path, datalink=DATALINK_H4, buffer_size=1 << 16):
+        """
+        Opens the capture file.
+
+        Args:
+            path (str): Capture file path.
+            datalink (int): Datalink type of the records that will be written.
+            buffer_size (int): Write buffer size in bytes.
+
+        Raises:
+            BtsnoopError: If the file exists and is not a btsnoop capture of that datalink, as appending
+                would corrupt it.
+        """
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            with open(path, "rb") as fp:
+                existing = read_header(fp)
+            if existing != datalink:
+                raise BtsnoopError(f"{path} has datalink {existing}, cannot append datalink {datalink} records")
+        self.fp = open(path, "ab", buffering=buffer_size)
+        if new:
+            self.fp.write(_header.pack(BTSNOOP_MAGIC, BTSNOOP_VERSION, datalink))
+        self.datalink = datalink
+        self.records = 0
+
+    def write(self, timestamp, flags, data, original_length=None, drops=0):
+        """
+        Appends one record.
+
+        Args:
+            timestamp (float): Unix seconds.
+            flags (int): Record flags of the file's datalink.
+            data (bytes): Packet data.
+            original_length (int, optional): Length before truncation, defaults to len(data).
+            drops (int): Cumulative dropped packets.
+        """
+        self.fp.write(_record_header.pack(original_length or len(data), len(data), flags, drops,
+                                          to_btsnoop_time(timestamp)))
+        self.fp.write(data)
+        self.records += 1
+
+    def write_packet(self, received, packet, timestamp=None):
+        """
+        Appends an H4 packet to an H4 datalink file.
+
+        Args:
+            received (bool): True for controller -> host traffic.
+            packet (bytes): H4 packet.
+            timestamp (float, optional): Unix seconds, defaults to now.
+        """
+        self.write(time.time() if timestamp is None else timestamp, packet_flags(received, packet), packet)
+
+    def flush(self):
+        self.fp.flush()
+
+    def close(self):
+        """
+        Flushes and closes the file.
+
+        args: None
+        returns: None
+        """
+        if not self.fp.closed:
+            self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BtsnoopFile:
+
+    """
+    Memory-mapped btsnoop reader with a record offset index.
+
+    Records are read straight from the mapping: iter_raw() yields memoryview
+    slices without copying, and record(n) / find_time() use the index for
+    random access. A capture that is still being written can be followed by
+    calling refresh(), which remaps the file and indexes only the new records.
+    Memoryviews from iter_raw() must be released before refresh() or close().
+    """
+
+    def __init__(self, path):
+        """
+        Maps the capture and indexes its records.
+
+        Args:
+            path (str): Capture file path.
+        """
+        self.path = path
+        self.fp = open(path, "rb")
+        self.datalink = read_header(self.fp)
+        self.offsets = array("Q")
+        self.timestamps = array("q")
+        self.map = None
+        self.size = 0
+        self.indexed = _header.size
+        self.refresh()
+
+    def refresh(self):
+        """
+        Remaps the file if it grew and indexes the new complete records.
+
+        Returns:
+            int: Number of new records.
+        """
+        size = os.fstat(self.fp.fileno()).st_size
+        if size != self.size:
+            if self.map is not None:
+                self.map.close()
+            self.map = mmap.mmap(self.fp.fileno(), size, access=mmap.ACCESS_READ) if size else None
+            self.size = size
+        before = len(self.offsets)
+        position = self.indexed
+        unpack = _record_length_time.unpack_from
+        add_offset = self.offsets.append
+        add_timestamp = self.timestamps.append
+        header_size = _record_header.size
+        data = self.map
+        while position + header_size <= size:
+            included_length, timestamp = unpack(data, position)
+            end = position + header_size + included_length
+            if end > size:
+                break
+            add_offset(position)
+            add_timestamp(timestamp)
+            position = end
+        self.indexed = position
+        return len(self.offsets) - before
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def raw(self, number):
+        """
+        Returns one record without copying its data.
+
+        Args:
+            number (int): Record number.
+
+        Returns:
+            tuple: (flags, btsnoop timestamp, memoryview of the packet data).
+        """
+        position = self.offsets[number]
+        _, included_length, flags, _, timestamp = _record_header.unpack_from(self.map, position)
+        start = position + _record_header.size
+        return flags, timestamp, memoryview(self.map)[start:start + included_length]
+
+    def iter_raw(self, start=0):
+        """
+        Iterates records from a record number without copying packet data.
+
+        Args:
+            start (int): First record number.
+
+        Yields:
+            tuple: (flags, btsnoop timestamp, memoryview of the packet data).
+        """
+        view = memoryview(self.map) if self.map is not None else None
+        unpack = _record_header.unpack_from
+        header_size = _record_header.size
+        try:
+            for position in self.offsets[start:]:
+                _, included_length, flags, _, timestamp = unpack(view, position)
+                yield flags, timestamp, view[position + header_size:position + header_size + included_length]
+        finally:
+            if view is not None:
+                view.release()
+
+    def record(self, number):
+        """
+        Returns one record normalized to H4.
+
+        Args:
+            number (int): Record number.
+
+        Returns:
+            BtsnoopRecord: The record, None for monitor records without HCI traffic.
+        """
+        flags, timestamp, data = self.raw(number)
+        normalized = to_h4(self.datalink, flags, bytes(data))
+        data.release()
+        if normalized is None:
+            return None
+        received, packet, index = normalized
+        return BtsnoopRecord((timestamp - BTSNOOP_EPOCH_DELTA) / 1e6, received, packet, index)
+
+    def __iter__(self):
+        for number in range(len(self.offsets)):
+            record = self.record(number)
+            if record is not None:
+                yield record
+
+    def find_time(self, timestamp):
+        """
+        Returns the number of the first record at or after a time.
+
+        Args:
+            timestamp (float): Unix seconds.
+
+        Returns:
+            int: Record number, len(self) if every record is older.
+        """
+        return bisect.bisect_left(self.timestamps, to_btsnoop_time(timestamp))
+
+    def close(self):
+        """
+        Unmaps and closes the capture.
+
+        args: None
+        returns: None
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,210 @@
+import threading
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.controller_registry import ControllerRegistry
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event
+
+
+# Bluetooth Core versions by HCI/LMP version number
+version_names = ["1.0b", "1.1", "1.2", "2.0", "2.1", "3.0", "4.0", "4.1", "4.2", "5.0", "5.1", "5.2", "5.3", "5.4",
+                 "6.0"]
+
+# Company identifiers of common controller vendors (Bluetooth Assigned Numbers)
+company_names = {
+    0: "Ericsson Technology Licensing", 1: "Nokia Mobile Phones", 2: "Intel Corp.", 3: "IBM Corp.",
+    4: "Toshiba Corp.", 10: "Qualcomm Technologies International, Ltd. (QTIL)", 13: "Texas Instruments Inc.",
+    15: "Broadcom Corporation", 29: "Qualcomm", 48: "ST Microelectronics", 69: "Atheros Communications, Inc.",
+    70: "MediaTek, Inc.", 72: "Marvell Technology Group Ltd.", 76: "Apple, Inc.", 89: "Nordic Semiconductor ASA",
+    93: "Realtek Semiconductor Corporation", 305: "Cypress Semiconductor", 1521: "Linux Foundation",
+    65535: "internal use",
+}
+
+link_policy_names = [(0x0001, "RSWITCH"), (0x0002, "HOLD"), (0x0004, "SNIFF"), (0x0008, "PARK")]
+link_mode_names = [(0x8000, "ACCEPT"), (0x0001, "CENTRAL"), (0x0002, "AUTH"), (0x0004, "ENCRYPT"),
+                   (0x0008, "TRUSTED"), (0x0010, "RELIABLE"), (0x0020, "SECURE")]
+
+# Commands that change the cached details when sent to a controller
+invalidating_opcodes = {
+    0x0c03,     # Reset
+    0x0c13,     # Write Local Name
+    0x0c24,     # Write Class of Device
+    0x080f,     # Write Default Link Policy Settings
+}
+
+_reads = [
+    ("Informational parameters", "Read Local Version Information"),
+    ("Informational parameters", "Read Local Supported Features"),
+    ("Controller and Baseband commands", "Read Local Name"),
+    ("Controller and Baseband commands", "Read Class of Device"),
+]
+
+
+def format_version(version):
+    """
+    Returns:
+        str: hciconfig style version, e.g. '5.3 (0xc)'.
+    """
+    name = version_names[version] if version < len(version_names) else "Unknown"
+    return f"{name} (0x{version:x})"
+
+
+def format_link_policy(policy):
+    return " ".join(name for bit, name in link_policy_names if policy & bit) or "NONE"
+
+
+def format_link_mode(mode):
+    names = [name for bit, name in link_mode_names if mode & bit]
+    return " ".join(([] if mode & 0x0001 else ["PERIPHERAL"]) + names)
+
+
+class ControllerDetailsCache:
+
+    """
+    Per-controller details (name, class, link policy/mode, HCI/LMP version,
+    manufacturer, bus, features) read once and kept until they may change.
+
+    Address, bus and link settings come from the ControllerRegistry (an
+    ioctl), the rest from HCI reads over the interface's persistent raw
+    socket, so no subprocess is run. An entry is dropped when the registry
+    reports the controller added, removed or changed (power, settings, name
+    or class changes on the management channel) and when a command in
+    invalidating_opcodes is sent through utils.run_hci_cmd.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, registry=None, log=None):
+        """
+        Initializes an empty cache listening to the registry.
+
+        Args:
+            registry (ControllerRegistry, optional): Registry to follow; the shared one if omitted.
+            log (Logger, optional): Logger instance used for logging.
+        """
+        self.log = log
+        self.registry = registry or ControllerRegistry.get_instance(log)
+        self.lock = threading.Lock()
+        self.details = {}
+        self.generation = 0
+        self.registry.add_listener(self._on_registry_event)
+
+    @classmethod
+    def get_instance(cls, log=None):
+        """
+        Returns the application-wide cache, creating it on first use.
+
+        Args:
+            log (Logger, optional): Logger used if the cache is created by this call.
+
+        Returns:
+            ControllerDetailsCache: The shared cache.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(log=log)
+            return cls._instance
+
+    def _on_registry_event(self, event, controller):
+        self.invalidate(controller.interface)
+
+    def invalidate(self, interface=None):
+        """
+        Drops the cached details of a controller, or of every controller.
+
+        Args:
+            interface (str, optional): Interface name; all controllers if omitted.
+        """
+        with self.lock:
+            self.generation += 1
+            if interface is None:
+                self.details.clear()
+            else:
+                self.details.pop(interface, None)
+
+    def command_sent(self, interface, opcode):
+        """
+        Invalidates a controller's details if a command that changes them was sent to it.
+
+        Args:
+            interface (str): Interface the command was sent to.
+            opcode (int): Command opcode.
+        """
+        if opcode in invalidating_opcodes:
+            self.invalidate(interface)
+
+    def get(self, interface):
+        """
+        Returns the details of a controller, reading them on first use.
+
+        Args:
+            interface (str): Interface name, e.g. 'hci0'.
+
+        Returns:
+            dict: 'BD_ADDR', 'Name', 'Class', 'Link policy', 'Link mode', 'HCI Version', 'LMP Version',
+                'Manufacturer', 'Bus' and 'Features', as hciconfig -a prints them. Fields that could not be read
+                are missing, and such partial details are read again on the next call.
+        """
+        with self.lock:
+            details = self.details.get(interface)
+            generation = self.generation
+        if details is not None:
+            return dict(details)
+        details, complete = self._read(interface)
+        with self.lock:
+            # Not kept if an invalidation arrived while reading
+            if complete and generation == self.generation:
+                self.details[interface] = details
+        return dict(details)
+
+    def _read(self, interface):
+        details = {}
+        controller = self.registry.get(interface)
+        if controller is not None:
+            details["BD_ADDR"] = controller.address
+            details["Bus"] = controller.bus
+            details["Link policy"] = format_link_policy(controller.link_policy)
+            details["Link mode"] = format_link_mode(controller.link_mode)
+        try:
+            transport = hci_transport.get_transport(interface, self.log)
+        except OSError as e:
+            if self.log:
+                self.log.info(f"[WARN] Cannot read {interface} details: {e}")
+            return details, False
+        complete = controller is not None
+        for group, command in _reads:
+            encoder = get_encoder(group, command)
+            try:
+                event = decode_command_event(transport.execute(encoder.opcode, encoder.encode([])))
+            except (OSError, hci_transport.HciTransportError) as e:
+                if self.log:
+                    self.log.info(f"[WARN] {command} failed on {interface}: {e}")
+                complete = False
+                continue
+            if getattr(event, "status", None) != 0:
+                complete = False
+                continue
+            parameters = event.return_parameters
+            if command == "Read Local Version Information":
+                details["HCI Version"] = format_version(parameters.HCI_Version)
+                details["LMP Version"] = format_version(parameters.LMP_Version)
+                details["Manufacturer"] = (f"{company_names.get(parameters.Company_Identifier, 'Unknown')} "
+                                           f"({parameters.Company_Identifier})")
+            elif command == "Read Local Supported Features":
+                details["Features"] = " ".join(f"0x{byte:02x}" for byte in parameters.LMP_Features)
+            elif command == "Read Local Name":
+                details["Name"] = f"'{parameters.Local_Name}'"
+            else:
+                details["Class"] = f"0x{parameters.Class_Of_Device:06x}"
+        return details, complete
+
+
+def command_sent(interface, opcode):
+    """
+    Tells the shared cache, if it exists, that a command was sent to a controller (see
+    ControllerDetailsCache.command_sent).
+    """
+    cache = ControllerDetailsCache._instance
+    if cache is not None:
+        cache.command_sent(interface, opcode)
@@ -0,0 +1,268 @@
+import argparse
+import errno
+import fcntl
+import json
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.controller_registry import ControllerRegistry
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event, status_text
+
+
+# ioctl bringing an HCI device up (include/net/bluetooth/hci_sock.h)
+HCIDEVUP = 0x400448c9
+
+probe_commands = [
+    ("Informational parameters", "Read Local Version Information"),
+    ("Informational parameters", "Read BD_ADDR"),
+    ("Informational parameters", "Read Buffer Size"),
+]
+
+
+def bring_up(interface, log=None):
+    """
+    Brings an HCI device up (HCIDEVUP), as `hciconfig <interface> up` does.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0').
+        log (Logger, optional): Logger instance used for logging.
+
+    Returns:
+        bool: True if the device is up, False if it could not be brought up.
+    """
+    try:
+        with socket.socket(hci_transport.AF_BLUETOOTH, socket.SOCK_RAW, hci_transport.BTPROTO_HCI) as sock:
+            fcntl.ioctl(sock.fileno(), HCIDEVUP, hci_transport.interface_index(interface))
+    except OSError as e:
+        if e.errno == errno.EALREADY:
+            return True
+        if log:
+            log.info(f"[ERROR] Failed to bring {interface} up: {e}")
+        return False
+    return True
+
+
+class CommandTiming:
+
+    """
+    Outcome of one probe command.
+
+    Attributes:
+        command: Command name.
+        latency: Seconds from sending the command to its Command Complete, None if it was not answered.
+        status: HCI status of the Command Complete, None if it was not answered.
+        error: Transport error text, None if the command was answered.
+        event: Decoded Command Complete event.
+    """
+
+    __slots__ = ("command", "latency", "status", "error", "event")
+
+    def __init__(self, command, latency=None, status=None, error=None, event=None):
+        self.command = command
+        self.latency = latency
+        self.status = status
+        self.error = error
+        self.event = event
+
+    @property
+    def ok(self):
+        return self.error is None and self.status == 0
+
+
+class ProbeResult:
+
+    """
+    Health of one controller: whether it came up and how its probe commands were answered.
+    """
+
+    def __init__(self, interface, address=None):
+        self.interface = interface
+        self.address = address
+        self.up = False
+        self.commands = []
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def healthy(self):
+        return self.up and self.error is None and bool(self.commands) and all(timing.ok for timing in self.commands)
+
+    @property
+    def latencies(self):
+        return [timing.latency for timing in self.commands if timing.latency is not None]
+
+    def failures(self):
+        """
+        Returns:
+            list: Text of every failure, e.g. 'Read BD_ADDR: timed out'.
+        """
+        failures = [self.error] if self.error else []
+        for timing in self.commands:
+            if timing.error:
+                failures.append(f"{timing.command}: {timing.error}")
+            elif timing.status:
+                failures.append(f"{timing.command}: {status_text(timing.status)}")
+        return failures
+
+    def to_dict(self):
+        return {"interface": self.interface, "address": self.address, "up": self.up, "healthy": self.healthy,
+                "elapsed_ms": self.elapsed * 1000,
+                "commands": [{"command": timing.command, "status": timing.status, "error": timing.error,
+                              "latency_ms": None if timing.latency is None else timing.latency * 1000}
+                             for timing in self.commands],
+                "failures": self.failures()}
+
+
+def probe_controller(interface, address=None, log=None, timeout=2.0):
+    """
+    Brings a controller up and times the probe commands on its persistent raw HCI socket.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0').
+        address (str, optional): Expected BD address, checked against Read BD_ADDR.
+        log (Logger, optional): Logger instance used for logging.
+        timeout (float): Seconds to wait for each command.
+
+    Returns:
+        ProbeResult: The controller's health.
+    """
+    result = ProbeResult(interface, address)
+    start = time.perf_counter()
+    result.up = bring_up(interface, log)
+    if not result.up:
+        result.error = "could not be brought up"
+        result.elapsed = time.perf_counter() - start
+        return result
+    try:
+        transport = hci_transport.get_transport(interface, log)
+    except OSError as e:
+        result.error = f"raw HCI socket unavailable: {e}"
+        result.elapsed = time.perf_counter() - start
+        return result
+    for group, command in probe_commands:
+        encoder = get_encoder(group, command)
+        packet = encoder.encode([])
+        sent = time.perf_counter()
+        try:
+            event = decode_command_event(transport.execute(encoder.opcode, packet, timeout))
+        except hci_transport.HciTransportError:
+            result.commands.append(CommandTiming(command, error="timed out"))
+            continue
+        except OSError as e:
+            result.commands.append(CommandTiming(command, error=str(e)))
+            continue
+        result.commands.append(CommandTiming(command, time.perf_counter() - sent,
+                                             getattr(event, "status", None), event=event))
+        if command == "Read BD_ADDR" and event.status == 0:
+            reported = event.return_parameters.BD_ADDR
+            if address and reported != address:
+                result.error = f"BD_ADDR {reported} does not match {address}"
+            result.address = reported
+    result.elapsed = time.perf_counter() - start
+    if log:
+        log.info(f"[INFO] Probe {interface}: {'healthy' if result.healthy else '; '.join(result.failures())} "
+                 f"({result.elapsed * 1000:.1f} ms)")
+    return result
+
+
+def probe_controllers(interfaces=None, log=None, timeout=2.0):
+    """
+    Probes controllers concurrently, one thread each, so the slowest controller bounds the total time.
+
+    Args:
+        interfaces (list, optional): Interfaces to probe; every controller in the ControllerRegistry if omitted.
+        log (Logger, optional): Logger instance used for logging.
+        timeout (float): Seconds to wait for each command.
+
+    Returns:
+        list: ProbeResult objects, ordered by interface.
+    """
+    registry = ControllerRegistry.get_instance(log)
+    if interfaces is None:
+        interfaces = [controller.interface for controller in registry.controllers()]
+    addresses = {}
+    for interface in interfaces:
+        controller = registry.get(interface)
+        addresses[interface] = controller.address if controller else None
+    if not interfaces:
+        return []
+    with ThreadPoolExecutor(max_workers=len(interfaces)) as executor:
+        futures = [executor.submit(probe_controller, interface, addresses[interface], log, timeout)
+                   for interface in sorted(interfaces, key=lambda name: (len(name), name))]
+    return [future.result() for future in futures]
+
+
+health_headers = ["Interface", "BD Address", "Health", "Version (ms)", "BD_ADDR (ms)", "Buffer Size (ms)",
+                  "Total (ms)", "Failures"]
+
+
+def health_rows(results):
+    """
+    Args:
+        results (list): ProbeResult objects.
+
+    Returns:
+        list: One row per controller, matching health_headers.
+    """
+    rows = []
+    for result in results:
+        latencies = {timing.command: timing.latency for timing in result.commands}
+        rows.append([result.interface, result.address or "-", "OK" if result.healthy else "FAIL"] +
+                    [f"{latencies[command] * 1000:.2f}" if latencies.get(command) is not None else "-"
+                     for _, command in probe_commands] +
+                    [f"{result.elapsed * 1000:.1f}", "; ".join(result.failures())])
+    return rows
+
+
+def health_summary(results, elapsed):
+    """
+    Returns:
+        str: e.g. '15/16 controllers healthy in 84.2 ms'.
+    """
+    healthy = sum(result.healthy for result in results)
+    return f"{healthy}/{len(results)} controllers healthy in {elapsed * 1000:.1f} ms"
+
+
+def format_table(results):
+    """
+    Returns:
+        str: Health table as aligned text.
+    """
+    rows = [health_headers] + health_rows(results)
+    widths = [max(len(str(row[column])) for row in rows) for column in range(len(health_headers) - 1)]
+    return "\n".join("  ".join(str(value).ljust(width) for value, width in zip(row, widths)) + "  " + row[-1]
+                     for row in rows)
+
+
+def main(argv=None):
+    """
+    Command line entry point; exits with status 1 if any controller is unhealthy.
+
+    Example:
+        python -m Backend_lib.Linux.controller_probe
+        python -m Backend_lib.Linux.controller_probe -i hci0 hci1 --timeout 1 --json
+    """
+    parser = argparse.ArgumentParser(description="Probe the health of every attached Bluetooth controller")
+    parser.add_argument("-i", "--interfaces", nargs="+", help="interfaces to probe (default: all controllers)")
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds to wait for each command")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = probe_controllers(args.interfaces, timeout=args.timeout)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps({"summary": health_summary(results, elapsed),
+                          "controllers": [result.to_dict() for result in results]}, indent=2))
+    else:
+        print(format_table(results))
+        print(health_summary(results, elapsed))
+    return 0 if all(result.healthy for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+import fcntl
+import select
+import socket
+import struct
+import threading
+import time
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_capture import HCI_CHANNEL_CONTROL, HCI_DEV_NONE, open_channel_socket
+
+
+# ioctls of raw HCI sockets (include/net/bluetooth/hci_sock.h)
+HCIGETDEVLIST = 0x800448d2
+HCIGETDEVINFO = 0x800448d3
+HCI_MAX_DEV = 16
+
+# struct hci_dev_list_req: dev_num, then dev_num struct hci_dev_req {dev_id, dev_opt} aligned to 4 bytes
+_dev_list_header = struct.Struct("=H2x")
+_dev_req = struct.Struct("=H2xI")
+# struct hci_dev_info: dev_id, name[8], bdaddr, flags, type, features[8], pkt_type, link_policy, link_mode,
+# acl_mtu, acl_pkts, sco_mtu, sco_pkts, struct hci_dev_stats
+_dev_info = struct.Struct("=H8s6sIB8s3xIIIHHHH40x")
+
+HCI_UP = 0x01
+HCI_RUNNING = 0x04
+HCI_PSCAN = 0x08
+HCI_ISCAN = 0x10
+
+bus_names = ["VIRTUAL", "USB", "PCCARD", "UART", "RS232", "PCI", "SDIO", "SPI", "I2C", "SMD", "VIRTIO", "IPC"]
+device_type_names = ["Primary", "AMP"]
+
+# Management channel
+_mgmt_header = struct.Struct("<HHH")
+MGMT_OP_READ_INDEX_LIST = 0x0003
+MGMT_EV_CMD_COMPLETE = 0x0001
+MGMT_EV_INDEX_ADDED = 0x0004
+MGMT_EV_INDEX_REMOVED = 0x0005
+MGMT_EV_NEW_SETTINGS = 0x0006
+MGMT_EV_CLASS_OF_DEV_CHANGED = 0x0007
+MGMT_EV_LOCAL_NAME_CHANGED = 0x0008
+
+
+def format_address(bdaddr):
+    """
+    Converts a bdaddr_t (least significant byte first) to 'AA:BB:CC:DD:EE:FF'.
+    """
+    return ":".join(f"{byte:02X}" for byte in reversed(bdaddr))
+
+
+class ControllerInfo:
+
+    """
+    A controller as reported by HCIGETDEVINFO.
+
+    Attributes:
+        index: HCI device index.
+        interface: Interface name, e.g. 'hci0'.
+        address: BD address, e.g. 'AA:BB:CC:DD:EE:FF'.
+        bus: Bus name as printed by hciconfig, e.g. 'USB'.
+        device_type: 'Primary' or 'AMP'.
+        flags: HCI device flags (HCI_UP, HCI_RUNNING, ...).
+        link_policy: Default link policy bits (HCI_LP_*).
+        link_mode: Link mode bits (HCI_LM_*).
+    """
+
+    __slots__ = ("index", "interface", "address", "bus", "device_type", "flags", "features", "link_policy",
+                 "link_mode", "acl_mtu", "acl_packets", "sco_mtu", "sco_packets")
+
+    def __init__(self, index, interface, address, bus, device_type, flags, features=b"", link_policy=0, link_mode=0,
+                 acl_mtu=0, acl_packets=0, sco_mtu=0, sco_packets=0):
+        self.index = index
+        self.interface = interface
+        self.address = address
+        self.bus = bus
+        self.device_type = device_type
+        self.flags = flags
+        self.features = features
+        self.link_policy = link_policy
+        self.link_mode = link_mode
+        self.acl_mtu = acl_mtu
+        self.acl_packets = acl_packets
+        self.sco_mtu = sco_mtu
+        self.sco_packets = sco_packets
+
+    @property
+    def up(self):
+        return bool(self.flags & HCI_UP)
+
+    def details(self):
+        """
+        Returns:
+            str: Interface and bus, as shown in the controller list.
+        """
+        return f"Interface: {self.interface} \t Bus: {self.bus}"
+
+    def __eq__(self, other):
+        return isinstance(other, ControllerInfo) and all(getattr(self, name) == getattr(other, name)
+                                                         for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"ControllerInfo({self.interface}, {self.address}, {self.device_type}, {self.bus}, "
+                f"{'UP' if self.up else 'DOWN'})")
+
+
+def _hci_socket():
+    return socket.socket(hci_transport.AF_BLUETOOTH, socket.SOCK_RAW, hci_transport.BTPROTO_HCI)
+
+
+def list_device_ids(sock=None):
+    """
+    Lists the HCI device indexes registered with the kernel (HCIGETDEVLIST).
+
+    Args:
+        sock (socket.socket, optional): Raw HCI socket to issue the ioctl on; a temporary one is opened if omitted.
+
+    Returns:
+        list: Device indexes.
+
+    Raises:
+        OSError: If Bluetooth sockets are unavailable.
+    """
+    buffer = bytearray(_dev_list_header.size + HCI_MAX_DEV * _dev_req.size)
+    _dev_list_header.pack_into(buffer, 0, HCI_MAX_DEV)
+    owned = sock is None
+    sock = sock or _hci_socket()
+    try:
+        fcntl.ioctl(sock.fileno(), HCIGETDEVLIST, buffer)
+    finally:
+        if owned:
+            sock.close()
+    count = _dev_list_header.unpack_from(buffer)[0]
+    return [_dev_req.unpack_from(buffer, _dev_list_header.size + number * _dev_req.size)[0]
+            for number in range(min(count, HCI_MAX_DEV))]
+
+
+def read_device_info(index, sock=None):
+    """
+    Reads a controller's address, bus, type and state (HCIGETDEVINFO).
+
+    Args:
+        index (int): HCI device index.
+        sock (socket.socket, optional): Raw HCI socket to issue the ioctl on; a temporary one is opened if omitted.
+
+    Returns:
+        ControllerInfo: The controller.
+
+    Raises:
+        OSError: If the device does not exist (ENODEV) or Bluetooth sockets are unavailable.
+    """
+    buffer = bytearray(_dev_info.size)
+    struct.pack_into("=H", buffer, 0, index)
+    owned = sock is None
+    sock = sock or _hci_socket()
+    try:
+        fcntl.ioctl(sock.fileno(), HCIGETDEVINFO, buffer)
+    finally:
+        if owned:
+            sock.close()
+    (dev_id, name, bdaddr, flags, dev_type, features, _, link_policy, link_mode, acl_mtu, acl_packets, sco_mtu,
+     sco_packets) = _dev_info.unpack(buffer)
+    bus = dev_type & 0x0f
+    kind = (dev_type >> 4) & 0x03
+    return ControllerInfo(dev_id, name.rstrip(b"\x00").decode(errors="replace"), format_address(bdaddr),
+                          bus_names[bus] if bus < len(bus_names) else "UNKNOWN",
+                          device_type_names[kind] if kind < len(device_type_names) else "UNKNOWN",
+                          flags, bytes(features), link_policy, link_mode, acl_mtu, acl_packets, sco_mtu, sco_packets)
+
+
+def enumerate_controllers():
+    """
+    Reads every controller registered with the kernel, without running hciconfig.
+
+    Returns:
+        dict: Device index -> ControllerInfo.
+
+    Raises:
+        OSError: If Bluetooth sockets are unavailable.
+    """
+    controllers = {}
+    with _hci_socket() as sock:
+        for index in list_device_ids(sock):
+            try:
+                controllers[index] = read_device_info(index, sock)
+            except OSError:
+                # Removed between the two ioctls
+                continue
+    return controllers
+
+
+class ControllerRegistry:
+
+    """
+    Cache of the host's controllers kept current by hotplug events.
+
+    Controllers are enumerated with the HCI device-list ioctls. Once start()ed,
+    a thread listens on the management channel for Index Added/Removed events
+    (falling back to re-enumerating every poll_interval seconds when the
+    channel cannot be opened) and updates the cache. Listeners are called
+    from that thread as listener(event, controller) with event 'added',
+    'removed' or 'changed'; 'changed' is also sent when the management
+    channel reports new settings, a new local name or a new class of device.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, log=None, poll_interval=2.0):
+        """
+        Initializes the registry and enumerates the controllers.
+
+        Args:
+            log (Logger, optional): Logger instance used for logging.
+            poll_interval (float): Seconds between enumerations when hotplug events are unavailable.
+        """
+        self.log = log
+        self.poll_interval = poll_interval
+        self.lock = threading.RLock()
+        self.by_index = {}
+        self.listeners = []
+        self.thread = None
+        self.running = False
+        self.last_error = None
+        self.refresh()
+
+    @classmethod
+    def get_instance(cls, log=None):
+        """
+        Returns the application-wide registry, creating and starting it on first use.
+
+        Args:
+            log (Logger, optional): Logger used if the registry is created by this call.
+
+        Returns:
+            ControllerRegistry: The shared registry.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(log)
+                cls._instance.start()
+            return cls._instance
+
+    def _info(self, message):
+        if self.log:
+            self.log.info(message)
+
+    def controllers(self):
+        """
+        Returns:
+            list: ControllerInfo objects ordered by device index.
+        """
+        with self.lock:
+            return [self.by_index[index] for index in sorted(self.by_index)]
+
+    def addresses(self):
+        """
+        Returns:
+            dict: BD address -> interface, ordered by device index.
+        """
+        return {controller.address: controller.interface for controller in self.controllers()}
+
+    def get(self, key):
+        """
+        Args:
+            key (str | int): Interface name, BD address or device index.
+
+        Returns:
+            ControllerInfo: The controller, None if it is not present.
+        """
+        for controller in self.controllers():
+            if key in (controller.index, controller.interface, controller.address):
+                return controller
+        return None
+
+    def add_listener(self, listener):
+        with self.lock:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def _notify(self, event, controller):
+        with self.lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            try:
+                listener(event, controller)
+            except Exception as e:
+                self._info(f"[ERROR] Controller {event} listener failed: {e}")
+
+    def refresh(self, key=None):
+        """
+        Re-reads one controller, or enumerates them all, and notifies listeners of the differences.
+
+        Args:
+            key (str | int, optional): Interface name, BD address or device index; every controller if omitted.
+
+        Returns:
+            list: ControllerInfo objects ordered by device index.
+        """
+        try:
+            if key is None:
+                current = enumerate_controllers()
+                indexes = set(current) | set(self.by_index)
+            else:
+                controller = self.get(key)
+                if controller is None and isinstance(key, str) and not key.startswith("hci"):
+                    return self.controllers()
+                index = controller.index if controller else (key if isinstance(key, int) else
+                                                             hci_transport.interface_index(key))
+                try:
+                    current = {index: read_device_info(index)}
+                except OSError:
+                    current = {}
+                indexes = {index}
+        except (OSError, ValueError) as e:
+            # Logged once while polling keeps failing the same way
+            if str(e) != self.last_error:
+                self._info(f"[ERROR] Failed to enumerate controllers: {e}")
+                self.last_error = str(e)
+            return self.controllers()
+        self.last_error = None
+        events = []
+        with self.lock:
+            for index in sorted(indexes):
+                old, new = self.by_index.get(index), current.get(index)
+                if new is None and old is not None:
+                    del self.by_index[index]
+                    events.append(("removed", old))
+                elif new is not None and new != old:
+                    self.by_index[index] = new
+                    events.append(("added" if old is None else "changed", new))
+        for event, controller in events:
+            self._info(f"[INFO] Controller {event}: {controller}")
+            self._notify(event, controller)
+        return self.controllers()
+
+    def _changed(self, index):
+        with self.lock:
+            old = self.by_index.get(index)
+        self.refresh(index)
+        with self.lock:
+            new = self.by_index.get(index)
+        if new is not None and new == old:
+            # Name or class changed, which HCIGETDEVINFO does not report
+            self._notify("changed", new)
+
+    def _remove_index(self, index):
+        with self.lock:
+            controller = self.by_index.pop(index, None)
+        if controller is not None:
+            self._info(f"[INFO] Controller removed: {controller}")
+            self._notify("removed", controller)
+
+    def start(self):
+        """
+        Starts following hotplug events.
+
+        args: None
+        returns: None
+        """
+        if self.thread is not None:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="controller-registry", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops following hotplug events.
+
+        args: None
+        returns: None
+        """
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2 * max(self.poll_interval, 1.0))
+            self.thread = None
+
+    def _run(self):
+        try:
+            sock = open_channel_socket(HCI_CHANNEL_CONTROL)
+        except OSError as e:
+            self._info(f"[WARN] Management channel unavailable ({e}), polling for controllers")
+            self._poll()
+            return
+        fallback = False
+        try:
+            # The answer resynchronizes the cache with changes made since the first enumeration
+            sock.send(_mgmt_header.pack(MGMT_OP_READ_INDEX_LIST, HCI_DEV_NONE, 0))
+            while self.running:
+                readable, _, _ = select.select([sock], [], [], 1.0)
+                if not readable:
+                    continue
+                data = sock.recv(1024)
+                if len(data) < _mgmt_header.size:
+                    continue
+                event, index, _ = _mgmt_header.unpack_from(data)
+                if event == MGMT_EV_INDEX_ADDED:
+                    self.refresh(index)
+                elif event == MGMT_EV_INDEX_REMOVED:
+                    self._remove_index(index)
+                elif event in (MGMT_EV_NEW_SETTINGS, MGMT_EV_CLASS_OF_DEV_CHANGED, MGMT_EV_LOCAL_NAME_CHANGED):
+                    self._changed(index)
+                elif event == MGMT_EV_CMD_COMPLETE:
+                    # Answer to the index list request: catch up with changes since the first enumeration
+                    self.refresh()
+        except OSError as e:
+            if self.running:
+                self._info(f"[WARN] Management channel failed ({e}), polling for controllers")
+                fallback = True
+        finally:
+            sock.close()
+        if fallback:
+            self._poll()
+
+    def _poll(self):
+        while self.running:
+            self.refresh()
+            for _ in range(max(int(self.poll_interval / 0.25), 1)):
+                if not self.running:
+                    return
+                time.sleep(0.25)
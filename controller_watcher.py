@@ -0,0 +1,45 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from Backend_lib.Linux.controller_registry import ControllerRegistry
+
+
+class ControllerWatcher(QObject):
+
+    """
+    Qt bridge for ControllerRegistry hotplug notifications.
+
+    The registry calls its listeners from its own thread; emitting signals
+    from there queues them to the receivers' (GUI) thread.
+    """
+
+    controller_added = pyqtSignal(str, str)
+    controller_removed = pyqtSignal(str, str)
+    controller_changed = pyqtSignal(str, str)
+
+    def __init__(self, log=None, parent=None):
+        """
+        Initializes the watcher and starts listening to the shared registry.
+
+        Args:
+            log (Logger, optional): Logger used if the registry is created by this call.
+            parent (QObject, optional): Parent object.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.registry = ControllerRegistry.get_instance(log)
+        self.registry.add_listener(self._on_registry_event)
+
+    def _on_registry_event(self, event, controller):
+        signal = {"added": self.controller_added, "removed": self.controller_removed,
+                  "changed": self.controller_changed}[event]
+        signal.emit(controller.address, controller.interface)
+
+    def close(self):
+        """
+        Stops listening to the registry.
+
+        args: None
+        returns: None
+        """
+        self.registry.remove_listener(self._on_registry_event)
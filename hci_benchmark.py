@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event
+from Backend_lib.Linux.hci_emulator import VirtualController
+from Backend_lib.Linux.hci_scheduler import HciCommandScheduler
+
+
+# (group, command, parameters) run in rotation when no mix is given
+default_mix = [
+    ("Informational parameters", "Read BD_ADDR", []),
+    ("Status parameters", "Read RSSI", ["0x0040"]),
+    ("LE Controller commands", "LE Set Advertising Data", ["0x08", "0x7665645f74736574"]),
+]
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Sorted samples.
+        pct (float): Percentile, 0-100.
+
+    Returns:
+        float: The percentile, None for an empty list.
+    """
+    if not sorted_values:
+        return None
+    index = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(samples):
+    """
+    Summarizes latency samples given in seconds.
+
+    Args:
+        samples (list): Latency samples in seconds.
+
+    Returns:
+        dict: count, mean and min/p50/p95/p99/max in microseconds.
+    """
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_us": sum(values) / len(values) * 1e6,
+        "min_us": values[0] * 1e6,
+        "p50_us": percentile(values, 50) * 1e6,
+        "p95_us": percentile(values, 95) * 1e6,
+        "p99_us": percentile(values, 99) * 1e6,
+        "max_us": values[-1] * 1e6,
+    }
+
+
+def parse_mix(specs):
+    """
+    Parses command mix entries given as 'Group/Command[/param,param...]'.
+
+    Args:
+        specs (list): Mix entries.
+
+    Returns:
+        list: (group, command, parameters) tuples.
+    """
+    mix = []
+    for spec in specs:
+        parts = spec.split("/")
+        parameters = parts[2].split(",") if len(parts) > 2 and parts[2] else []
+        get_encoder(parts[0], parts[1])
+        mix.append((parts[0], parts[1], parameters))
+    return mix
+
+
+def _null_log():
+    log = logging.getLogger("hci_benchmark")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+    return log
+
+
+def benchmark_stages(interface, mix, iterations, log, warmup=10):
+    """
+    Runs the mix over the raw transport, timing encode, transport and decode separately.
+
+    Args:
+        interface (str): Interface (or registered emulator) to run against.
+        mix (list): (group, command, parameters) tuples, run in rotation.
+        iterations (int): Number of commands to send.
+        log (Logger): Logger instance used for logging.
+        warmup (int): Commands sent before measuring.
+
+    Returns:
+        dict: Per-stage and per-command latency summaries, throughput and failures.
+    """
+    transport = hci_transport.get_transport(interface, log)
+    encoders = [(get_encoder(group, command), parameters) for group, command, parameters in mix]
+    for index in range(warmup):
+        encoder, parameters = encoders[index % len(encoders)]
+        transport.execute(encoder.opcode, encoder.encode(parameters))
+
+    stages = {"encode": [], "transport": [], "decode": [], "total": []}
+    per_command = {encoder.name: [] for encoder, _ in encoders}
+    failures = {}
+    clock = time.perf_counter
+    started = clock()
+    for index in range(iterations):
+        encoder, parameters = encoders[index % len(encoders)]
+        t0 = clock()
+        packet = encoder.encode(parameters)
+        t1 = clock()
+        try:
+            event = transport.execute(encoder.opcode, packet)
+        except hci_transport.HciTransportError as e:
+            failures[encoder.name] = failures.get(encoder.name, 0) + 1
+            log.info(f"[ERROR] {e}")
+            continue
+        t2 = clock()
+        decoded = decode_command_event(event)
+        t3 = clock()
+        stages["encode"].append(t1 - t0)
+        stages["transport"].append(t2 - t1)
+        stages["decode"].append(t3 - t2)
+        stages["total"].append(t3 - t0)
+        per_command[encoder.name].append(t3 - t0)
+        if decoded.status:
+            failures[encoder.name] = failures.get(encoder.name, 0) + 1
+    elapsed = clock() - started
+    return {
+        "mode": "stages",
+        "commands_per_second": iterations / elapsed if elapsed else None,
+        "elapsed_s": elapsed,
+        "stages": {stage: summarize(samples) for stage, samples in stages.items()},
+        "commands": {name: summarize(samples) for name, samples in per_command.items()},
+        "failures": failures,
+    }
+
+
+def benchmark_end_to_end(interface, mix, iterations, log, warmup=10):
+    """
+    Runs the mix through utils.run_hci_cmd, the path the UI and scripts use.
+
+    Args:
+        interface (str): Interface (or registered emulator) to run against.
+        mix (list): (group, command, parameters) tuples, run in rotation.
+        iterations (int): Number of commands to send.
+        log (Logger): Logger instance passed to run_hci_cmd.
+        warmup (int): Commands sent before measuring.
+
+    Returns:
+        dict: Per-command latency summaries, throughput and failures.
+    """
+    from utils import run_hci_cmd
+
+    for index in range(warmup):
+        group, command, parameters = mix[index % len(mix)]
+        run_hci_cmd(group, command, interface, log, parameters)
+
+    samples = []
+    per_command = {command: [] for _, command, _ in mix}
+    failures = {}
+    clock = time.perf_counter
+    started = clock()
+    for index in range(iterations):
+        group, command, parameters = mix[index % len(mix)]
+        t0 = clock()
+        result = run_hci_cmd(group, command, interface, log, parameters)
+        latency = clock() - t0
+        samples.append(latency)
+        per_command[command].append(latency)
+        if result.exit_status or (result.event and result.event.status):
+            failures[command] = failures.get(command, 0) + 1
+    elapsed = clock() - started
+    return {
+        "mode": "end_to_end",
+        "commands_per_second": iterations / elapsed if elapsed else None,
+        "elapsed_s": elapsed,
+        "stages": {"total": summarize(samples)},
+        "commands": {name: summarize(values) for name, values in per_command.items()},
+        "failures": failures,
+    }
+
+
+def benchmark_pipelined(interface, mix, iterations, log):
+    """
+    Runs the mix through the asyncio scheduler, keeping the controller's command credits used.
+
+    Args:
+        interface (str): Interface (or registered emulator) to run against.
+        mix (list): (group, command, parameters) tuples, run in rotation.
+        iterations (int): Number of commands to send.
+        log (Logger): Logger instance used for logging.
+
+    Returns:
+        dict: Completion latency summary (queueing included), throughput and failures.
+    """
+    async def _run():
+        transport = hci_transport.get_transport(interface, log)
+        clock = time.perf_counter
+
+        async def timed(scheduler, group, command, parameters):
+            t0 = clock()
+            try:
+                event = await scheduler.send(group, command, parameters)
+            except hci_transport.HciTransportError:
+                return command, None, True
+            return command, clock() - t0, bool(event.status)
+
+        async with HciCommandScheduler(transport, log) as scheduler:
+            started = clock()
+            results = await asyncio.gather(*(timed(scheduler, *mix[index % len(mix)]) for index in range(iterations)))
+            return results, clock() - started
+
+    results, elapsed = asyncio.run(_run())
+    failures = {}
+    for command, _, failed in results:
+        if failed:
+            failures[command] = failures.get(command, 0) + 1
+    return {
+        "mode": "pipelined",
+        "commands_per_second": iterations / elapsed if elapsed else None,
+        "elapsed_s": elapsed,
+        "stages": {"total": summarize([latency for _, latency, _ in results if latency is not None])},
+        "commands": {},
+        "failures": failures,
+    }
+
+
+def format_report(report):
+    """
+    Renders a benchmark report as a text table.
+
+    Args:
+        report (dict): Report returned by one of the benchmark functions.
+
+    Returns:
+        str: Human readable report.
+    """
+    lines = [f"{report['interface']} [{report['mode']}] {report['iterations']} commands, "
+             f"{report['commands_per_second']:.0f} commands/s"]
+    header = f"{'':<40}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'mean us':>10}"
+    lines.append(header)
+    rows = [(f"stage: {name}", summary) for name, summary in report["stages"].items()]
+    rows += list(report["commands"].items())
+    for name, summary in rows:
+        if summary.get("count"):
+            lines.append(f"{name:<40}{summary['p50_us']:>10.1f}{summary['p95_us']:>10.1f}"
+                         f"{summary['p99_us']:>10.1f}{summary['mean_us']:>10.1f}")
+    if report["failures"]:
+        lines.append(f"failures: {report['failures']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Example:
+        python -m Backend_lib.Linux.hci_benchmark -i hci0 -n 5000 --json run.json
+        python -m Backend_lib.Linux.hci_benchmark --emulator --latency 0.0005 --mode pipelined
+    """
+    parser = argparse.ArgumentParser(description="HCI command latency and throughput benchmark")
+    parser.add_argument("-i", "--interface", default="hci0", help="controller interface (default hci0)")
+    parser.add_argument("-n", "--iterations", type=int, default=1000, help="commands to send")
+    parser.add_argument("-c", "--command", action="append", default=[],
+                        help="mix entry 'Group/Command[/param,...]', repeatable")
+    parser.add_argument("--mode", choices=["stages", "end_to_end", "pipelined"], default="stages",
+                        help="stages: encode/transport/decode breakdown, end_to_end: utils.run_hci_cmd, "
+                             "pipelined: asyncio scheduler")
+    parser.add_argument("--emulator", action="store_true", help="run against an in-process virtual controller")
+    parser.add_argument("--latency", type=float, default=0.0, help="emulator response latency in seconds")
+    parser.add_argument("--num-command-packets", type=int, default=1, help="emulator command buffer size")
+    parser.add_argument("--json", help="write the report as JSON to this path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    log = _null_log()
+    mix = parse_mix(args.command) if args.command else default_mix
+    emulator = None
+    if args.emulator:
+        emulator = VirtualController(interface=args.interface, latency=args.latency,
+                                     num_command_packets=args.num_command_packets, log=log).start()
+    try:
+        if args.mode == "stages":
+            report = benchmark_stages(args.interface, mix, args.iterations, log)
+        elif args.mode == "end_to_end":
+            report = benchmark_end_to_end(args.interface, mix, args.iterations, log)
+        else:
+            report = benchmark_pipelined(args.interface, mix, args.iterations, log)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    report.update({"interface": args.interface, "iterations": args.iterations, "emulator": args.emulator,
+                   "mix": [f"{group}/{command}" for group, command, _ in mix], "timestamp": time.time()})
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        print(format_report(report))
+        if args.json:
+            with open(args.json, "w") as fp:
+                json.dump(report, fp, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+import argparse
+import ctypes
+import ctypes.util
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+
+from Backend_lib.Linux import btsnoop
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_filter import parse_filter
+
+
+HCI_CHANNEL_MONITOR = 2
+HCI_CHANNEL_CONTROL = 3
+HCI_DEV_NONE = 0xffff
+
+# Monitor channel opcodes that are not HCI traffic but describe controllers
+MONITOR_NEW_INDEX = 0
+MONITOR_DEL_INDEX = 1
+
+_monitor_header = struct.Struct("<HHH")
+_timeval = struct.Struct("@ll")
+_SO_TIMESTAMP = getattr(socket, "SO_TIMESTAMP", 29)
+_MAX_PACKET = 0x10000 + _monitor_header.size
+
+
+class _SockaddrHci(ctypes.Structure):
+    _fields_ = [("hci_family", ctypes.c_ushort), ("hci_dev", ctypes.c_ushort), ("hci_channel", ctypes.c_ushort)]
+
+
+def open_channel_socket(channel, device=HCI_DEV_NONE):
+    """
+    Opens a raw HCI socket bound to an HCI channel (monitor, control, user).
+
+    The socket module cannot pass an HCI channel to bind(), so the bind is done
+    through libc and the descriptor is then wrapped in a socket object.
+
+    Args:
+        channel (int): HCI channel, e.g. HCI_CHANNEL_MONITOR or HCI_CHANNEL_CONTROL.
+        device (int): Controller index, HCI_DEV_NONE for channels that are not bound to one controller.
+
+    Returns:
+        socket.socket: Bound socket.
+
+    Raises:
+        OSError: If the socket cannot be created or bound.
+    """
+    sock = socket.socket(hci_transport.AF_BLUETOOTH, socket.SOCK_RAW, hci_transport.BTPROTO_HCI)
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    address = _SockaddrHci(hci_transport.AF_BLUETOOTH, device, channel)
+    if libc.bind(sock.fileno(), ctypes.byref(address), ctypes.sizeof(address)) < 0:
+        errno = ctypes.get_errno()
+        sock.close()
+        raise OSError(errno, f"HCI channel {channel} bind failed: {os.strerror(errno)}")
+    return sock
+
+
+def open_monitor_socket():
+    """
+    Opens a raw HCI socket bound to the monitor channel, which sees the traffic of every controller.
+
+    Returns:
+        socket.socket: Monitor channel socket.
+
+    Raises:
+        OSError: If the socket cannot be created or bound (CAP_NET_RAW is required).
+    """
+    sock = open_channel_socket(HCI_CHANNEL_MONITOR)
+    sock.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMP, 1)
+    return sock
+
+
+class HciMonitorCapture:
+
+    """
+    Records HCI traffic from the monitor channel into a btsnoop file.
+
+    With an interface the capture keeps only that controller and writes the H4
+    datalink that Wireshark and the replay/analysis tools read; without one it
+    writes every controller's traffic in the monitor datalink (as btmon -w does).
+    Packets are written from a background thread and flushed whenever the
+    socket has been idle for flush_interval seconds, so readers tailing the
+    file see new packets promptly. A capture_filter drops HCI packets before
+    they are written; it can be replaced while the capture runs.
+    """
+
+    def __init__(self, path, interface=None, log=None, sock=None, flush_interval=0.2, capture_filter=None):
+        """
+        Initializes the capture.
+
+        Args:
+            path (str): btsnoop file to append to.
+            interface (str, optional): Controller to capture (e.g. 'hci0'), None for all.
+            log (Logger, optional): Logger instance used for logging.
+            sock (socket.socket, optional): Pre-opened monitor socket, mainly for tests.
+            flush_interval (float): Idle seconds after which buffered records are flushed.
+            capture_filter (CaptureFilter, optional): Filter applied to HCI packets before writing.
+        """
+        self.path = path
+        self.interface = interface
+        self.index = hci_transport.interface_index(interface) if interface else None
+        self.log = log
+        self.sock = sock
+        self.flush_interval = flush_interval
+        self.capture_filter = capture_filter
+        self.writer = None
+        self.thread = None
+        self.running = False
+        self.packets = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.controllers = {}
+
+    def start(self):
+        """
+        Opens the monitor socket and the capture file and starts recording.
+
+        Returns:
+            HciMonitorCapture: self, for chaining.
+        """
+        if self.sock is None:
+            self.sock = open_monitor_socket()
+        self.sock.settimeout(self.flush_interval)
+        datalink = btsnoop.DATALINK_H4 if self.index is not None else btsnoop.DATALINK_MONITOR
+        try:
+            try:
+                self.writer = btsnoop.BtsnoopWriter(self.path, datalink)
+            except btsnoop.BtsnoopError as e:
+                # Written by a capture of another kind (or not a capture): keep it and start a new file
+                moved = _set_aside(self.path)
+                if self.log:
+                    self.log.info(f"[WARN] {e}; moved it to {moved} and started a new capture")
+                self.writer = btsnoop.BtsnoopWriter(self.path, datalink)
+        except (OSError, btsnoop.BtsnoopError):
+            self.sock.close()
+            self.sock = None
+            raise
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        if self.log:
+            self.log.info(f"[INFO] btsnoop capture started: {self.path}")
+        return self
+
+    def stop(self):
+        """
+        Stops recording and closes the socket and the capture file.
+
+        args: None
+        returns: None
+        """
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2 * self.flush_interval + 1)
+            self.thread = None
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+        if self.writer:
+            self.writer.close()
+        if self.log:
+            self.log.info(f"[INFO] btsnoop capture stopped: {self.path} ({self.packets} packets, "
+                          f"{self.dropped} filtered out)")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _receive(self):
+        """
+        Reads one monitor packet.
+
+        Returns:
+            tuple: (timestamp, monitor packet); socket.timeout is raised when idle.
+        """
+        data, ancillary, _, _ = self.sock.recvmsg(_MAX_PACKET, socket.CMSG_SPACE(_timeval.size))
+        timestamp = None
+        for level, kind, value in ancillary:
+            if level == socket.SOL_SOCKET and kind == _SO_TIMESTAMP and len(value) >= _timeval.size:
+                seconds, microseconds = _timeval.unpack_from(value)
+                timestamp = seconds + microseconds / 1e6
+        return (timestamp if timestamp is not None else time.time()), data
+
+    def _run(self):
+        try:
+            self._record()
+        except OSError as e:
+            # e.g. the disk is full; the capture is over
+            if self.log:
+                self.log.error(f"[ERROR] btsnoop capture to {self.path} failed: {e}")
+        finally:
+            self.running = False
+
+    def _record(self):
+        writer = self.writer
+        while self.running:
+            try:
+                timestamp, data = self._receive()
+            except socket.timeout:
+                writer.flush()
+                continue
+            except OSError as e:
+                if self.running and self.log:
+                    self.log.error(f"[ERROR] btsnoop capture receive failed: {e}")
+                break
+            if len(data) < _monitor_header.size:
+                continue
+            opcode, index, length = _monitor_header.unpack_from(data)
+            payload = data[_monitor_header.size:_monitor_header.size + length]
+            if opcode == MONITOR_NEW_INDEX and len(payload) >= 16:
+                self.controllers[index] = payload[8:16].rstrip(b"\x00").decode(errors="replace")
+            elif opcode == MONITOR_DEL_INDEX:
+                self.controllers.pop(index, None)
+            if self.index is not None and index != self.index:
+                continue
+            packet = None
+            if opcode in btsnoop.monitor_opcodes:
+                indicator, received = btsnoop.monitor_opcodes[opcode]
+                packet = bytes([indicator]) + payload
+                capture_filter = self.capture_filter
+                if capture_filter and not capture_filter.matches(packet):
+                    self.dropped += 1
+                    continue
+            if self.index is None:
+                writer.write(timestamp, (index << 16) | opcode, payload)
+            elif packet is not None:
+                writer.write(timestamp, btsnoop.packet_flags(received, packet), packet)
+            else:
+                continue
+            self.packets += 1
+            self.bytes += len(payload)
+        writer.flush()
+
+
+def _set_aside(path):
+    """
+    Renames a file out of the way, e.g. 'hci0_hci.btsnoop' -> 'hci0_hci.20250101-120000.btsnoop'.
+
+    Returns:
+        str: The new name.
+    """
+    root, ext = os.path.splitext(path)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    moved = f"{root}.{stamp}{ext}"
+    suffix = 1
+    while os.path.exists(moved):
+        moved = f"{root}.{stamp}-{suffix}{ext}"
+        suffix += 1
+    os.rename(path, moved)
+    return moved
+
+
+# Captures started through start_capture, keyed by interface ('all' for every controller)
+_captures = {}
+
+
+def start_capture(path, interface=None, log=None, capture_filter=None):
+    """
+    Starts a btsnoop capture unless one is already running for the interface to the same path.
+
+    A capture of the interface running to another path is stopped and replaced.
+
+    Args:
+        path (str): btsnoop file to append to.
+        interface (str, optional): Controller to capture, None for all.
+        log (Logger, optional): Logger instance used for logging.
+        capture_filter (CaptureFilter, optional): Filter applied to HCI packets before writing.
+
+    Returns:
+        HciMonitorCapture: The running capture.
+
+    Raises:
+        ValueError: If a capture of another interface is already writing to the path.
+    """
+    key = interface or "all"
+    for other_key, other in _captures.items():
+        if other_key != key and other.running and os.path.abspath(other.path) == os.path.abspath(path):
+            raise ValueError(f"{path} is already being written by the capture of {other_key}")
+    capture = _captures.get(key)
+    if capture is not None and capture.running and os.path.abspath(capture.path) != os.path.abspath(path):
+        if log:
+            log.info(f"[INFO] Restarting the {key} capture: {capture.path} -> {path}")
+        capture.stop()
+        capture = None
+    if capture is None or not capture.running:
+        if capture is not None:
+            # Ended on an error: release its socket and file
+            capture.stop()
+        capture = HciMonitorCapture(path, interface, log, capture_filter=capture_filter).start()
+        _captures[key] = capture
+    return capture
+
+
+def set_capture_filter(interface, capture_filter):
+    """
+    Replaces the filter of the capture started for an interface.
+
+    Args:
+        interface (str): Controller the capture was started for, None for all.
+        capture_filter (CaptureFilter): New filter; an empty filter keeps everything.
+
+    Returns:
+        bool: True if a capture is running for the interface.
+    """
+    capture = _captures.get(interface or "all")
+    if capture is None:
+        return False
+    capture.capture_filter = capture_filter
+    return True
+
+
+def stop_capture(interface=None):
+    """
+    Stops the capture started for an interface.
+
+    Args:
+        interface (str, optional): Controller the capture was started for, None for all.
+
+    Returns:
+        bool: True if a capture was stopped.
+    """
+    capture = _captures.pop(interface or "all", None)
+    if capture is None:
+        return False
+    capture.stop()
+    return True
+
+
+def main(argv=None):
+    """
+    Command line entry point; captures until interrupted.
+
+    Example:
+        python -m Backend_lib.Linux.hci_capture -i hci0 -w hci0.btsnoop
+        python -m Backend_lib.Linux.hci_capture -i hci0 -w hci0.btsnoop -f "exclude subevent:0x02,0x0d"
+    """
+    parser = argparse.ArgumentParser(description="Capture HCI traffic from the monitor channel to btsnoop")
+    parser.add_argument("-i", "--interface", help="controller to capture (default: all controllers)")
+    parser.add_argument("-w", "--write", required=True, help="btsnoop file to append to")
+    parser.add_argument("-d", "--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("-f", "--filter", default="", help="capture filter, e.g. 'exclude subevent:0x02,0x0d'")
+    args = parser.parse_args(argv)
+    try:
+        capture_filter = parse_filter(args.filter)
+    except ValueError as e:
+        parser.error(str(e))
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    with HciMonitorCapture(args.write, args.interface, capture_filter=capture_filter) as capture:
+        stop.wait(args.duration)
+    print(f"{capture.packets} packets, {capture.bytes} bytes written to {args.write}, "
+          f"{capture.dropped} filtered out")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import os
+import time
+
+from PyQt6.QtCore import (Qt, QObject, QThread, QTimer, QMetaObject, QAbstractTableModel, QModelIndex,
+                          pyqtSignal, pyqtSlot)
+
+from Backend_lib.Linux.btsnoop import BtsnoopFile, BtsnoopError
+from Backend_lib.Linux.hci_decoder import decode_capture
+from Backend_lib.Linux.hci_events import status_text
+from Backend_lib.Linux.hci_stats import HciStatistics
+
+
+class HciDecodeWorker(QObject):
+
+    """
+    Tails a btsnoop capture and decodes new packets off the GUI thread.
+
+    The worker lives in its own QThread and polls the capture every
+    poll_interval_ms. Decoded HciRecord objects are delivered through
+    records_decoded in batches of at most batch_size, so the GUI thread handles
+    one signal per batch rather than one per packet. The same records feed
+    an HciStatistics whose snapshot is emitted through statistics_updated at
+    most every stats_interval_ms.
+    """
+
+    records_decoded = pyqtSignal(list)
+    statistics_updated = pyqtSignal(dict)
+
+    def __init__(self, path, poll_interval_ms=50, batch_size=2000, stats_interval_ms=500):
+        """
+        Initializes the worker.
+
+        Args:
+            path (str): btsnoop capture path.
+            poll_interval_ms (int): Interval between checks for new packets.
+            batch_size (int): Maximum records per records_decoded signal.
+            stats_interval_ms (int): Minimum interval between statistics_updated signals.
+        returns:
+            None
+        """
+        super().__init__()
+        self.path = path
+        self.poll_interval_ms = poll_interval_ms
+        self.batch_size = batch_size
+        self.stats_interval = stats_interval_ms / 1000
+        self.statistics = HciStatistics()
+        self.stats_emitted = 0.0
+        self.capture = None
+        self.decoded = 0
+        self.timer = None
+
+    @pyqtSlot()
+    def start(self):
+        """
+        Starts polling; runs in the worker thread.
+
+        args: None
+        returns: None
+        """
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(self.poll_interval_ms)
+        self.poll()
+
+    @pyqtSlot()
+    def poll(self):
+        """
+        Decodes packets appended to the capture since the last poll, emits them in batches and
+        emits a statistics snapshot when one is due.
+
+        args: None
+        returns: None
+        """
+        if self.capture is None:
+            if not os.path.exists(self.path):
+                return
+            try:
+                self.capture = BtsnoopFile(self.path)
+            except BtsnoopError:
+                return
+        else:
+            self.capture.refresh()
+        if self.decoded < len(self.capture):
+            batch = []
+            add = self.statistics.add
+            for record in decode_capture(self.capture, self.decoded):
+                add(record)
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    self.records_decoded.emit(batch)
+                    batch = []
+            self.decoded = len(self.capture)
+            if batch:
+                self.records_decoded.emit(batch)
+        now = time.time()
+        if self.statistics.packets and now - self.stats_emitted >= self.stats_interval:
+            self.stats_emitted = now
+            self.statistics_updated.emit(self.statistics.snapshot(now))
+
+    @pyqtSlot()
+    def stop(self):
+        """
+        Stops polling and closes the capture; runs in the worker thread.
+
+        args: None
+        returns: None
+        """
+        if self.timer:
+            self.timer.stop()
+        if self.capture:
+            self.capture.close()
+            self.capture = None
+
+
+def format_time(timestamp):
+    """
+    Formats Unix seconds as local HH:MM:SS.ffffff.
+    """
+    return time.strftime("%H:%M:%S", time.localtime(timestamp)) + f".{int(timestamp * 1e6) % 1000000:06d}"
+
+
+class HciRecordModel(QAbstractTableModel):
+
+    """
+    Table model over the most recent decoded HCI records.
+
+    At most max_records rows are kept; the oldest are dropped as batches arrive.
+    Rows live in a list read from the offset of the first kept row, so data()
+    is an O(1) index anywhere in the table. Dropped rows are compacted away
+    once they outnumber max_records, so dropping is O(1) amortized.
+    """
+
+    headers = ["Time", "Dir", "Type", "Name", "Handle", "Status", "Len"]
+
+    def __init__(self, max_records=100000, parent=None):
+        """
+        Initializes the model.
+
+        Args:
+            max_records (int): Maximum number of rows kept.
+            parent (QObject, optional): Parent object.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.max_records = max_records
+        self.records = []
+        self.first = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records) - self.first
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        record = self.records[self.first + index.row()]
+        column = index.column()
+        if column == 0:
+            return format_time(record.timestamp)
+        if column == 1:
+            return record.direction
+        if column == 2:
+            return record.type_name
+        if column == 3:
+            return record.name
+        if column == 4:
+            return f"0x{record.handle:04x}" if record.handle is not None else ""
+        if column == 5:
+            return status_text(record.status) if record.status is not None else ""
+        return str(record.length)
+
+    @pyqtSlot(list)
+    def add_records(self, records):
+        """
+        Appends a batch of records, dropping the oldest rows beyond max_records.
+
+        Args:
+            records (list): HciRecord objects.
+        returns:
+            None
+        """
+        if len(records) > self.max_records:
+            records = records[-self.max_records:]
+        if not records:
+            return
+        overflow = self.rowCount() + len(records) - self.max_records
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self.first += overflow
+            if self.first >= self.max_records:
+                del self.records[:self.first]
+                self.first = 0
+            self.endRemoveRows()
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.records.extend(records)
+        self.endInsertRows()
+
+
+def start_decode_worker(path, poll_interval_ms=50, batch_size=2000):
+    """
+    Starts an HciDecodeWorker in its own QThread.
+
+    Args:
+        path (str): btsnoop capture path.
+        poll_interval_ms (int): Interval between checks for new packets.
+        batch_size (int): Maximum records per records_decoded signal.
+
+    Returns:
+        tuple: (HciDecodeWorker, QThread); stop with stop_decode_worker.
+    """
+    thread = QThread()
+    worker = HciDecodeWorker(path, poll_interval_ms, batch_size)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.start)
+    thread.start()
+    return worker, thread
+
+
+def stop_decode_worker(worker, thread):
+    """
+    Stops a worker started with start_decode_worker and waits for its thread.
+
+    Args:
+        worker (HciDecodeWorker): The worker.
+        thread (QThread): Its thread.
+    returns:
+        None
+    """
+    QMetaObject.invokeMethod(worker, "stop", Qt.ConnectionType.BlockingQueuedConnection)
+    thread.quit()
+    thread.wait()
@@ -0,0 +1,221 @@
+import struct
+
+from Backend_lib.Linux import btsnoop
+from Backend_lib.Linux import hci_return_parameters as hci_ret
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import encoders
+from Backend_lib.Linux.hci_events import command_names
+
+
+# Event code -> (name, status offset, connection handle offset); offsets count from the H4 indicator
+event_fields = {
+    0x01: ("Inquiry Complete", 3, None),
+    0x02: ("Inquiry Result", None, None),
+    0x03: ("Connection Complete", 3, 4),
+    0x04: ("Connection Request", None, None),
+    0x05: ("Disconnection Complete", 3, 4),
+    0x06: ("Authentication Complete", 3, 4),
+    0x07: ("Remote Name Request Complete", 3, None),
+    0x08: ("Encryption Change", 3, 4),
+    0x09: ("Change Connection Link Key Complete", 3, 4),
+    0x0b: ("Read Remote Supported Features Complete", 3, 4),
+    0x0c: ("Read Remote Version Information Complete", 3, 4),
+    0x0d: ("QoS Setup Complete", 3, 4),
+    0x0e: ("Command Complete", 6, None),
+    0x0f: ("Command Status", 3, None),
+    0x10: ("Hardware Error", None, None),
+    0x12: ("Role Change", 3, None),
+    0x13: ("Number Of Completed Packets", None, 4),
+    0x14: ("Mode Change", 3, 4),
+    0x17: ("Link Key Request", None, None),
+    0x18: ("Link Key Notification", None, None),
+    0x1a: ("Data Buffer Overflow", None, None),
+    0x1b: ("Max Slots Change", None, 3),
+    0x1d: ("Connection Packet Type Changed", 3, 4),
+    0x22: ("Inquiry Result with RSSI", None, None),
+    0x23: ("Read Remote Extended Features Complete", 3, 4),
+    0x2c: ("Synchronous Connection Complete", 3, 4),
+    0x2f: ("Extended Inquiry Result", None, None),
+    0x30: ("Encryption Key Refresh Complete", 3, 4),
+    0x31: ("IO Capability Request", None, None),
+    0x32: ("IO Capability Response", None, None),
+    0x33: ("User Confirmation Request", None, None),
+    0x36: ("Simple Pairing Complete", 3, None),
+    0x3e: ("LE Meta", None, None),
+    0x57: ("Authenticated Payload Timeout Expired", None, 3),
+    0xff: ("Vendor Specific", None, None),
+}
+
+# LE subevent code -> (name, status offset, connection handle offset); offsets count from the H4 indicator
+le_subevent_fields = {
+    0x01: ("LE Connection Complete", 4, 5),
+    0x02: ("LE Advertising Report", None, None),
+    0x03: ("LE Connection Update Complete", 4, 5),
+    0x04: ("LE Read Remote Features Complete", 4, 5),
+    0x05: ("LE Long Term Key Request", None, 4),
+    0x06: ("LE Remote Connection Parameter Request", None, 4),
+    0x07: ("LE Data Length Change", None, 4),
+    0x0a: ("LE Enhanced Connection Complete", 4, 5),
+    0x0c: ("LE PHY Update Complete", 4, 5),
+    0x0d: ("LE Extended Advertising Report", None, None),
+    0x12: ("LE Advertising Set Terminated", 4, 6),
+    0x14: ("LE Channel Selection Algorithm", None, 4),
+    0x19: ("LE CIS Established", 4, 5),
+    0x1a: ("LE CIS Request", None, 4),
+}
+
+PACKET_TYPES = {
+    hci_transport.HCI_COMMAND_PKT: "Command",
+    hci_transport.HCI_ACLDATA_PKT: "ACL",
+    hci_transport.HCI_SCODATA_PKT: "SCO",
+    hci_transport.HCI_EVENT_PKT: "Event",
+    hci_transport.HCI_ISODATA_PKT: "ISO",
+}
+
+# Commands whose first parameter, and Command Complete return parameters whose second field, is a connection handle
+_command_handle_opcodes = {encoder.opcode for encoder in encoders.values()
+                           if encoder.fields and "Handle" in encoder.fields[0] and encoder.widths[0] == 2}
+_return_handle_opcodes = set()
+for (_group, _name), _encoder in encoders.items():
+    _fields = getattr(hci_ret, _group.lower().replace(' ', '_'), {}).get(_name) or []
+    if len(_fields) > 1 and "Handle" in list(_fields[1])[0] and list(_fields[1].values())[0] == "uint16":
+        _return_handle_opcodes.add(_encoder.opcode)
+
+_u16 = struct.Struct("<H")
+
+
+class HciRecord:
+
+    """
+    Structured summary of one HCI packet.
+
+    Attributes:
+        timestamp: capture time as Unix seconds.
+        received: True for controller -> host traffic.
+        packet_type: H4 indicator (HCI_COMMAND_PKT, HCI_EVENT_PKT, ...).
+        opcode: command opcode for commands and Command Complete/Status events, None otherwise.
+        event: event code for events, None otherwise.
+        subevent: LE Meta subevent code, None otherwise.
+        name: command or event name.
+        handle: connection handle, None if the packet has none.
+        status: status code, None if the packet has none.
+        length: packet length including the H4 indicator.
+        credits: Num_HCI_Command_Packets of Command Complete/Status events, None otherwise.
+    """
+
+    __slots__ = ("timestamp", "received", "packet_type", "opcode", "event", "subevent", "name",
+                 "handle", "status", "length", "credits")
+
+    def __init__(self, timestamp, received, packet_type, opcode=None, event=None, subevent=None, name=None,
+                 handle=None, status=None, length=0, credits=None):
+        self.timestamp = timestamp
+        self.received = received
+        self.packet_type = packet_type
+        self.opcode = opcode
+        self.event = event
+        self.subevent = subevent
+        self.name = name
+        self.handle = handle
+        self.status = status
+        self.length = length
+        self.credits = credits
+
+    @property
+    def direction(self):
+        return "<" if not self.received else ">"
+
+    @property
+    def type_name(self):
+        return PACKET_TYPES.get(self.packet_type, f"0x{self.packet_type:02x}")
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return ('HciRecord(timestamp = %r, %s %s %r, handle = %r, status = %r)'
+                ) % (self.timestamp, self.direction, self.type_name, self.name, self.handle, self.status)
+
+
+def _u16_at(packet, offset):
+    return _u16.unpack_from(packet, offset)[0] & 0x0fff if len(packet) >= offset + 2 else None
+
+
+def _byte_at(packet, offset):
+    return packet[offset] if offset is not None and len(packet) > offset else None
+
+
+def decode_packet(timestamp, received, packet):
+    """
+    Decodes an H4 packet into an HciRecord.
+
+    Args:
+        timestamp (float): Capture time as Unix seconds.
+        received (bool): True for controller -> host traffic.
+        packet (bytes | memoryview): H4 packet.
+
+    Returns:
+        HciRecord: The decoded record, None for an empty packet.
+    """
+    if not packet:
+        return None
+    packet_type = packet[0]
+    length = len(packet)
+    if packet_type == hci_transport.HCI_EVENT_PKT and length >= 3:
+        code = packet[1]
+        name, status_offset, handle_offset = event_fields.get(code, (f"Event 0x{code:02x}", None, None))
+        opcode = subevent = credits = None
+        if code == 0x0e and length >= 6:
+            credits = packet[3]
+            opcode = _u16.unpack_from(packet, 4)[0]
+            name = f"Command Complete: {command_names.get(opcode, f'0x{opcode:04x}')}"
+            if opcode in _return_handle_opcodes:
+                handle_offset = 7
+        elif code == 0x0f and length >= 7:
+            credits = packet[4]
+            opcode = _u16.unpack_from(packet, 5)[0]
+            name = f"Command Status: {command_names.get(opcode, f'0x{opcode:04x}')}"
+        elif code == 0x3e and length >= 4:
+            subevent = packet[3]
+            name, status_offset, handle_offset = le_subevent_fields.get(
+                subevent, (f"LE Meta 0x{subevent:02x}", None, None))
+        return HciRecord(timestamp, received, packet_type, opcode, code, subevent, name,
+                         _u16_at(packet, handle_offset) if handle_offset else None,
+                         _byte_at(packet, status_offset), length, credits)
+    if packet_type == hci_transport.HCI_COMMAND_PKT and length >= 4:
+        opcode = _u16.unpack_from(packet, 1)[0]
+        handle = _u16_at(packet, 4) if opcode in _command_handle_opcodes else None
+        return HciRecord(timestamp, received, packet_type, opcode, name=command_names.get(opcode, f"0x{opcode:04x}"),
+                         handle=handle, length=length)
+    if packet_type in (hci_transport.HCI_ACLDATA_PKT, hci_transport.HCI_SCODATA_PKT, hci_transport.HCI_ISODATA_PKT):
+        return HciRecord(timestamp, received, packet_type, name=PACKET_TYPES[packet_type], handle=_u16_at(packet, 1),
+                         length=length)
+    return HciRecord(timestamp, received, packet_type, name=PACKET_TYPES.get(packet_type, "Unknown"), length=length)
+
+
+def decode_capture(capture, start=0):
+    """
+    Decodes the records of an open BtsnoopFile from a record number.
+
+    H4 captures are decoded straight from the memory map without copying packets.
+
+    Args:
+        capture (BtsnoopFile): Open capture.
+        start (int): First record number.
+
+    Yields:
+        HciRecord: Decoded records in capture order.
+    """
+    if capture.datalink == btsnoop.DATALINK_H4:
+        delta = btsnoop.BTSNOOP_EPOCH_DELTA
+        for flags, timestamp, data in capture.iter_raw(start):
+            record = decode_packet((timestamp - delta) / 1e6, bool(flags & 0x01), data)
+            data.release()
+            if record is not None:
+                yield record
+        return
+    for number in range(start, len(capture)):
+        raw = capture.record(number)
+        if raw is not None:
+            record = decode_packet(raw.timestamp, raw.received, raw.packet)
+            if record is not None:
+                yield record
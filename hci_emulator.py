@@ -0,0 +1,319 @@
+import queue
+import socket
+import struct
+import threading
+import time
+
+from Backend_lib.Linux import hci_return_parameters as hci_ret
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import encoders
+
+
+EVT_CONN_COMPLETE = 0x03
+EVT_DISCONN_COMPLETE = 0x05
+EVT_CMD_COMPLETE = 0x0e
+EVT_CMD_STATUS = 0x0f
+EVT_LE_META = 0x3e
+LE_SUBEVT_CONN_COMPLETE = 0x01
+LE_SUBEVT_ADVERTISING_REPORT = 0x02
+
+STATUS_SUCCESS = 0x00
+STATUS_UNKNOWN_COMMAND = 0x01
+
+# Return parameter values the emulator answers with unless overridden
+default_return_values = {
+    "Read Local Version Information": {"HCI_Version": 0x0c, "HCI_Subversion": 0x0001, "LMP_Version": 0x0c,
+                                       "Company_Identifier": 0x05f1, "LMP_Subversion": 0x0001},
+    "Read Local Supported Features": {"LMP_Features": bytes.fromhex("ffffffffffffff87")},
+    "Read Buffer Size": {"ACL_Data_Packet_Length": 1021, "Synchronous_Data_Packet_Length": 64,
+                         "Total_Num_ACL_Data_Packets": 8, "Total_Num_Synchronous_Data_Packets": 8},
+    "Read Local Name": {"Local_Name": "Virtual Controller"},
+    "Read Class of Device": {"Class_Of_Device": 0x000104},
+    "Read Default Link Policy Settings": {"Default_Link_Policy_Settings": 0x000f},
+    "Read RSSI": {"RSSI": -50},
+    "Read Link Quality Counter": {"Link_Quality": 0xff},
+    "LE Read Buffer Size [v1]": {"LE_ACL_Data_Packet_Length": 251, "Total_Num_LE_ACL_Data_Packets": 8},
+    "LE Read Buffer Size [v2]": {"LE_ACL_Data_Packet_Length": 251, "Total_Num_LE_ACL_Data_Packets": 8,
+                                 "ISO_Data_Packet_Length": 251, "Total_Num_ISO_Data_Packets": 8},
+    "LE Read Local Supported Features Page 0": {"LE_Features": bytes.fromhex("ff49010000000000")},
+    "LE Read Filter Accept List Size": {"Filter_Accept_List_Size": 16},
+    "LE Read Maximum Data Length": {"Supported_Max_TX_Octets": 251, "Supported_Max_TX_Time": 2120,
+                                    "Supported_Max_RX_Octets": 251, "Supported_Max_RX_Time": 2120},
+}
+
+_FIELD_CODES = {"int8": "b", "uint8": "B", "uint16": "H", "uint32": "I", "uint64": "Q"}
+
+
+def pack_return_parameters(fields, values):
+    """
+    Encodes Command Complete return parameters from a hci_return_parameters entry.
+
+    Args:
+        fields (list): Field entries ({"Field_Name": "type"}).
+        values (dict): Field values; missing fields are zero/empty.
+
+    Returns:
+        bytes: Encoded return parameters.
+    """
+    out = bytearray()
+    for field in fields:
+        name, kind = list(field.items())[0]
+        value = values.get(name)
+        if kind in _FIELD_CODES:
+            out += struct.pack("<" + _FIELD_CODES[kind], value or 0)
+        elif kind == "uint24":
+            out += (value or 0).to_bytes(3, "little")
+        elif kind == "bd_addr":
+            out += bytes(reversed(bytes.fromhex((value or "00:00:00:00:00:00").replace(":", ""))))
+        elif kind.startswith("hex:"):
+            out += (value or b"").ljust(int(kind[4:]), b"\x00")
+        elif kind == "name":
+            out += (value or "").encode("utf-8").ljust(248, b"\x00")[:248]
+        else:
+            out += value or b""
+    return bytes(out)
+
+
+class VirtualController:
+    """
+    In-process emulation of an HCI controller.
+
+    The host side is an HciSocketTransport over one end of a SOCK_SEQPACKET
+    socketpair, so everything built on the transport (run_hci_cmd, the
+    scheduler, benchmarks) runs unchanged without hardware. A background thread
+    answers the commands defined in hci_commands.py with canned return
+    parameters after a configurable latency, and test code can inject
+    connection and advertising events.
+    """
+
+    def __init__(self, interface="hci99", bd_address="00:1B:DC:00:00:01", latency=0.0,
+                 num_command_packets=1, return_values=None, log=None):
+        """
+        Initializes the virtual controller.
+
+        Args:
+            interface (str): Interface name the controller answers for.
+            bd_address (str): Controller address returned by Read BD_ADDR.
+            latency (float | callable): Seconds before each command is answered,
+                or a callable returning that delay per command.
+            num_command_packets (int): Size of the emulated command buffer; completions advertise
+                its free slots as Num_HCI_Command_Packets.
+            return_values (dict, optional): Command name -> {field: value} overriding the canned values.
+            log (Logger, optional): Logger instance used for logging.
+        """
+        self.interface = interface
+        self.bd_address = bd_address
+        self.latency = latency
+        self.num_command_packets = num_command_packets
+        self.log = log
+        self.return_values = {name: dict(values) for name, values in default_return_values.items()}
+        self.return_values.setdefault("Read BD_ADDR", {})["BD_ADDR"] = bd_address
+        for name, values in (return_values or {}).items():
+            self.return_values.setdefault(name, {}).update(values)
+        self.status_overrides = {}
+        self.commands_received = 0
+        self.next_handle = 0x0040
+        self.host_sock, self.controller_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.transport = hci_transport.HciSocketTransport(interface, sock=self.host_sock, log=log)
+        self.command_queue = queue.Queue()
+        self.threads = []
+        self.running = False
+        self.send_lock = threading.Lock()
+
+        self.commands = {}
+        status_commands = {(group, name) for group, names in hci_ret.command_status_commands.items()
+                           for name in names}
+        for (group, name), encoder in encoders.items():
+            fields = getattr(hci_ret, group.lower().replace(' ', '_'), {}).get(name)
+            self.commands[encoder.opcode] = (name, (group, name) in status_commands, fields)
+
+    def start(self, register=True):
+        """
+        Starts answering commands.
+
+        Args:
+            register (bool): Register the transport under the interface name so
+                utils.run_hci_cmd and get_transport use the emulator.
+
+        Returns:
+            VirtualController: self, for chaining.
+        """
+        self.running = True
+        self.threads = [threading.Thread(target=self._receive, daemon=True),
+                        threading.Thread(target=self._serve, daemon=True)]
+        for thread in self.threads:
+            thread.start()
+        if register:
+            hci_transport.register_transport(self.interface, self.transport)
+        return self
+
+    def stop(self):
+        """
+        Stops the controller and closes both socket ends.
+
+        args: None
+        returns: None
+        """
+        self.running = False
+        try:
+            self.controller_sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        for thread in self.threads:
+            thread.join(timeout=1)
+        self.controller_sock.close()
+        self.transport.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def set_status(self, command, status):
+        """
+        Makes a command fail with the given status.
+
+        Args:
+            command (str): Command name.
+            status (int): Status code to answer with, None to clear.
+        """
+        if status is None:
+            self.status_overrides.pop(command, None)
+        else:
+            self.status_overrides[command] = status
+
+    # ------------------------- event injection -------------------------#
+    def emit_event(self, event_code, parameters):
+        """
+        Sends an arbitrary event to the host.
+
+        Args:
+            event_code (int): Event code.
+            parameters (bytes): Event parameters.
+        """
+        with self.send_lock:
+            self.controller_sock.send(bytes([hci_transport.HCI_EVENT_PKT, event_code, len(parameters)]) + parameters)
+
+    def emit_connection_complete(self, address, handle=None, status=STATUS_SUCCESS, link_type=0x01):
+        """
+        Sends a BR/EDR Connection Complete event.
+
+        Returns:
+            int: Connection handle used.
+        """
+        handle = self._allocate_handle(handle)
+        self.emit_event(EVT_CONN_COMPLETE, struct.pack("<BH6sBB", status, handle, self._addr(address), link_type, 0))
+        return handle
+
+    def emit_le_connection_complete(self, address, handle=None, status=STATUS_SUCCESS, role=0x00,
+                                    address_type=0x00, interval=0x0028, latency=0, timeout=0x01f4):
+        """
+        Sends an LE Connection Complete event.
+
+        Returns:
+            int: Connection handle used.
+        """
+        handle = self._allocate_handle(handle)
+        self.emit_event(EVT_LE_META, struct.pack("<BBHBB6sHHHB", LE_SUBEVT_CONN_COMPLETE, status, handle, role,
+                                                 address_type, self._addr(address), interval, latency, timeout, 0))
+        return handle
+
+    def emit_disconnection_complete(self, handle, reason=0x13, status=STATUS_SUCCESS):
+        """
+        Sends a Disconnection Complete event.
+        """
+        self.emit_event(EVT_DISCONN_COMPLETE, struct.pack("<BHB", status, handle, reason))
+
+    def emit_advertising_report(self, address, data=b"", rssi=-60, event_type=0x00, address_type=0x00):
+        """
+        Sends an LE Advertising Report event with a single report.
+        """
+        self.emit_event(EVT_LE_META, struct.pack("<BBBB6sB", LE_SUBEVT_ADVERTISING_REPORT, 1, event_type,
+                                                 address_type, self._addr(address), len(data))
+                        + data + struct.pack("<b", rssi))
+
+    # ------------------------- command handling -------------------------#
+    def _allocate_handle(self, handle):
+        if handle is None:
+            handle = self.next_handle
+            self.next_handle += 1
+        return handle
+
+    @staticmethod
+    def _addr(address):
+        return bytes(reversed(bytes.fromhex(address.replace(":", ""))))
+
+    def _delay(self):
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def _credits(self):
+        """
+        Returns the free slots of the emulated command buffer.
+        """
+        return max(self.num_command_packets - self.command_queue.qsize(), 0)
+
+    def _receive(self):
+        """
+        Drains the socket into the command buffer, like a controller's HCI receive path.
+        """
+        while self.running:
+            try:
+                packet = self.controller_sock.recv(1024)
+            except OSError:
+                break
+            if not packet:
+                break
+            if packet[0] == hci_transport.HCI_COMMAND_PKT and len(packet) >= 4:
+                self.commands_received += 1
+                self.command_queue.put(packet)
+        self.command_queue.put(None)
+
+    def _serve(self):
+        while True:
+            packet = self.command_queue.get()
+            if packet is None:
+                return
+            self._delay()
+            try:
+                self._handle_command(packet)
+            except OSError:
+                return
+
+    def _handle_command(self, packet):
+        opcode, = struct.unpack_from("<H", packet, 1)
+        parameters = packet[4:]
+        name, is_status_command, fields = self.commands.get(opcode, (None, False, None))
+        status = self.status_overrides.get(name, STATUS_SUCCESS if name else STATUS_UNKNOWN_COMMAND)
+
+        if is_status_command:
+            self.emit_event(EVT_CMD_STATUS, struct.pack("<BBH", status, self._credits(), opcode))
+            if status == STATUS_SUCCESS:
+                self._follow_up(name, parameters)
+            return
+
+        if fields and status == STATUS_SUCCESS:
+            values = dict(self.return_values.get(name, {}))
+            values["Status"] = status
+            # Per-connection reads echo the handle they were asked about
+            handle_field, handle_type = list(fields[1].items())[0] if len(fields) > 1 else (None, None)
+            if handle_field and "Handle" in handle_field and handle_type == "uint16" and len(parameters) >= 2:
+                values[handle_field] = struct.unpack_from("<H", parameters)[0]
+            return_parameters = pack_return_parameters(fields, values)
+        else:
+            return_parameters = bytes([status])
+        self.emit_event(EVT_CMD_COMPLETE, struct.pack("<BH", self._credits(), opcode) + return_parameters)
+
+    def _follow_up(self, name, parameters):
+        """
+        Emits the completion event of commands answered with Command Status.
+        """
+        if name == "Create Connection" and len(parameters) >= 6:
+            self.emit_connection_complete(':'.join(f"{byte:02X}" for byte in reversed(parameters[:6])))
+        elif name == "LE Create Connection" and len(parameters) >= 12:
+            self.emit_le_connection_complete(':'.join(f"{byte:02X}" for byte in reversed(parameters[6:12])),
+                                             address_type=parameters[5])
+        elif name == "Disconnect" and len(parameters) >= 3:
+            self.emit_disconnection_complete(struct.unpack_from("<H", parameters)[0], reason=0x16)
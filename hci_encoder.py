@@ -0,0 +1,168 @@
+import struct
+
+from Backend_lib.Linux import hci_commands as hci
+
+
+HCI_COMMAND_PKT = 0x01
+
+# struct codes for the parameter widths that map onto native integers
+_INT_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+def _hex_octet(value):
+    """
+    Converts a parameter without a declared length the way hcitool does: one hex octet.
+    """
+    if isinstance(value, int):
+        return value & 0xff
+    return int(value.replace("0x", ""), 16) & 0xff
+
+
+def _to_int(value):
+    """
+    Converts a parameter with a declared length to an int ('0x' prefixed strings are hex, others decimal).
+    """
+    if isinstance(value, int):
+        return value
+    if "0x" in value:
+        return int(value.replace("0x", ""), 16)
+    return int(value)
+
+
+def _bytes_converter(width):
+    def convert(value):
+        return _to_int(value).to_bytes(width, "little")
+    return convert
+
+
+class HciCommandEncoder:
+    """
+    Precompiled encoder for one entry of the hci_commands parameter tables.
+
+    The opcode, parameter widths/offsets and a struct layout for the whole
+    H4 packet are derived once, so encoding a parameter list is a single
+    struct pack.
+    """
+
+    __slots__ = ("group", "name", "ogf", "ocf", "opcode", "fields", "widths", "offsets",
+                 "struct", "_codes", "_converters", "_prefix_structs")
+
+    def __init__(self, group, name, ogf, ocf, parameters):
+        """
+        Compiles the encoder.
+
+        Args:
+            group (str): Command group name (e.g., 'Informational parameters').
+            name (str): Command name (e.g., 'Read BD_ADDR').
+            ogf (int): Opcode group field.
+            ocf (int): Opcode command field.
+            parameters (list): Parameter entries from the hci_commands table.
+        """
+        self.group = group
+        self.name = name
+        self.ogf = ogf
+        self.ocf = ocf
+        self.opcode = (ogf << 10) | ocf
+        self.fields = []
+        self.widths = []
+        self.offsets = []
+        self._converters = []
+        self._prefix_structs = {}
+
+        codes = []
+        offset = 0
+        for parameter in parameters:
+            values = list(parameter.values())
+            width = values[1] if len(values) > 1 else None
+            self.fields.append(list(parameter.keys())[0])
+            self.offsets.append(offset)
+            if width is None:
+                self.widths.append(1)
+                self._converters.append(_hex_octet)
+                codes.append("B")
+                offset += 1
+            elif width in _INT_CODES:
+                self.widths.append(width)
+                self._converters.append(_to_int)
+                codes.append(_INT_CODES[width])
+                offset += width
+            else:
+                self.widths.append(width)
+                self._converters.append(_bytes_converter(width))
+                codes.append(f"{width}s")
+                offset += width
+        self._codes = codes
+        self.struct = self._compile(len(codes))
+
+    def _compile(self, count):
+        layout = struct.Struct("<BHB" + "".join(self._codes[:count]))
+        self._prefix_structs[count] = layout
+        return layout
+
+    @property
+    def parameter_length(self):
+        """
+        Returns:
+            int: Length in octets of the full parameter block.
+        """
+        return self.struct.size - 4
+
+    def encode(self, parameters):
+        """
+        Encodes a parameter list into the H4 command packet.
+
+        Fewer parameters than the table defines may be given; only that prefix is encoded.
+
+        Args:
+            parameters (list): Parameter values as hex/decimal strings or ints.
+
+        Returns:
+            bytes: H4 command packet.
+
+        Raises:
+            ValueError: If a value does not fit its field or more parameters than fields are given.
+        """
+        count = len(parameters)
+        layout = self._prefix_structs.get(count)
+        if layout is None:
+            if count > len(self.fields):
+                raise ValueError(f"{self.name} takes {len(self.fields)} parameters, {count} given")
+            layout = self._compile(count)
+        try:
+            values = [convert(value) for convert, value in zip(self._converters, parameters)]
+            return layout.pack(HCI_COMMAND_PKT, self.opcode, layout.size - 4, *values)
+        except (struct.error, OverflowError) as e:
+            raise ValueError(f"Invalid parameter for {self.name}: {e}")
+
+
+def _compile_tables():
+    encoders = {}
+    for group, ogf in hci.hci_commands.items():
+        table = getattr(hci, group.lower().replace(' ', '_'))
+        for name, entry in table.items():
+            if not entry:
+                continue
+            parameters = entry[1] if len(entry) > 1 and isinstance(entry[1], list) else entry[1:]
+            encoders[(group, name)] = HciCommandEncoder(group, name, int(ogf, 16), int(entry[0], 16), parameters)
+    return encoders
+
+
+encoders = _compile_tables()
+encoders_by_opcode = {encoder.opcode: encoder for encoder in encoders.values()}
+
+
+def get_encoder(ogf, command):
+    """
+    Returns the precompiled encoder for a command.
+
+    Args:
+        ogf (str): Command group name as used in hci_commands (e.g., 'LE Controller commands').
+        command (str): Command name.
+
+    Returns:
+        HciCommandEncoder: The encoder.
+
+    Raises:
+        KeyError: If the command is not defined in the tables.
+    """
+    return encoders[(ogf, command)]
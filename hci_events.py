@@ -0,0 +1,263 @@
+import struct
+from collections import namedtuple
+
+from Backend_lib.Linux import hci_return_parameters as hci_ret
+from Backend_lib.Linux.hci_encoder import encoders
+
+
+HCI_EVENT_PKT = 0x04
+EVT_CMD_COMPLETE = 0x0e
+EVT_CMD_STATUS = 0x0f
+
+status_codes = {
+    0x00: "Success",
+    0x01: "Unknown HCI Command",
+    0x02: "Unknown Connection Identifier",
+    0x03: "Hardware Failure",
+    0x04: "Page Timeout",
+    0x05: "Authentication Failure",
+    0x06: "PIN or Key Missing",
+    0x07: "Memory Capacity Exceeded",
+    0x08: "Connection Timeout",
+    0x09: "Connection Limit Exceeded",
+    0x0a: "Synchronous Connection Limit To A Device Exceeded",
+    0x0b: "Connection Already Exists",
+    0x0c: "Command Disallowed",
+    0x0d: "Connection Rejected due to Limited Resources",
+    0x0e: "Connection Rejected Due To Security Reasons",
+    0x0f: "Connection Rejected due to Unacceptable BD_ADDR",
+    0x10: "Connection Accept Timeout Exceeded",
+    0x11: "Unsupported Feature or Parameter Value",
+    0x12: "Invalid HCI Command Parameters",
+    0x13: "Remote User Terminated Connection",
+    0x14: "Remote Device Terminated Connection due to Low Resources",
+    0x15: "Remote Device Terminated Connection due to Power Off",
+    0x16: "Connection Terminated By Local Host",
+    0x17: "Repeated Attempts",
+    0x18: "Pairing Not Allowed",
+    0x1a: "Unsupported Remote Feature",
+    0x1f: "Unspecified Error",
+    0x22: "LMP Response Timeout / LL Response Timeout",
+    0x23: "LMP Error Transaction Collision / LL Procedure Collision",
+    0x28: "Instant Passed",
+    0x29: "Pairing With Unit Key Not Supported",
+    0x2a: "Different Transaction Collision",
+    0x3a: "Controller Busy",
+    0x3b: "Unacceptable Connection Parameters",
+    0x3c: "Advertising Timeout",
+    0x3d: "Connection Terminated due to MIC Failure",
+    0x3e: "Connection Failed to be Established / Synchronization Timeout",
+    0x42: "Unknown Advertising Identifier",
+    0x43: "Limit Reached",
+    0x44: "Operation Cancelled by Host",
+    0x45: "Packet Too Long",
+}
+
+# struct codes for fixed-size return parameter types
+_FIELD_CODES = {"int8": "b", "uint8": "B", "uint16": "H", "uint24": "3s", "uint32": "I", "uint64": "Q",
+                "bd_addr": "6s"}
+
+
+def status_text(status):
+    """
+    Returns the readable name of an HCI status code.
+
+    Args:
+        status (int): Status code.
+
+    Returns:
+        str: e.g. '0x0c (Command Disallowed)'.
+    """
+    return f"0x{status:02x} ({status_codes.get(status, 'Reserved')})"
+
+
+def format_bd_addr(data):
+    """
+    Formats a little-endian 6 octet address as AA:BB:CC:DD:EE:FF.
+    """
+    return ':'.join(f"{byte:02X}" for byte in reversed(data))
+
+
+def _uint24(data):
+    return int.from_bytes(data, "little")
+
+
+def _name(data):
+    return data.split(b"\x00", 1)[0].decode("utf-8", "replace")
+
+
+class ReturnParameterDecoder:
+    """
+    Precompiled decoder for the return parameters of one command.
+
+    Fixed-size fields are unpacked with a single struct; an optional trailing
+    variable-length field ('name' or 'hex') takes the remaining octets.
+    """
+
+    def __init__(self, name, fields):
+        """
+        Compiles the decoder.
+
+        Args:
+            name (str): Command name.
+            fields (list): Field entries from hci_return_parameters.
+        """
+        self.name = name
+        self.fields = [list(field.keys())[0] for field in fields]
+        self.type = namedtuple(''.join(part for part in name.title() if part.isalnum()) or "ReturnParameters",
+                               self.fields, rename=True)
+        codes = []
+        self.converters = []
+        self.tail = None
+        for field in fields:
+            kind = list(field.values())[0]
+            if kind in ("name", "hex"):
+                self.tail = _name if kind == "name" else bytes
+                break
+            if kind.startswith("hex:"):
+                codes.append(f"{kind[4:]}s")
+                self.converters.append(None)
+            else:
+                codes.append(_FIELD_CODES[kind])
+                self.converters.append(_uint24 if kind == "uint24" else
+                                       format_bd_addr if kind == "bd_addr" else None)
+        self.struct = struct.Struct("<" + "".join(codes))
+        if not any(self.converters):
+            self.converters = None
+
+    def decode(self, data):
+        """
+        Decodes return parameters.
+
+        Args:
+            data (bytes): Return parameter octets of the Command Complete event.
+
+        Returns:
+            namedtuple: Typed return parameters. Fields the controller did not send
+            (e.g. after an error status) are None.
+        """
+        if len(data) < self.struct.size:
+            values = [data[0] if data else None] + [None] * (len(self.fields) - 1)
+            return self.type(*values)
+        values = self.struct.unpack_from(data)
+        if self.converters:
+            values = [convert(value) if convert else value for convert, value in zip(self.converters, values)]
+        if self.tail:
+            values = list(values) + [self.tail(data[self.struct.size:])]
+        return self.type(*values)
+
+
+class DefaultReturnParameters(namedtuple("DefaultReturnParameters", ["Status", "Data"])):
+    """
+    Return parameters of a command without an entry in hci_return_parameters.
+    """
+
+
+def _decode_default(data):
+    return DefaultReturnParameters(data[0] if data else None, bytes(data[1:]))
+
+
+class CommandComplete:
+    """
+    Decoded Command Complete event.
+
+    Attributes:
+        num_hci_command_packets: commands the controller can accept now.
+        opcode: opcode of the completed command.
+        command: command name, None for opcodes missing from hci_commands.
+        return_parameters: typed return parameters.
+    """
+
+    __slots__ = ("num_hci_command_packets", "opcode", "command", "return_parameters")
+
+    def __init__(self, num_hci_command_packets, opcode, command, return_parameters):
+        self.num_hci_command_packets = num_hci_command_packets
+        self.opcode = opcode
+        self.command = command
+        self.return_parameters = return_parameters
+
+    @property
+    def status(self):
+        return getattr(self.return_parameters, "Status", None)
+
+    def __repr__(self):
+        return ('CommandComplete(command = %r, opcode = 0x%04x, num_hci_command_packets = %r, '
+                'return_parameters = %r)') % (self.command, self.opcode, self.num_hci_command_packets,
+                                              self.return_parameters)
+
+    def __str__(self):
+        lines = [f"{self.command or 'Unknown command'} (0x{self.opcode:04x}) complete"]
+        for field, value in zip(self.return_parameters._fields, self.return_parameters):
+            if field == "Status" and value is not None:
+                value = status_text(value)
+            elif isinstance(value, bytes):
+                value = value.hex(' ') or '-'
+            elif isinstance(value, int) and value >= 0:
+                value = f"0x{value:x} ({value})"
+            lines.append(f"  {field}: {value}")
+        return "\n".join(lines)
+
+
+class CommandStatus:
+    """
+    Decoded Command Status event.
+
+    Attributes:
+        status: status of the command.
+        num_hci_command_packets: commands the controller can accept now.
+        opcode: opcode of the pending command.
+        command: command name, None for opcodes missing from hci_commands.
+    """
+
+    __slots__ = ("status", "num_hci_command_packets", "opcode", "command")
+
+    def __init__(self, status, num_hci_command_packets, opcode, command):
+        self.status = status
+        self.num_hci_command_packets = num_hci_command_packets
+        self.opcode = opcode
+        self.command = command
+
+    def __repr__(self):
+        return ('CommandStatus(command = %r, opcode = 0x%04x, status = 0x%02x, num_hci_command_packets = %r)'
+                ) % (self.command, self.opcode, self.status, self.num_hci_command_packets)
+
+    def __str__(self):
+        return f"{self.command or 'Unknown command'} (0x{self.opcode:04x}) status: {status_text(self.status)}"
+
+
+def _compile_decoders():
+    decoders = {}
+    for (group, name), encoder in encoders.items():
+        fields = getattr(hci_ret, group.lower().replace(' ', '_'), {}).get(name)
+        if fields:
+            decoders[encoder.opcode] = ReturnParameterDecoder(name, fields).decode
+    return decoders
+
+
+return_parameter_decoders = _compile_decoders()
+command_names = {encoder.opcode: encoder.name for encoder in encoders.values()}
+
+
+def decode_command_event(packet):
+    """
+    Decodes a Command Complete or Command Status event.
+
+    Args:
+        packet (bytes): H4 event packet, or the event without the H4 indicator.
+
+    Returns:
+        CommandComplete | CommandStatus | None: Decoded event, None for other events.
+    """
+    if packet and packet[0] == HCI_EVENT_PKT:
+        packet = packet[1:]
+    if len(packet) < 5:
+        return None
+    if packet[0] == EVT_CMD_COMPLETE:
+        num_packets, opcode = struct.unpack_from("<BH", packet, 2)
+        data = packet[5:2 + packet[1]]
+        decoder = return_parameter_decoders.get(opcode, _decode_default)
+        return CommandComplete(num_packets, opcode, command_names.get(opcode), decoder(data))
+    if packet[0] == EVT_CMD_STATUS and len(packet) >= 6:
+        status, num_packets, opcode = struct.unpack_from("<BBH", packet, 2)
+        return CommandStatus(status, num_packets, opcode, command_names.get(opcode))
+    return None
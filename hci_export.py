@@ -0,0 +1,282 @@
+import argparse
+import glob
+import os
+import signal
+import struct
+import sys
+import threading
+import time
+
+from Backend_lib.Linux import btsnoop
+from Backend_lib.Linux import hcidump
+
+
+PCAP_MAGIC = 0xa1b2c3d4
+LINKTYPE_BLUETOOTH_HCI_H4 = 187
+LINKTYPE_BLUETOOTH_HCI_H4_WITH_PHDR = 201     # 4 byte big-endian direction header: 0 sent, 1 received
+PCAP_SNAPLEN = 0x10000 + 8
+
+_pcap_header = struct.Struct("<IHHiIII")
+_pcap_record = struct.Struct("<IIII")
+_direction = struct.Struct(">I")
+
+export_formats = {"pcap": ".pcap", "btsnoop": ".btsnoop"}
+
+
+class PcapWriter:
+
+    """
+    Writes H4 packets to a pcap file with the LINKTYPE_BLUETOOTH_HCI_H4_WITH_PHDR link type,
+    which Wireshark dissects with the packet direction.
+    """
+
+    def __init__(self, path, buffer_size=1 << 16):
+        """
+        Creates the file, replacing an existing one.
+
+        Args:
+            path (str): Output path.
+            buffer_size (int): Write buffer size in bytes.
+        """
+        self.path = path
+        self.fp = open(path, "wb", buffering=buffer_size)
+        self.fp.write(_pcap_header.pack(PCAP_MAGIC, 2, 4, 0, 0, PCAP_SNAPLEN, LINKTYPE_BLUETOOTH_HCI_H4_WITH_PHDR))
+        self.records = 0
+
+    def write_packet(self, received, packet, timestamp=None):
+        """
+        Appends an H4 packet.
+
+        Args:
+            received (bool): True for controller -> host traffic.
+            packet (bytes): H4 packet.
+            timestamp (float, optional): Unix seconds, defaults to now.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        seconds, microseconds = divmod(int(round(timestamp * 1e6)), 1000000)
+        length = len(packet) + _direction.size
+        self.fp.write(_pcap_record.pack(seconds, microseconds, length, length))
+        self.fp.write(_direction.pack(1 if received else 0))
+        self.fp.write(packet)
+        self.records += 1
+
+    def flush(self):
+        self.fp.flush()
+
+    def close(self):
+        """
+        Flushes and closes the file.
+
+        args: None
+        returns: None
+        """
+        if not self.fp.closed:
+            self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_writer(path, export_format=None):
+    """
+    Creates an H4 packet writer, replacing an existing file.
+
+    Args:
+        path (str): Output path.
+        export_format (str, optional): 'pcap' or 'btsnoop'; taken from the extension if omitted (pcap by default).
+
+    Returns:
+        PcapWriter | btsnoop.BtsnoopWriter: The writer.
+    """
+    if export_format is None:
+        export_format = "btsnoop" if path.endswith(".btsnoop") else "pcap"
+    if export_format not in export_formats:
+        raise ValueError(f"Unknown export format: {export_format}")
+    if export_format == "pcap":
+        return PcapWriter(path)
+    if os.path.exists(path):
+        os.unlink(path)
+    return btsnoop.BtsnoopWriter(path, btsnoop.DATALINK_H4)
+
+
+def iter_hcidump_packets(path):
+    """
+    Iterates the H4 packets of an hcidump text log, across its rotated segments.
+
+    Only entries whose every byte is in the log are exported: raw dumps
+    (hcidump -R) and decoded dumps with hex payload (-x / -X). Entries without
+    a timestamp take the previous entry's time.
+
+    Args:
+        path (str): hcidump log path.
+
+    Yields:
+        tuple: (timestamp, received, packet).
+    """
+    timestamp = 0.0
+    for frame in hcidump.iter_frames(path):
+        if frame.timestamp is not None:
+            timestamp = frame.timestamp
+        packet = frame.packet()
+        if packet is not None:
+            yield timestamp, frame.received, packet
+
+
+def iter_btsnoop_packets(path, index=None, follow=False, poll_interval=0.2, stop=None):
+    """
+    Iterates the H4 packets of a btsnoop capture.
+
+    Args:
+        path (str): btsnoop file.
+        index (int, optional): Controller index to keep from monitor captures.
+        follow (bool): Keep waiting for packets appended to the file, as for a running capture.
+        poll_interval (float): Seconds between checks for new packets when following.
+        stop (threading.Event, optional): Ends following once set.
+
+    Yields:
+        tuple: (timestamp, received, packet).
+    """
+    capture = btsnoop.BtsnoopFile(path)
+    try:
+        number = 0
+        while True:
+            while number < len(capture):
+                record = capture.record(number)
+                number += 1
+                if record is None or (index is not None and record.index not in (None, index)):
+                    continue
+                yield record.timestamp, record.received, record.packet
+            if not follow or (stop is not None and stop.is_set()):
+                return
+            time.sleep(poll_interval)
+            capture.refresh()
+    finally:
+        capture.close()
+
+
+def iter_packets(path, index=None, follow=False, stop=None):
+    """
+    Iterates the H4 packets of a capture, detecting btsnoop files by their magic and reading anything else as hcidump text.
+
+    Args:
+        path (str): Capture path.
+        index (int, optional): Controller index to keep from btsnoop monitor captures.
+        follow (bool): Keep following a growing btsnoop capture (hcidump logs are read once).
+        stop (threading.Event, optional): Ends following once set.
+
+    Yields:
+        tuple: (timestamp, received, packet).
+    """
+    if btsnoop.is_btsnoop(path):
+        return iter_btsnoop_packets(path, index, follow, stop=stop)
+    return iter_hcidump_packets(path)
+
+
+def export_capture(source, output, export_format=None, index=None, follow=False, stop=None):
+    """
+    Converts a capture to pcap or btsnoop, streaming packet by packet so memory use stays constant.
+
+    Args:
+        source (str): hcidump text log or btsnoop capture.
+        output (str): Output path, replaced if it exists.
+        export_format (str, optional): 'pcap' or 'btsnoop'; taken from the output extension if omitted.
+        index (int, optional): Controller index to keep from btsnoop monitor captures.
+        follow (bool): Keep converting packets appended to a running btsnoop capture until stop is set.
+        stop (threading.Event, optional): Ends following once set.
+
+    Returns:
+        int: Number of packets written.
+    """
+    with open_writer(output, export_format) as writer:
+        for timestamp, received, packet in iter_packets(source, index, follow, stop):
+            writer.write_packet(received, packet, timestamp)
+            if follow:
+                writer.flush()
+        return writer.records
+
+
+def session_captures(log_path):
+    """
+    Finds the captures of a session folder: btsnoop captures and hcidump logs, one per interface.
+
+    An interface's btsnoop capture is preferred over its hcidump log, which
+    holds the same traffic but may lack payload bytes.
+
+    Args:
+        log_path (str): Session log folder.
+
+    Returns:
+        list: (name, path) tuples, e.g. ('hci0', 'logs/hci0_hci.btsnoop').
+    """
+    captures = {}
+    for path in sorted(glob.glob(os.path.join(log_path, "*_hcidump.log"))):
+        captures[os.path.basename(path)[:-len("_hcidump.log")]] = path
+    for path in sorted(glob.glob(os.path.join(log_path, "*_hci.btsnoop"))):
+        captures[os.path.basename(path)[:-len("_hci.btsnoop")]] = path
+    return sorted(captures.items())
+
+
+def export_session(log_path, output_dir=None, export_format="pcap", log=None):
+    """
+    Exports every capture of a session folder.
+
+    Args:
+        log_path (str): Session log folder.
+        output_dir (str, optional): Folder for the exported files, defaults to log_path.
+        export_format (str): 'pcap' or 'btsnoop'.
+        log (Logger, optional): Logger instance used for logging.
+
+    Returns:
+        dict: Output path -> number of packets written.
+    """
+    output_dir = output_dir or log_path
+    os.makedirs(output_dir, exist_ok=True)
+    exported = {}
+    for name, source in session_captures(log_path):
+        output = os.path.join(output_dir, f"{name}_hci_export{export_formats[export_format]}")
+        exported[output] = export_capture(source, output, export_format)
+        if log:
+            log.info(f"[INFO] Exported {source} to {output} ({exported[output]} packets)")
+    return exported
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Example:
+        python -m Backend_lib.Linux.hci_export logs/hci0_hcidump.log -o hci0.pcap
+        python -m Backend_lib.Linux.hci_export logs/hci0_hci.btsnoop -o live.pcap --follow
+        python -m Backend_lib.Linux.hci_export --session logs/ --format pcap
+    """
+    parser = argparse.ArgumentParser(description="Export hcidump or btsnoop captures to pcap/btsnoop for Wireshark")
+    parser.add_argument("capture", nargs="?", help="hcidump text log or btsnoop file")
+    parser.add_argument("-o", "--output", help="output file (extension .pcap or .btsnoop)")
+    parser.add_argument("--session", help="export every capture of this session log folder")
+    parser.add_argument("--format", choices=sorted(export_formats), help="output format (default from -o, else pcap)")
+    parser.add_argument("--index", type=int, help="controller index to keep from a btsnoop monitor capture")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep converting a running btsnoop capture until interrupted")
+    args = parser.parse_args(argv)
+
+    if args.session:
+        for output, packets in export_session(args.session, args.output, args.format or "pcap").items():
+            print(f"{packets} packets written to {output}")
+        return 0
+    if not args.capture:
+        parser.error("a capture or --session is required")
+    output = args.output or os.path.splitext(args.capture)[0] + export_formats[args.format or "pcap"]
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    packets = export_capture(args.capture, output, args.format, args.index, args.follow, stop)
+    print(f"{packets} packets written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
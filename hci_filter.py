@@ -0,0 +1,367 @@
+import re
+import struct
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hcidump import HcidumpParser
+from Backend_lib.Linux.hci_decoder import decode_packet
+
+
+packet_type_names = {
+    "command": hci_transport.HCI_COMMAND_PKT,
+    "cmd": hci_transport.HCI_COMMAND_PKT,
+    "acl": hci_transport.HCI_ACLDATA_PKT,
+    "sco": hci_transport.HCI_SCODATA_PKT,
+    "event": hci_transport.HCI_EVENT_PKT,
+    "evt": hci_transport.HCI_EVENT_PKT,
+    "iso": hci_transport.HCI_ISODATA_PKT,
+}
+
+# Offset of a BD_ADDR in the packet (from the H4 indicator), by event code, LE subevent and command opcode
+_event_address_offsets = {0x02: 4, 0x03: 6, 0x04: 3, 0x07: 4, 0x12: 4, 0x17: 3, 0x18: 3, 0x22: 4, 0x2c: 6,
+                          0x2f: 4, 0x31: 3, 0x32: 3, 0x33: 3, 0x36: 4}
+_le_address_offsets = {0x01: 9, 0x0a: 9}
+_command_address_offsets = {0x0405: 4, 0x0409: 4, 0x040b: 4, 0x0419: 4, 0x200d: 10, 0x2043: 7}
+_address_re = re.compile(r"^[0-9a-fA-F]{2}(:[0-9a-fA-F]{2}){5}$")
+_u16 = struct.Struct("<H")
+
+
+def parse_address(text):
+    """
+    Converts 'AA:BB:CC:DD:EE:FF' to the 6 bytes carried in HCI packets (least significant byte first).
+    """
+    if not _address_re.match(text):
+        raise ValueError(f"Invalid address: {text}")
+    return bytes.fromhex(text.replace(":", ""))[::-1]
+
+
+def _advertising_addresses(packet, subevent):
+    """
+    Addresses of every report in an LE (Extended) Advertising Report.
+    """
+    addresses = set()
+    if len(packet) < 5:
+        return addresses
+    position = 5
+    for _ in range(packet[4]):
+        if subevent == 0x02:
+            # Event_Type, Address_Type, Address, Data_Length, Data, RSSI
+            if len(packet) < position + 9:
+                break
+            addresses.add(bytes(packet[position + 2:position + 8]))
+            position += 10 + packet[position + 8]
+        else:
+            # Event_Type(2), Address_Type, Address, ..., Direct_Address(6), Data_Length, Data
+            if len(packet) < position + 24:
+                break
+            addresses.add(bytes(packet[position + 3:position + 9]))
+            position += 24 + packet[position + 23]
+    return addresses
+
+
+def packet_addresses(packet):
+    """
+    Bluetooth device addresses carried in an H4 packet.
+
+    Connection, pairing and inquiry events, LE connection and advertising
+    reports, and connection/name request commands are understood.
+
+    Args:
+        packet (bytes | memoryview): H4 packet.
+
+    Returns:
+        set: 6-byte addresses in packet byte order (see parse_address).
+    """
+    offset = None
+    if packet[0] == hci_transport.HCI_EVENT_PKT and len(packet) >= 3:
+        code = packet[1]
+        if code == 0x3e and len(packet) >= 4:
+            if packet[3] in (0x02, 0x0d):
+                return _advertising_addresses(packet, packet[3])
+            offset = _le_address_offsets.get(packet[3])
+        else:
+            offset = _event_address_offsets.get(code)
+    elif packet[0] == hci_transport.HCI_COMMAND_PKT and len(packet) >= 4:
+        offset = _command_address_offsets.get(_u16.unpack_from(packet, 1)[0])
+    if offset is None or len(packet) < offset + 6:
+        return set()
+    return {bytes(packet[offset:offset + 6])}
+
+
+class FilterRule:
+
+    """
+    Packet criteria that must all hold for the rule to match.
+
+    Each criterion is a set of accepted values, or None to accept anything.
+    Addresses also match the ACL/SCO/ISO data and events of a connection to
+    that address once its connection complete event has been seen.
+    """
+
+    __slots__ = ("packet_types", "opcodes", "events", "subevents", "handles", "addresses")
+
+    def __init__(self, packet_types=None, opcodes=None, events=None, subevents=None, handles=None, addresses=None):
+        self.packet_types = packet_types
+        self.opcodes = opcodes
+        self.events = events
+        self.subevents = subevents
+        self.handles = handles
+        self.addresses = addresses
+
+    def matches(self, record, addresses):
+        if self.packet_types is not None and record.packet_type not in self.packet_types:
+            return False
+        if self.opcodes is not None and record.opcode not in self.opcodes:
+            return False
+        if self.events is not None and record.event not in self.events:
+            return False
+        if self.subevents is not None and record.subevent not in self.subevents:
+            return False
+        if self.handles is not None and record.handle not in self.handles:
+            return False
+        return self.addresses is None or not self.addresses.isdisjoint(addresses)
+
+    def format(self):
+        """
+        Returns:
+            str: The rule in parse_filter syntax, without its include/exclude keyword.
+        """
+        # Longest name of each type: 'command' and 'event' rather than 'cmd' and 'evt'
+        names = {value: name for name, value in sorted(packet_type_names.items(), key=lambda item: len(item[0]))}
+        terms = []
+        for key, values, render in (("type", self.packet_types, lambda value: names.get(value, hex(value))),
+                                    ("opcode", self.opcodes, lambda value: f"0x{value:04x}"),
+                                    ("event", self.events, lambda value: f"0x{value:02x}"),
+                                    ("subevent", self.subevents, lambda value: f"0x{value:02x}"),
+                                    ("handle", self.handles, lambda value: f"0x{value:04x}"),
+                                    ("address", self.addresses, lambda value: ":".join(f"{b:02X}" for b in value[::-1]))):
+            if values is not None:
+                terms.append(f"{key}:{','.join(render(value) for value in sorted(values))}")
+        return " ".join(terms)
+
+
+class CaptureFilter:
+
+    """
+    Include/exclude filter over HCI packets, applied before packets are stored or shown.
+
+    A packet is kept if it matches any include rule (or there are none) and no
+    exclude rule. Command Complete/Status events carry the opcode of their
+    command, so 'opcode:' rules keep or drop both. The filter learns the
+    handle of each connection from connection complete events so address
+    rules cover the connection's traffic; a filter instance should therefore
+    see a single packet stream (use clone() to share a configuration).
+    """
+
+    def __init__(self, include=(), exclude=()):
+        """
+        Initializes the filter.
+
+        Args:
+            include (list): FilterRule objects; empty keeps every packet not excluded.
+            exclude (list): FilterRule objects.
+        """
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self.uses_addresses = any(rule.addresses is not None for rule in self.include + self.exclude)
+        self.handle_addresses = {}
+        self.passed = 0
+        self.dropped = 0
+
+    def __bool__(self):
+        return bool(self.include or self.exclude)
+
+    def clone(self):
+        """
+        Returns:
+            CaptureFilter: A filter with the same rules and fresh state.
+        """
+        return CaptureFilter(self.include, self.exclude)
+
+    def _addresses(self, packet, record):
+        addresses = packet_addresses(packet)
+        if record.event == 0x03 or (record.event == 0x3e and record.subevent in _le_address_offsets):
+            if record.status == 0 and record.handle is not None and addresses:
+                self.handle_addresses[record.handle] = next(iter(addresses))
+        elif record.handle in self.handle_addresses:
+            addresses.add(self.handle_addresses[record.handle])
+        return addresses
+
+    def matches_record(self, record, packet=None):
+        """
+        Checks a decoded packet against the rules.
+
+        Args:
+            record (HciRecord): Decoded packet.
+            packet (bytes, optional): The H4 packet, needed for address rules.
+
+        Returns:
+            bool: True if the packet is kept.
+        """
+        addresses = self._addresses(packet, record) if self.uses_addresses and packet is not None else ()
+        keep = (not self.include or any(rule.matches(record, addresses) for rule in self.include)) and \
+            not any(rule.matches(record, addresses) for rule in self.exclude)
+        if keep:
+            self.passed += 1
+        else:
+            self.dropped += 1
+        return keep
+
+    def matches(self, packet):
+        """
+        Checks an H4 packet against the rules.
+
+        Args:
+            packet (bytes | memoryview): H4 packet.
+
+        Returns:
+            bool: True if the packet is kept.
+        """
+        record = decode_packet(0.0, False, packet)
+        return True if record is None else self.matches_record(record, packet)
+
+    def matches_frame(self, frame):
+        """
+        Checks an hcidump frame against the rules; frames without hex payload are judged on their header.
+
+        Args:
+            frame (HcidumpFrame): Parsed hcidump entry.
+
+        Returns:
+            bool: True if the frame is kept; entries that are not HCI packets are always kept.
+        """
+        packet = frame.packet()
+        if packet is not None:
+            return self.matches(packet)
+        if frame.packet_type is None:
+            return True
+        record = decode_packet(0.0, frame.received, bytes([frame.packet_type]))
+        record.opcode, record.event, record.handle, record.status = (frame.opcode, frame.event_code, frame.handle,
+                                                                      frame.status)
+        return self.matches_record(record)
+
+    def format(self):
+        """
+        Returns:
+            str: The filter in parse_filter syntax.
+        """
+        return "; ".join([f"include {rule.format()}" for rule in self.include] +
+                         [f"exclude {rule.format()}" for rule in self.exclude])
+
+    def __repr__(self):
+        return f"CaptureFilter({self.format()!r})"
+
+
+def _parse_value(key, value):
+    if key == "type":
+        if value.lower() not in packet_type_names:
+            raise ValueError(f"Unknown packet type: {value}")
+        return packet_type_names[value.lower()]
+    if key == "address":
+        return parse_address(value)
+    return int(value, 0)
+
+
+def parse_filter(text):
+    """
+    Parses a capture filter.
+
+    Rules are separated by ';'. Each starts with 'include' or 'exclude'
+    ('include' if omitted) followed by 'key:value[,value...]' terms, all of
+    which must match. Keys are type (command, event, acl, sco, iso), opcode,
+    event, subevent, handle and address. For example:
+        exclude event:0x3e subevent:0x02,0x0d
+        include handle:0x0040; include type:command
+        exclude subevent:0x02; include address:AA:BB:CC:DD:EE:FF
+
+    Args:
+        text (str): Filter text; empty for no filtering.
+
+    Returns:
+        CaptureFilter: The filter.
+
+    Raises:
+        ValueError: If the text cannot be parsed.
+    """
+    include, exclude = [], []
+    for part in text.split(";"):
+        words = part.split()
+        if not words:
+            continue
+        target = include
+        if words[0].lower() in ("include", "exclude"):
+            target = exclude if words.pop(0).lower() == "exclude" else include
+        criteria = {}
+        for word in words:
+            key, _, values = word.partition(":")
+            key = key.lower()
+            attribute = {"type": "packet_types", "opcode": "opcodes", "event": "events", "subevent": "subevents",
+                         "handle": "handles", "address": "addresses"}.get(key)
+            if attribute is None or not values:
+                raise ValueError(f"Invalid filter term: {word}")
+            criteria.setdefault(attribute, set()).update(_parse_value(key, value) for value in values.split(","))
+        if not criteria:
+            raise ValueError(f"Empty filter rule: {part.strip()}")
+        target.append(FilterRule(**criteria))
+    return CaptureFilter(include, exclude)
+
+
+class HcidumpStreamFilter:
+
+    """
+    Filters hcidump text output frame by frame as it is written to the log.
+
+    Lines are grouped into frames with HcidumpParser; a frame is held until the
+    next one starts (or flush() at the end of the output) and then written or
+    dropped as a whole. Lines before the first frame (the hcidump banner) are
+    always written. The filter can be replaced while running through
+    capture_filter.
+    """
+
+    def __init__(self, capture_filter):
+        """
+        Args:
+            capture_filter (CaptureFilter): Filter to apply.
+        """
+        self.capture_filter = capture_filter
+        self.parser = HcidumpParser()
+        self.partial = b""
+        self.pending = []
+        self.line_number = 0
+
+    def feed(self, data):
+        """
+        Args:
+            data (bytes): hcidump output.
+
+        Returns:
+            bytes: Output of the frames completed by this data that pass the filter.
+        """
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        output = []
+        parser = self.parser
+        for raw in lines:
+            self.line_number += 1
+            current = parser.frame
+            completed = parser.feed(self.line_number, raw.decode("utf-8", errors="replace"))
+            if parser.frame is not current:
+                if completed is None or self.capture_filter.matches_frame(completed):
+                    output.extend(self.pending)
+                self.pending = []
+            if parser.frame is None:
+                output.append(raw + b"\n")
+            else:
+                self.pending.append(raw + b"\n")
+        return b"".join(output)
+
+    def flush(self):
+        """
+        Returns:
+            bytes: The held frame and any unterminated line, if they pass the filter.
+        """
+        data = self.feed(b"\n") if self.partial else b""
+        completed = self.parser.finish()
+        if completed is not None and self.capture_filter.matches_frame(completed):
+            data += b"".join(self.pending)
+        self.pending = []
+        return data
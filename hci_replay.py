@@ -0,0 +1,338 @@
+import argparse
+import json
+import logging
+import struct
+import sys
+import time
+from collections import deque
+
+from Backend_lib.Linux import btsnoop
+from Backend_lib.Linux import hcidump
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_emulator import VirtualController
+from Backend_lib.Linux.hci_events import decode_command_event, command_names, status_text
+from Backend_lib.Linux.hci_script import wait_until
+
+
+# Commands the controller does not answer with Command Complete/Status, never replayed
+unanswered_opcodes = {0x0c35}    # Host Number Of Completed Packets
+
+
+class CapturedCommand:
+
+    """
+    A host -> controller command taken from a capture.
+
+    Attributes:
+        timestamp: capture time in seconds, None if the capture has no timestamps.
+        opcode: command opcode.
+        packet: H4 command packet.
+        expected_status: status the controller answered with in the capture, None if unanswered.
+        source: line number (hcidump) or record number (btsnoop) of the command.
+    """
+
+    __slots__ = ("timestamp", "opcode", "packet", "expected_status", "source")
+
+    def __init__(self, timestamp, opcode, packet, source):
+        self.timestamp = timestamp
+        self.opcode = opcode
+        self.packet = packet
+        self.expected_status = None
+        self.source = source
+
+    @property
+    def name(self):
+        return command_names.get(self.opcode, f"0x{self.opcode:04x}")
+
+    def __repr__(self):
+        return ('CapturedCommand(timestamp = %r, command = %r, packet = %s, expected_status = %r)'
+                ) % (self.timestamp, self.name, self.packet.hex(), self.expected_status)
+
+
+class Capture:
+
+    """
+    Commands parsed from a capture file.
+
+    Attributes:
+        path: capture file path.
+        commands: CapturedCommand objects in capture order.
+        skipped: commands that could not be rebuilt (no hex payload in the dump).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.commands = []
+        self.skipped = 0
+        self._unanswered = {}
+
+    def add_command(self, timestamp, packet, source):
+        opcode, = struct.unpack_from("<H", packet, 1)
+        command = CapturedCommand(timestamp, opcode, bytes(packet), source)
+        self.commands.append(command)
+        self._unanswered.setdefault(opcode, deque()).append(command)
+
+    def add_completion(self, opcode, status):
+        """
+        Records the status of the oldest unanswered command with the opcode.
+        """
+        pending = self._unanswered.get(opcode)
+        if pending:
+            pending.popleft().expected_status = status
+
+    def add_event(self, packet):
+        event = decode_command_event(packet)
+        if event is not None:
+            self.add_completion(event.opcode, event.status)
+
+
+def _add_frame(capture, frame):
+    packet = frame.packet()
+    if packet is not None:
+        if packet[0] == hci_transport.HCI_COMMAND_PKT and len(packet) >= 4:
+            capture.add_command(frame.timestamp, packet, frame.line)
+        elif packet[0] == hci_transport.HCI_EVENT_PKT:
+            capture.add_event(packet)
+    elif frame.kind == "command":
+        capture.skipped += 1
+    elif frame.kind == "event" and frame.opcode is not None and frame.status is not None:
+        capture.add_completion(frame.opcode, frame.status)
+
+
+def parse_hcidump(path):
+    """
+    Parses an hcidump text log.
+
+    Raw dumps (hcidump -R) are read byte for byte. Decoded dumps need the hex
+    payload of commands (hcidump -x or -X); commands shown only in decoded form
+    are counted as skipped. Completion statuses are taken from the hex payload
+    or, failing that, from the decoded 'status 0x..' text. Segments left by log
+    rotation are read in order before the active file.
+
+    Args:
+        path (str): hcidump log path.
+
+    Returns:
+        Capture: Parsed commands.
+    """
+    capture = Capture(path)
+    for frame in hcidump.iter_frames(path):
+        _add_frame(capture, frame)
+    return capture
+
+
+def parse_btsnoop(path, index=None):
+    """
+    Parses a btsnoop capture.
+
+    Args:
+        path (str): Capture file path.
+        index (int, optional): Controller index to keep from monitor captures.
+
+    Returns:
+        Capture: Parsed commands.
+    """
+    capture = Capture(path)
+    for number, record in enumerate(btsnoop.iter_records(path), 1):
+        if index is not None and record.index not in (None, index):
+            continue
+        packet = record.packet
+        if packet[0] == hci_transport.HCI_COMMAND_PKT and not record.received and len(packet) >= 4:
+            capture.add_command(record.timestamp, packet, number)
+        elif packet[0] == hci_transport.HCI_EVENT_PKT:
+            capture.add_event(packet)
+    return capture
+
+
+def load_capture(path, index=None):
+    """
+    Parses a capture, detecting btsnoop files by their magic and treating anything else as hcidump text.
+
+    Args:
+        path (str): Capture file path.
+        index (int, optional): Controller index to keep from btsnoop monitor captures.
+
+    Returns:
+        Capture: Parsed commands.
+    """
+    if btsnoop.is_btsnoop(path):
+        return parse_btsnoop(path, index)
+    return parse_hcidump(path)
+
+
+class ReplayResult:
+
+    """
+    Outcome of one replayed command.
+    """
+
+    __slots__ = ("index", "command", "sent_at", "latency", "expected_status", "status", "error")
+
+    def __init__(self, index, command, sent_at, latency, expected_status, status, error):
+        self.index = index
+        self.command = command
+        self.sent_at = sent_at
+        self.latency = latency
+        self.expected_status = expected_status
+        self.status = status
+        self.error = error
+
+    @property
+    def diverged(self):
+        """
+        True if the command failed or returned a status other than the captured one.
+        """
+        if self.error is not None:
+            return True
+        return self.expected_status is not None and self.status != self.expected_status
+
+    def __repr__(self):
+        return ('ReplayResult(index = %r, command = %r, expected_status = %r, status = %r, error = %r)'
+                ) % (self.index, self.command, self.expected_status, self.status, self.error)
+
+
+class ReplayReport:
+
+    """
+    Result of replaying a capture on one interface.
+    """
+
+    def __init__(self, interface, path, results, elapsed, skipped):
+        self.interface = interface
+        self.path = path
+        self.results = results
+        self.elapsed = elapsed
+        self.skipped = skipped
+
+    @property
+    def divergences(self):
+        return [result for result in self.results if result.diverged]
+
+    @property
+    def commands_per_second(self):
+        return len(self.results) / self.elapsed if self.elapsed else None
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON serializable report.
+        """
+        return {
+            "interface": self.interface,
+            "capture": self.path,
+            "commands": len(self.results),
+            "skipped": self.skipped,
+            "elapsed_s": self.elapsed,
+            "commands_per_second": self.commands_per_second,
+            "divergences": [{"index": result.index, "command": result.command, "sent_at_s": result.sent_at,
+                             "expected_status": result.expected_status, "status": result.status,
+                             "error": result.error} for result in self.divergences],
+        }
+
+    def format(self):
+        """
+        Returns:
+            str: Summary followed by one line per divergence.
+        """
+        rate = self.commands_per_second
+        lines = [f"{self.path} -> {self.interface}: {len(self.results)} commands in {self.elapsed * 1000:.1f} ms"
+                 f"{f' ({rate:.0f} commands/s)' if rate else ''}, {len(self.divergences)} divergences, "
+                 f"{self.skipped} skipped"]
+        for result in self.divergences:
+            expected = status_text(result.expected_status) if result.expected_status is not None else "-"
+            actual = status_text(result.status) if result.status is not None else result.error
+            lines.append(f"{result.index:>6} {result.command:<45} expected {expected}, got {actual}")
+        return "\n".join(lines)
+
+
+def replay(interface, log, capture, preserve_timing=False, speed=1.0,
+           timeout=hci_transport.HCI_COMMAND_TIMEOUT, stop_on_divergence=False):
+    """
+    Re-issues the commands of a capture on an interface over its persistent HCI transport.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0') or registered emulator.
+        log (Logger): Logger instance used for logging.
+        capture (Capture): Parsed capture.
+        preserve_timing (bool): Keep the captured inter-command gaps instead of sending back to back.
+        speed (float): Timing scale when preserving timing; 2.0 replays twice as fast.
+        timeout (float): Seconds to wait for each completion.
+        stop_on_divergence (bool): Stop at the first diverging command.
+
+    Returns:
+        ReplayReport: Timing and status divergences.
+    """
+    transport = hci_transport.get_transport(interface, log)
+    commands = [command for command in capture.commands if command.opcode not in unanswered_opcodes]
+    origin = next((command.timestamp for command in commands if command.timestamp is not None), None)
+    results = []
+    clock = time.perf_counter
+    start = clock()
+    for index, command in enumerate(commands):
+        if preserve_timing and origin is not None and command.timestamp is not None:
+            wait_until(start + (command.timestamp - origin) / speed)
+        sent = clock()
+        try:
+            event = decode_command_event(transport.execute(command.opcode, command.packet, timeout))
+            status, error = event.status, None
+        except (OSError, hci_transport.HciTransportError) as e:
+            status, error = None, str(e)
+        result = ReplayResult(index, command.name, sent - start, clock() - sent, command.expected_status,
+                              status, error)
+        results.append(result)
+        if result.diverged:
+            log.info(f"[WARN] Replay of {command.name} (line/record {command.source}) diverged on {interface}: "
+                     f"expected {command.expected_status}, got {status if error is None else error}")
+            if stop_on_divergence:
+                break
+    report = ReplayReport(interface, capture.path, results, clock() - start, capture.skipped)
+    log.info(f"[INFO] {report.format()}")
+    return report
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Example:
+        python -m Backend_lib.Linux.hci_replay hci0_hcidump.log -i hci1
+        python -m Backend_lib.Linux.hci_replay capture.btsnoop --emulator --timing original --speed 4
+    """
+    parser = argparse.ArgumentParser(description="Replay HCI commands from an hcidump or btsnoop capture")
+    parser.add_argument("capture", help="hcidump text log or btsnoop file")
+    parser.add_argument("-i", "--interface", default="hci0", help="controller interface (default hci0)")
+    parser.add_argument("--index", type=int, help="controller index to replay from a btsnoop monitor capture")
+    parser.add_argument("--timing", choices=["fast", "original"], default="fast",
+                        help="fast: back to back, original: keep captured gaps")
+    parser.add_argument("--speed", type=float, default=1.0, help="timing scale for --timing original")
+    parser.add_argument("--stop-on-divergence", action="store_true", help="stop at the first diverging command")
+    parser.add_argument("--emulator", action="store_true", help="replay against an in-process virtual controller")
+    parser.add_argument("--latency", type=float, default=0.0, help="emulator response latency in seconds")
+    parser.add_argument("--json", help="write the report as JSON to this path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    log = logging.getLogger("hci_replay")
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+    capture = load_capture(args.capture, args.index)
+    emulator = VirtualController(interface=args.interface, latency=args.latency, log=log).start() \
+        if args.emulator else None
+    try:
+        report = replay(args.interface, log, capture, preserve_timing=args.timing == "original", speed=args.speed,
+                        stop_on_divergence=args.stop_on_divergence)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    if args.json == "-":
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+    else:
+        print(report.format())
+        if args.json:
+            with open(args.json, "w") as fp:
+                json.dump(report.to_dict(), fp, indent=2)
+    return 1 if report.divergences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# Return parameters of the Command Complete event for the commands in hci_commands.py.
+#
+# Each entry lists the fields in the order the controller sends them as {"Field_Name": "type"}:
+#   int8/uint8/uint16/uint24/uint32/uint64 - little-endian integers
+#   bd_addr - 6 octet address, shown as AA:BB:CC:DD:EE:FF
+#   hex:N   - N octets kept as bytes (feature masks, keys, channel maps)
+#   name    - null terminated UTF-8 string filling the rest of the event
+#   hex     - all remaining octets as bytes
+# Commands not listed here decode to Status followed by any remaining octets.
+
+link_control_commands = {
+    "Inquiry Cancel": [{"Status": "uint8"}],
+    "Create Connection Cancel": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Link Key Request Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Link Key Request Negative Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "PIN Code Request Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "PIN Code Request Negative Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Remote Name Request Cancel": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Read LMP Handle": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"LMP_Handle": "uint8"}, {"Reserved": "uint32"}],
+    "IO Capability Request Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "User Confirmation Request Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "User Confirmation Request Negative Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "User Passkey Request Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "User Passkey Request Negative Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Remote OOB Data Request Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Remote OOB Data Request Negative Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "IO Capability Request Negative Reply": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+}
+
+link_policy_commands = {
+    "Role Discovery": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Current_Role": "uint8"}],
+    "Read Link Policy Settings": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Link_Policy_Settings": "uint16"}],
+    "Write Link Policy Settings": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}],
+    "Read Default Link Policy Settings": [{"Status": "uint8"}, {"Default_Link_Policy_Settings": "uint16"}],
+    "Write Default Link Policy Settings": [{"Status": "uint8"}],
+    "Sniff Subrating": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}],
+}
+
+controller_and_baseband_commands = {
+    "Reset": [{"Status": "uint8"}],
+    "Read PIN Type": [{"Status": "uint8"}, {"PIN_Type": "uint8"}],
+    "Read Stored Link Key": [{"Status": "uint8"}, {"Max_Num_Keys": "uint16"}, {"Num_Keys_Read": "uint16"}],
+    "Read Local Name": [{"Status": "uint8"}, {"Local_Name": "name"}],
+    "Read Connection Accept Timeout": [{"Status": "uint8"}, {"Connection_Accept_Timeout": "uint16"}],
+    "Read Page Timeout": [{"Status": "uint8"}, {"Page_Timeout": "uint16"}],
+    "Read Scan Enable": [{"Status": "uint8"}, {"Scan_Enable": "uint8"}],
+    "Read Page Scan Activity": [{"Status": "uint8"}, {"Page_Scan_Interval": "uint16"}, {"Page_Scan_Window": "uint16"}],
+    "Read Inquiry Scan Activity": [{"Status": "uint8"}, {"Inquiry_Scan_Interval": "uint16"}, {"Inquiry_Scan_Window": "uint16"}],
+    "Read Authentication Enable": [{"Status": "uint8"}, {"Authentication_Enable": "uint8"}],
+    "Read Class of Device": [{"Status": "uint8"}, {"Class_Of_Device": "uint24"}],
+    "Read Voice Setting": [{"Status": "uint8"}, {"Voice_Setting": "uint16"}],
+    "Read Automatic Flush Timeout": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Flush_Timeout": "uint16"}],
+    "Read Num Broadcast Retransmissions": [{"Status": "uint8"}, {"Num_Broadcast_Retransmissions": "uint8"}],
+    "Read Hold Mode Activity": [{"Status": "uint8"}, {"Hold_Mode_Activity": "uint8"}],
+    "Read Transmit Power Level": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"TX_Power_Level": "int8"}],
+    "Read Synchronous Flow Control Enable": [{"Status": "uint8"}, {"Synchronous_Flow_Control_Enable": "uint8"}],
+    "Read Link Supervision Timeout": [{"Status": "uint8"}, {"Handle": "uint16"}, {"Link_Supervision_Timeout": "uint16"}],
+    "Read Number Of Supported IAC": [{"Status": "uint8"}, {"Num_Support_IAC": "uint8"}],
+    "Read Current IAC LAP": [{"Status": "uint8"}, {"Num_Current_IAC": "uint8"}, {"IAC_LAP": "hex"}],
+    "Read Inquiry Scan Type": [{"Status": "uint8"}, {"Inquiry_Scan_Type": "uint8"}],
+    "Read Inquiry Mode": [{"Status": "uint8"}, {"Inquiry_Mode": "uint8"}],
+    "Read Page Scan Type": [{"Status": "uint8"}, {"Page_Scan_Type": "uint8"}],
+    "Read AFH Channel Assessment Mode ": [{"Status": "uint8"}, {"AFH_Channel_Assessment_Mode": "uint8"}],
+    "Read Extended Inquiry Response": [{"Status": "uint8"}, {"FEC_Required": "uint8"}, {"Extended_Inquiry_Response": "hex:240"}],
+    "Read Simple Pairing Mode ": [{"Status": "uint8"}, {"Simple_Pairing_Mode": "uint8"}],
+    "Read Local OOB Data": [{"Status": "uint8"}, {"C": "hex:16"}, {"R": "hex:16"}],
+    "Read Inquiry Response Transmit Power Level": [{"Status": "uint8"}, {"TX_Power": "int8"}],
+    "Read Default Erroneous Data Reporting": [{"Status": "uint8"}, {"Erroneous_Data_Reporting": "uint8"}],
+    "Read Flow Control Mode": [{"Status": "uint8"}, {"Flow_Control_Mode": "uint8"}],
+    "Read Enhanced Transmit Power Level": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"TX_Power_Level_GFSK": "int8"}, {"TX_Power_Level_DQPSK": "int8"}, {"TX_Power_Level_8DPSK": "int8"}],
+    "Read LE Host Support": [{"Status": "uint8"}, {"LE_Supported_Host": "uint8"}, {"Unused": "uint8"}],
+    "Read Synchronization Train Parameters": [{"Status": "uint8"}, {"Sync_Train_Interval": "uint16"}, {"Synchronization_Train_Timeout": "uint32"}, {"Service_Data": "uint8"}],
+    "Read Secure Connections Host Support": [{"Status": "uint8"}, {"Secure_Connections_Host_Support": "uint8"}],
+    "Read Authenticated Payload Timeout": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Authenticated_Payload_Timeout": "uint16"}],
+    "Read Local OOB Extended Data ": [{"Status": "uint8"}, {"C_192": "hex:16"}, {"R_192": "hex:16"}, {"C_256": "hex:16"}, {"R_256": "hex:16"}],
+    "Read Extended Page Timeout": [{"Status": "uint8"}, {"Extended_Page_Timeout": "uint16"}],
+    "Read Extended Inquiry Length": [{"Status": "uint8"}, {"Extended_Inquiry_Length": "uint16"}],
+}
+
+informational_parameters = {
+    "Read Local Version Information": [{"Status": "uint8"}, {"HCI_Version": "uint8"}, {"HCI_Subversion": "uint16"}, {"LMP_Version": "uint8"}, {"Company_Identifier": "uint16"}, {"LMP_Subversion": "uint16"}],
+    "Read Local Supported Commands": [{"Status": "uint8"}, {"Supported_Commands": "hex:64"}],
+    "Read Local Supported Features": [{"Status": "uint8"}, {"LMP_Features": "hex:8"}],
+    "Read Local Extended Features": [{"Status": "uint8"}, {"Page_Number": "uint8"}, {"Max_Page_Number": "uint8"}, {"Extended_LMP_Features": "hex:8"}],
+    "Read Buffer Size": [{"Status": "uint8"}, {"ACL_Data_Packet_Length": "uint16"}, {"Synchronous_Data_Packet_Length": "uint8"}, {"Total_Num_ACL_Data_Packets": "uint16"}, {"Total_Num_Synchronous_Data_Packets": "uint16"}],
+    "Read BD_ADDR": [{"Status": "uint8"}, {"BD_ADDR": "bd_addr"}],
+    "Read Data Block Size": [{"Status": "uint8"}, {"Max_ACL_Data_Packet_Length": "uint16"}, {"Data_Block_Length": "uint16"}, {"Total_Num_Data_Blocks": "uint16"}],
+    "Read Local Supported Codecs [v1]": [{"Status": "uint8"}, {"Codecs": "hex"}],
+    "Read Local Simple Pairing Options": [{"Status": "uint8"}, {"Simple_Pairing_Options": "uint8"}, {"Max_Encryption_Key_Size": "uint8"}],
+    "Read Local Supported Codecs [v2]": [{"Status": "uint8"}, {"Codecs": "hex"}],
+    "Read Local Supported Codec Capabilities": [{"Status": "uint8"}, {"Num_Codec_Capabilities": "uint8"}, {"Codec_Capabilities": "hex"}],
+}
+
+status_parameters = {
+    "Read Failed Contact Counter": [{"Status": "uint8"}, {"Handle": "uint16"}, {"Failed_Contact_Counter": "uint16"}],
+    "Reset Failed Contact Counter": [{"Status": "uint8"}, {"Handle": "uint16"}],
+    "Read Link Quality Counter": [{"Status": "uint8"}, {"Handle": "uint16"}, {"Link_Quality": "uint8"}],
+    "Read RSSI": [{"Status": "uint8"}, {"Handle": "uint16"}, {"RSSI": "int8"}],
+    "Read AFH Channel Map": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"AFH_Mode": "uint8"}, {"AFH_Channel_Map": "hex:10"}],
+    "Read Clock": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Clock": "uint32"}, {"Accuracy": "uint16"}],
+    "Read Encryption Key Size": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Key_Size": "uint8"}],
+    "Get MWS Transport Layer Configuration": [{"Status": "uint8"}, {"Configuration": "hex"}],
+    "Set Triggered Clock Capture": [{"Status": "uint8"}],
+}
+
+testing_commands = {
+    "Read Loopback Mode": [{"Status": "uint8"}, {"Loopback_Mode": "uint8"}],
+    "Write Secure Connections Test Mode": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}],
+}
+
+le_controller_commands = {
+    "LE Read Buffer Size [v1]": [{"Status": "uint8"}, {"LE_ACL_Data_Packet_Length": "uint16"}, {"Total_Num_LE_ACL_Data_Packets": "uint8"}],
+    "LE Read Buffer Size [v2]": [{"Status": "uint8"}, {"LE_ACL_Data_Packet_Length": "uint16"}, {"Total_Num_LE_ACL_Data_Packets": "uint8"}, {"ISO_Data_Packet_Length": "uint16"}, {"Total_Num_ISO_Data_Packets": "uint8"}],
+    "LE Read Local Supported Features Page 0": [{"Status": "uint8"}, {"LE_Features": "hex:8"}],
+    "LE Read Advertising Physical Channel Tx Power": [{"Status": "uint8"}, {"TX_Power_Level": "int8"}],
+    "LE Read Filter Accept List Size": [{"Status": "uint8"}, {"Filter_Accept_List_Size": "uint8"}],
+    "LE Read Channel Map": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Channel_Map": "hex:5"}],
+    "LE Encrypt": [{"Status": "uint8"}, {"Encrypted_Data": "hex:16"}],
+    "LE Rand": [{"Status": "uint8"}, {"Random_Number": "uint64"}],
+    "LE Read Supported States": [{"Status": "uint8"}, {"LE_States": "hex:8"}],
+    "LE Read Suggested Default Data Length": [{"Status": "uint8"}, {"Suggested_Max_TX_Octets": "uint16"}, {"Suggested_Max_TX_Time": "uint16"}],
+    "LE Read Resolving List Size": [{"Status": "uint8"}, {"Resolving_List_Size": "uint8"}],
+    "LE Read Peer Resolvable Address": [{"Status": "uint8"}, {"Peer_Resolvable_Address": "bd_addr"}],
+    "LE Read Local Resolvable Address": [{"Status": "uint8"}, {"Local_Resolvable_Address": "bd_addr"}],
+    "LE Read Maximum Data Length": [{"Status": "uint8"}, {"Supported_Max_TX_Octets": "uint16"}, {"Supported_Max_TX_Time": "uint16"}, {"Supported_Max_RX_Octets": "uint16"}, {"Supported_Max_RX_Time": "uint16"}],
+    "LE Read PHY": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"TX_PHY": "uint8"}, {"RX_PHY": "uint8"}],
+    "LE Read Maximum Advertising Data Length": [{"Status": "uint8"}, {"Max_Advertising_Data_Length": "uint16"}],
+    "LE Read Number of Supported Advertising Sets": [{"Status": "uint8"}, {"Num_Supported_Advertising_Sets": "uint8"}],
+    "LE Read Periodic Advertiser List Size": [{"Status": "uint8"}, {"Periodic_Advertiser_List_Size": "uint8"}],
+    "LE Read Transmit Power": [{"Status": "uint8"}, {"Min_TX_Power": "int8"}, {"Max_TX_Power": "int8"}],
+    "LE Read RF Path Compensation": [{"Status": "uint8"}, {"RF_TX_Path_Compensation_Value": "uint16"}, {"RF_RX_Path_Compensation_Value": "uint16"}],
+    "LE Read ISO Link Quality": [{"Status": "uint8"}, {"Connection_Handle": "uint16"}, {"Tx_UnACKed_Packets": "uint32"}, {"Tx_Flushed_Packets": "uint32"}, {"Tx_Last_Subevent_Packets": "uint32"}, {"Retransmitted_Packets": "uint32"}, {"CRC_Error_Packets": "uint32"}, {"Rx_Unreceived_Packets": "uint32"}, {"Duplicate_Packets": "uint32"}],
+    "LE Read Monitored Advertisers List Size": [{"Status": "uint8"}, {"Monitored_Advertisers_List_Size": "uint8"}],
+}
+
+# Commands the controller answers with a Command Status event; their outcome arrives in a later event.
+command_status_commands = {
+    "Link Control commands": ["Inquiry", "Create Connection", "Disconnect", "Accept Connection Request",
+                              "Reject Connection Request", "Change Connection Packet Type", "Authentication Requested",
+                              "Set Connection Encryption", "Change Connection Link Key", "Link Key Selection",
+                              "Remote Name Request", "Read Remote Supported Features", "Read Remote Extended Features",
+                              "Read Remote Version Information", "Read Clock Offset", "Setup Synchronous Connection",
+                              "Accept Synchronous Connection Request", "Reject Synchronous Connection Request",
+                              "Enhanced Setup Synchronous Connection"],
+    "Link Policy commands": ["Hold Mode", "Sniff Mode", "Exit Sniff Mode", "QoS Setup", "Switch Role",
+                             "Flow Specification"],
+    "LE Controller commands": ["LE Create Connection", "LE Connection Update", "LE Read Remote Features Page 0",
+                               "LE Read Local P-256 Public Key", "LE Set PHY", "LE Extended Create Connection",
+                               "LE Periodic Advertising Create Sync", "LE Create CIS", "LE Create BIG",
+                               "LE Create BIG Test", "LE BIG Create Sync", "LE Subrate Request",
+                               "LE Read Remote Transmit Power Level", "LE Read All Remote Features"],
+}
@@ -0,0 +1,297 @@
+import asyncio
+import time
+from collections import deque
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event, CommandComplete, CommandStatus
+
+
+class HciCommandScheduler:
+    """
+    Asyncio command scheduler for one controller.
+
+    Commands are pipelined to the controller up to the Num_HCI_Command_Packets
+    credit it advertises in Command Complete/Status events. Completions are
+    matched to the oldest in-flight command with the same opcode, and every
+    command has its own timeout, counted from when it is written to the
+    controller rather than from when it is queued. A completion arriving
+    after its command timed out is discarded instead of being given to the
+    next command with the same opcode.
+
+    While started, the scheduler holds the transport's lock, so execute()
+    calls on the same transport from other threads (run_hci_cmd, controller
+    details, probes) wait until it stops instead of taking its completions.
+    Do not call execute() from the event loop's own thread meanwhile. The
+    socket's event filter is widened for the scheduler's lifetime so event
+    listeners see every event.
+    """
+
+    def __init__(self, transport, log=None, timeout=hci_transport.HCI_COMMAND_TIMEOUT):
+        """
+        Initializes the scheduler.
+
+        Args:
+            transport (HciSocketTransport): Transport of the controller.
+            log (Logger, optional): Logger instance used for logging.
+            timeout (float): Default per-command timeout in seconds.
+        """
+        self.transport = transport
+        self.log = log
+        self.timeout = timeout
+        self.credits = 1
+        self.loop = None
+        self.pending = deque()
+        self.in_flight = {}
+        # opcode -> deque of monotonic deadlines until which a late completion is expected
+        self.timed_out = {}
+        self.event_listeners = []
+        self.owns_transport = False
+
+    async def start(self):
+        """
+        Takes the transport's lock and starts reading events from it on the running event loop.
+
+        args: None
+        returns: None
+        """
+        lock = self.transport.lock
+        # Polled rather than waited on in an executor so a cancelled start cannot take the lock later
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+        self.owns_transport = True
+        try:
+            self.transport.receive_all_events(True)
+            self.loop = asyncio.get_running_loop()
+            self.loop.add_reader(self.transport.fileno(), self._on_readable)
+        except OSError:
+            self.loop = None
+            self._release_transport()
+            raise
+
+    def _release_transport(self):
+        if not self.owns_transport:
+            return
+        self.owns_transport = False
+        try:
+            self.transport.receive_all_events(False)
+        except OSError as e:
+            if self.log:
+                self.log.error(f"[ERROR] Cannot restore the HCI filter on {self.transport.interface}: {e}")
+        finally:
+            self.transport.lock.release()
+
+    async def stop(self):
+        """
+        Stops reading events and fails every queued or in-flight command.
+
+        args: None
+        returns: None
+        """
+        if self.loop:
+            self.loop.remove_reader(self.transport.fileno())
+            self.loop = None
+        self._release_transport()
+        error = hci_transport.HciTransportError(f"Scheduler for {self.transport.interface} stopped")
+        for _, _, _, future in self.pending:
+            if not future.done():
+                future.set_exception(error)
+        for futures in self.in_flight.values():
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+        self.pending.clear()
+        self.in_flight.clear()
+        self.timed_out.clear()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def send(self, ogf, command, parameters=(), timeout=None):
+        """
+        Queues a command from the hci_commands tables and waits for its completion.
+
+        Args:
+            ogf (str): Command group name (e.g., 'Informational parameters').
+            command (str): Command name.
+            parameters (list): Parameter values.
+            timeout (float, optional): Seconds to wait; defaults to the scheduler timeout.
+
+        Returns:
+            CommandComplete | CommandStatus: Decoded completion event.
+        """
+        encoder = get_encoder(ogf, command)
+        return await self.send_packet(encoder.opcode, encoder.encode(parameters), timeout)
+
+    async def send_packet(self, opcode, packet, timeout=None):
+        """
+        Queues an encoded command packet and waits for its completion.
+
+        Args:
+            opcode (int): Command opcode.
+            packet (bytes): H4 command packet.
+            timeout (float, optional): Seconds to wait once the command is sent; defaults to the scheduler
+                timeout. Time spent queued behind other commands is not counted.
+
+        Returns:
+            CommandComplete | CommandStatus: Decoded completion event.
+
+        Raises:
+            HciTransportError: If the command is not answered within the timeout.
+        """
+        future = self.loop.create_future()
+        self.pending.append((opcode, packet, timeout or self.timeout, future))
+        self._pump()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            self._forget(opcode, future)
+            raise
+
+    def add_event_listener(self, callback):
+        """
+        Registers a callback for every event that is not a Command Complete/Status.
+
+        The events arrive while the scheduler is started, which widens the socket's event filter.
+
+        Args:
+            callback (callable): Called with the raw H4 event packet.
+        """
+        self.event_listeners.append(callback)
+
+    def _expire(self, opcode, future, timeout):
+        """
+        Fails an in-flight command that was not answered within its timeout.
+        """
+        if future.done():
+            return
+        future.set_exception(hci_transport.HciTransportError(
+            f"Timed out waiting for opcode 0x{opcode:04x} on {self.transport.interface}"))
+        if self._forget(opcode, future):
+            # Its completion may still arrive; it must not be taken for a later command's
+            window = max(timeout, hci_transport.HCI_COMMAND_TIMEOUT)
+            self.timed_out.setdefault(opcode, deque()).append(time.monotonic() + window)
+
+    def _forget(self, opcode, future):
+        """
+        Drops a timed-out or cancelled command. If it was in flight its credit is returned,
+        as the controller will not answer it any more; queued ones are skipped by _pump.
+
+        Returns:
+            bool: True if the command was in flight.
+        """
+        futures = self.in_flight.get(opcode)
+        if futures and future in futures:
+            futures.remove(future)
+            self.credits = max(self.credits, 1)
+            self._pump()
+            return True
+        return False
+
+    def _late_completion(self, opcode):
+        """
+        Returns:
+            bool: True if a completion of this opcode belongs to a command that already timed out.
+        """
+        deadlines = self.timed_out.get(opcode)
+        if not deadlines:
+            return False
+        now = time.monotonic()
+        while deadlines and deadlines[0] < now:
+            deadlines.popleft()
+        if not deadlines:
+            del self.timed_out[opcode]
+            return False
+        deadlines.popleft()
+        return True
+
+    def _pump(self):
+        """
+        Sends queued commands while the controller has credits.
+        """
+        while self.credits > 0 and self.pending:
+            opcode, packet, timeout, future = self.pending.popleft()
+            if future.done():
+                continue
+            try:
+                self.transport.send_packet(packet)
+            except OSError as e:
+                future.set_exception(hci_transport.HciTransportError(str(e)))
+                continue
+            self.credits -= 1
+            self.in_flight.setdefault(opcode, deque()).append(future)
+            timer = self.loop.call_later(timeout, self._expire, opcode, future, timeout)
+            future.add_done_callback(lambda _, timer=timer: timer.cancel())
+
+    def _on_readable(self):
+        """
+        Reads one packet from the transport and resolves the matching command.
+        """
+        try:
+            packet = self.transport.recv_packet(0)
+        except OSError as e:
+            if self.log:
+                self.log.error(f"[ERROR] HCI receive failed on {self.transport.interface}: {e}")
+            return
+        if not packet:
+            return
+        event = decode_command_event(packet)
+        if not isinstance(event, (CommandComplete, CommandStatus)):
+            for callback in self.event_listeners:
+                callback(packet)
+            return
+        self.credits = event.num_hci_command_packets
+        if self._late_completion(event.opcode):
+            if self.log:
+                self.log.info(f"[WARN] Discarded late completion of opcode 0x{event.opcode:04x} "
+                              f"on {self.transport.interface}")
+            self._pump()
+            return
+        futures = self.in_flight.get(event.opcode)
+        while futures:
+            future = futures.popleft()
+            if not future.done():
+                future.set_result(event)
+                break
+        self._pump()
+
+
+async def open_scheduler(interface, log=None, timeout=hci_transport.HCI_COMMAND_TIMEOUT):
+    """
+    Starts a scheduler on the persistent transport of an interface.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0').
+        log (Logger, optional): Logger instance used for logging.
+        timeout (float): Default per-command timeout in seconds.
+
+    Returns:
+        HciCommandScheduler: Started scheduler.
+    """
+    scheduler = HciCommandScheduler(hci_transport.get_transport(interface, log), log, timeout)
+    await scheduler.start()
+    return scheduler
+
+
+def run_pipelined(interface, log, commands, timeout=hci_transport.HCI_COMMAND_TIMEOUT):
+    """
+    Sends a batch of commands pipelined under controller flow control and waits for all of them.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0').
+        log (Logger): Logger instance used for logging.
+        commands (list): (ogf, command, parameters) tuples.
+        timeout (float): Per-command timeout in seconds.
+
+    Returns:
+        list: Decoded completion event, or the raised exception, per command in order.
+    """
+    async def _run():
+        async with HciCommandScheduler(hci_transport.get_transport(interface, log), log, timeout) as scheduler:
+            return await asyncio.gather(*(scheduler.send(ogf, command, parameters)
+                                          for ogf, command, parameters in commands), return_exceptions=True)
+    return asyncio.run(_run())
@@ -0,0 +1,250 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event, status_text
+
+
+# Remaining wait below which the runner spins instead of sleeping, for sub-millisecond step timing
+_SPIN_THRESHOLD = 0.002
+
+
+class ScriptStep:
+
+    """
+    One command of an HCI script.
+
+    Attributes:
+        group: command group name as in hci_commands (e.g. 'Informational parameters').
+        command: command name.
+        parameters: parameter values.
+        expect_status: status the step must complete with, None to accept any.
+        delay: seconds to wait after the previous step completed before sending.
+        timeout: seconds to wait for the completion event.
+        packet: encoded command, built once when the step is created.
+    """
+
+    def __init__(self, group, command, parameters=None, expect_status=None, delay=0.0,
+                 timeout=hci_transport.HCI_COMMAND_TIMEOUT):
+        self.group = group
+        self.command = command
+        self.parameters = parameters or []
+        self.expect_status = expect_status
+        self.delay = delay
+        self.timeout = timeout
+        self.encoder = get_encoder(group, command)
+        self.packet = self.encoder.encode(self.parameters)
+
+    @classmethod
+    def from_dict(cls, step):
+        """
+        Builds a step from its script entry.
+
+        Args:
+            step (dict): Keys 'group', 'command' and optionally 'parameters', 'expect_status'
+                (int or hex string), 'delay' (seconds) and 'timeout' (seconds).
+
+        Returns:
+            ScriptStep: The step.
+        """
+        expect_status = step.get("expect_status")
+        if isinstance(expect_status, str):
+            expect_status = int(expect_status, 16) if expect_status.startswith("0x") else int(expect_status)
+        return cls(step["group"], step["command"], step.get("parameters"), expect_status,
+                   float(step.get("delay", 0.0)), float(step.get("timeout", hci_transport.HCI_COMMAND_TIMEOUT)))
+
+
+class StepResult:
+
+    """
+    Outcome of one executed script step.
+
+    Attributes:
+        index: position of the step in the script.
+        command: command name.
+        sent_at: seconds from script start until the command was sent.
+        latency: seconds until the completion event arrived, None on timeout.
+        event: decoded Command Complete/Status event, None on timeout.
+        error: transport error text, None if the command completed.
+        passed: whether the step met its expected status.
+    """
+
+    def __init__(self, index, command, sent_at, latency, event, error, passed):
+        self.index = index
+        self.command = command
+        self.sent_at = sent_at
+        self.latency = latency
+        self.event = event
+        self.error = error
+        self.passed = passed
+
+    @property
+    def status(self):
+        return self.event.status if self.event is not None else None
+
+    def __repr__(self):
+        return ('StepResult(index = %r, command = %r, sent_at = %r, latency = %r, status = %r, passed = %r)'
+                ) % (self.index, self.command, self.sent_at, self.latency, self.status, self.passed)
+
+
+class ScriptReport:
+
+    """
+    Per-step timing report of a script run on one interface; error is set
+    when the script could not run at all (e.g. the HCI socket did not open).
+    """
+
+    def __init__(self, interface, steps, elapsed, error=None):
+        self.interface = interface
+        self.steps = steps
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def passed(self):
+        return self.error is None and all(step.passed for step in self.steps)
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON serializable report.
+        """
+        return {
+            "interface": self.interface,
+            "passed": self.passed,
+            "error": self.error,
+            "elapsed_s": self.elapsed,
+            "steps": [{"index": step.index, "command": step.command, "sent_at_s": step.sent_at,
+                       "latency_s": step.latency, "status": step.status, "error": step.error,
+                       "passed": step.passed} for step in self.steps],
+        }
+
+    def rows(self):
+        """
+        Returns:
+            list: One [index, command, sent at (ms), latency (ms), status, result] row per step.
+        """
+        return [[step.index, step.command, f"{step.sent_at * 1000:.3f}",
+                 f"{step.latency * 1000:.3f}" if step.latency is not None else "-",
+                 status_text(step.status) if step.status is not None else step.error,
+                 "PASS" if step.passed else "FAIL"] for step in self.steps]
+
+    def format(self):
+        """
+        Returns:
+            str: Text table of the report.
+        """
+        if self.error is not None:
+            return f"{self.interface}: not run, {self.error}"
+        lines = [f"{self.interface}: {len(self.steps)} steps in {self.elapsed * 1000:.1f} ms, "
+                 f"{'PASS' if self.passed else 'FAIL'}"]
+        for row in self.rows():
+            lines.append("{:>4} {:<45} sent {:>10} ms  latency {:>9} ms  {}  {}".format(*row))
+        return "\n".join(lines)
+
+
+def load_script(path):
+    """
+    Loads an HCI script from a JSON file.
+
+    The file holds either a list of steps or an object with a "steps" list, e.g.:
+        {"steps": [
+            {"group": "Controller and Baseband commands", "command": "Reset", "expect_status": "0x00"},
+            {"group": "LE Controller commands", "command": "LE Set Advertising Enable",
+             "parameters": ["0x01"], "delay": 0.1}
+        ]}
+
+    Args:
+        path (str): Script file path.
+
+    Returns:
+        list: ScriptStep objects.
+
+    Raises:
+        KeyError: If a step names a command missing from hci_commands.
+        ValueError: If the file is not valid JSON or a step has invalid parameters.
+    """
+    with open(path) as fp:
+        script = json.load(fp)
+    steps = script["steps"] if isinstance(script, dict) else script
+    return [ScriptStep.from_dict(step) for step in steps]
+
+
+def wait_until(deadline):
+    """
+    Sleeps until a perf_counter deadline, spinning for the last couple of milliseconds.
+    """
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return
+        if remaining > _SPIN_THRESHOLD:
+            time.sleep(remaining - _SPIN_THRESHOLD)
+
+
+def run_script(interface, log, steps, stop_on_failure=False):
+    """
+    Executes a script over the interface's persistent HCI transport in one session.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0').
+        log (Logger): Logger instance used for logging.
+        steps (list): ScriptStep objects.
+        stop_on_failure (bool): Stop at the first step that fails.
+
+    Returns:
+        ScriptReport: Per-step timing report; its error is set if the HCI socket could not be opened.
+    """
+    try:
+        transport = hci_transport.get_transport(interface, log)
+    except OSError as e:
+        log.error(f"[ERROR] Script not run on {interface}, cannot open its HCI socket: {e}")
+        return ScriptReport(interface, [], 0.0, error=f"cannot open HCI socket: {e}")
+    results = []
+    clock = time.perf_counter
+    start = clock()
+    previous_done = start
+    for index, step in enumerate(steps):
+        if step.delay:
+            wait_until(previous_done + step.delay)
+        sent = clock()
+        try:
+            event = decode_command_event(transport.execute(step.encoder.opcode, step.packet, step.timeout))
+            error = None
+        except (OSError, hci_transport.HciTransportError) as e:
+            event, error = None, str(e)
+        previous_done = clock()
+        passed = event is not None and (step.expect_status is None or event.status == step.expect_status)
+        results.append(StepResult(index, step.command, sent - start, previous_done - sent if event else None,
+                                  event, error, passed))
+        if not passed:
+            reason = error or (status_text(event.status) if event.status is not None else "no status returned")
+            log.error(f"[ERROR] Script step {index} {step.command} failed on {interface}: {reason}")
+            if stop_on_failure:
+                break
+    report = ScriptReport(interface, results, clock() - start)
+    log.info(f"[INFO] Script finished on {interface}\n{report.format()}")
+    return report
+
+
+def run_script_on_controllers(interfaces, log, steps, stop_on_failure=False):
+    """
+    Executes the same script on several controllers concurrently, one session each.
+
+    Args:
+        interfaces (list): Bluetooth interfaces.
+        log (Logger): Logger instance used for logging.
+        steps (list): ScriptStep objects.
+        stop_on_failure (bool): Stop each run at its first failing step.
+
+    Returns:
+        dict: Interface as key and ScriptReport as value.
+    """
+    if not interfaces:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(interfaces)) as executor:
+        futures = {interface: executor.submit(run_script, interface, log, steps, stop_on_failure)
+                   for interface in interfaces}
+    return {interface: future.result() for interface, future in futures.items()}
@@ -0,0 +1,305 @@
+import argparse
+import json
+import sys
+from collections import deque
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.btsnoop import BtsnoopFile
+from Backend_lib.Linux.hci_decoder import decode_capture, event_fields, le_subevent_fields
+from Backend_lib.Linux.hci_events import command_names, status_text
+
+
+data_type_names = {hci_transport.HCI_ACLDATA_PKT: "ACL", hci_transport.HCI_SCODATA_PKT: "SCO",
+                   hci_transport.HCI_ISODATA_PKT: "ISO"}
+
+# Commands the controller answers with no Command Complete/Status (Host Number Of Completed Packets)
+unanswered_opcodes = {0x0c35}
+
+
+class RateWindow:
+
+    """
+    Running total of a quantity with its rate over the last `window` seconds.
+
+    Values are summed into one-second buckets, so memory is bounded by the
+    window length whatever the traffic rate.
+    """
+
+    __slots__ = ("window", "buckets", "total")
+
+    def __init__(self, window):
+        self.window = window
+        self.buckets = deque()
+        self.total = 0
+
+    def add(self, timestamp, value=1):
+        second = int(timestamp)
+        buckets = self.buckets
+        if buckets and buckets[-1][0] == second:
+            buckets[-1][1] += value
+        else:
+            buckets.append([second, value])
+            while buckets[0][0] <= second - self.window - 1:
+                buckets.popleft()
+        self.total += value
+
+    def rate(self, now):
+        """
+        Returns:
+            float: Sum of the values in the window ending at now, per second.
+        """
+        start = int(now) - self.window
+        return sum(value for second, value in self.buckets if second > start) / self.window
+
+
+class LatencyStats:
+
+    """
+    Command round-trip latencies: running count, mean, min and max plus percentiles over recent samples.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "samples")
+
+    def __init__(self, samples=1024):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.samples = deque(maxlen=samples)
+
+    def add(self, latency):
+        self.count += 1
+        self.total += latency
+        self.minimum = latency if self.minimum is None else min(self.minimum, latency)
+        self.maximum = latency if self.maximum is None else max(self.maximum, latency)
+        self.samples.append(latency)
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Latencies in milliseconds, percentiles over the most recent samples.
+        """
+        if not self.count:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+        percentile = lambda fraction: ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] * 1000
+        return {"count": self.count, "mean": self.total / self.count * 1000, "min": self.minimum * 1000,
+                "max": self.maximum * 1000, "p50": percentile(0.5), "p95": percentile(0.95),
+                "p99": percentile(0.99)}
+
+
+def _event_name(record):
+    if record.event == 0x3e and record.subevent is not None:
+        return le_subevent_fields.get(record.subevent, (f"LE Meta 0x{record.subevent:02x}",))[0]
+    return event_fields.get(record.event, (f"Event 0x{record.event:02x}",))[0]
+
+
+class HciStatistics:
+
+    """
+    Incremental statistics over a stream of decoded HCI packets (HciRecord objects).
+
+    Keeps per-opcode command counts, statuses and round-trip latencies
+    (command to its Command Complete/Status), per-event counts and rates, an
+    overall status histogram and ACL/SCO/ISO bytes per handle and direction.
+    Rates are computed over the last `window` seconds of capture time, so a
+    capture read back from disk gives the same numbers as a live one. Each
+    add() is O(1); snapshot() is O(number of distinct opcodes/events/handles).
+
+    Commands waiting for their completion are kept per opcode. A command
+    whose completion never shows up (e.g. dropped by a capture filter) is
+    forgotten once it is older than the command timeout, or once more
+    commands of its opcode are waiting than the controller has command
+    credits, so it does not skew later latencies.
+    """
+
+    def __init__(self, window=5, command_timeout=hci_transport.HCI_COMMAND_TIMEOUT):
+        """
+        Initializes empty statistics.
+
+        Args:
+            window (int): Seconds over which rates are computed.
+            command_timeout (float): Seconds after which a command is no longer expected to complete.
+        """
+        self.window = window
+        self.command_timeout = command_timeout
+        self.credits = None
+        self.packets = 0
+        self.first_time = None
+        self.last_time = None
+        self.commands = {}
+        self.command_statuses = {}
+        self.latencies = {}
+        self.pending = {}
+        self.events = {}
+        self.event_codes = {}
+        self.statuses = {}
+        self.data = {}
+
+    def add(self, record):
+        """
+        Accounts for one packet.
+
+        Args:
+            record (HciRecord): Decoded packet.
+
+        Returns:
+            None
+        """
+        timestamp = record.timestamp
+        self.packets += 1
+        if self.first_time is None:
+            self.first_time = timestamp
+        self.last_time = timestamp
+        packet_type = record.packet_type
+        if packet_type == hci_transport.HCI_COMMAND_PKT:
+            self.commands[record.opcode] = self.commands.get(record.opcode, 0) + 1
+            if record.opcode not in unanswered_opcodes:
+                pending = self.pending.setdefault(record.opcode, deque())
+                self._expire(pending, timestamp)
+                pending.append(timestamp)
+                # The controller cannot hold more commands than it has credits; older ones lost their completion
+                if self.credits is not None and len(pending) > self.credits:
+                    pending.popleft()
+        elif packet_type == hci_transport.HCI_EVENT_PKT:
+            name = _event_name(record)
+            window = self.events.get(name)
+            if window is None:
+                window = self.events[name] = RateWindow(self.window)
+                self.event_codes[name] = (record.event, record.subevent)
+            window.add(timestamp)
+            if record.status is not None:
+                self.statuses[record.status] = self.statuses.get(record.status, 0) + 1
+            if record.opcode is not None:
+                self._complete(record)
+        elif record.handle is not None:
+            key = (packet_type, record.handle, record.received)
+            window = self.data.get(key)
+            if window is None:
+                window = self.data[key] = RateWindow(self.window)
+            # Payload after the H4 indicator and the 4 (ACL, ISO) or 3 (SCO) byte header
+            window.add(timestamp, record.length - (4 if packet_type == hci_transport.HCI_SCODATA_PKT else 5))
+
+    def _expire(self, pending, now):
+        while pending and now - pending[0] > self.command_timeout:
+            pending.popleft()
+
+    def _complete(self, record):
+        opcode = record.opcode
+        if record.credits:
+            # Largest Num_HCI_Command_Packets seen: the commands the controller can have outstanding
+            self.credits = max(self.credits or 0, record.credits)
+        if record.status is not None:
+            statuses = self.command_statuses.setdefault(opcode, {})
+            statuses[record.status] = statuses.get(record.status, 0) + 1
+        pending = self.pending.get(opcode)
+        if pending:
+            self._expire(pending, record.timestamp)
+        if not pending:
+            return
+        # A Command Status is followed by a Command Complete only for a few commands; either ends the round trip
+        latency = record.timestamp - pending.popleft()
+        stats = self.latencies.get(opcode)
+        if stats is None:
+            stats = self.latencies[opcode] = LatencyStats()
+        stats.add(latency)
+
+    def snapshot(self, now=None):
+        """
+        Args:
+            now (float, optional): Unix time the rate windows end at; defaults to the last packet's time.
+                Live views pass the current time so rates fall to zero when traffic stops.
+
+        Returns:
+            dict: JSON serializable statistics.
+        """
+        if now is None:
+            now = self.last_time or 0.0
+        commands = {}
+        for opcode, count in sorted(self.commands.items()):
+            name = command_names.get(opcode, f"0x{opcode:04x}")
+            latency = self.latencies.get(opcode)
+            commands[name] = {
+                "opcode": f"0x{opcode:04x}",
+                "count": count,
+                "statuses": {status_text(status): number
+                             for status, number in sorted(self.command_statuses.get(opcode, {}).items())},
+                "latency_ms": latency.to_dict() if latency else {"count": 0},
+            }
+        events = {}
+        for name, window in sorted(self.events.items(), key=lambda item: -item[1].total):
+            code, subevent = self.event_codes[name]
+            events[name] = {"code": f"0x{code:02x}", "subevent": f"0x{subevent:02x}" if subevent is not None else None,
+                            "count": window.total, "rate_per_s": window.rate(now)}
+        data = {}
+        for (packet_type, handle, received), window in sorted(self.data.items()):
+            entry = data.setdefault(f"0x{handle:04x}", {"type": data_type_names.get(packet_type, "Data"),
+                                                         "tx_bytes": 0, "rx_bytes": 0,
+                                                         "tx_bytes_per_s": 0.0, "rx_bytes_per_s": 0.0})
+            direction = "rx" if received else "tx"
+            entry[f"{direction}_bytes"] = window.total
+            entry[f"{direction}_bytes_per_s"] = window.rate(now)
+        return {
+            "packets": self.packets,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "window_s": self.window,
+            "commands": commands,
+            "events": events,
+            "statuses": {status_text(status): count for status, count in sorted(self.statuses.items())},
+            "data": data,
+        }
+
+    def to_json(self, now=None, indent=2):
+        """
+        Returns:
+            str: snapshot(now) as JSON.
+        """
+        return json.dumps(self.snapshot(now), indent=indent)
+
+
+def capture_statistics(path, window=5):
+    """
+    Computes the statistics of a btsnoop capture.
+
+    Args:
+        path (str): btsnoop capture path.
+        window (int): Seconds over which rates are computed, ending at the last packet.
+
+    Returns:
+        HciStatistics: The statistics.
+    """
+    statistics = HciStatistics(window)
+    capture = BtsnoopFile(path)
+    try:
+        for record in decode_capture(capture):
+            statistics.add(record)
+    finally:
+        capture.close()
+    return statistics
+
+
+def main(argv=None):
+    """
+    Command line entry point; prints the statistics of a capture as JSON.
+
+    Example:
+        python -m Backend_lib.Linux.hci_stats logs/hci0_hci.btsnoop
+    """
+    parser = argparse.ArgumentParser(description="HCI traffic statistics of a btsnoop capture")
+    parser.add_argument("capture", help="btsnoop file")
+    parser.add_argument("--window", type=int, default=5, help="seconds over which rates are computed")
+    parser.add_argument("-o", "--output", help="write the JSON snapshot to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    snapshot = capture_statistics(args.capture, args.window).to_json()
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(snapshot)
+    else:
+        print(snapshot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
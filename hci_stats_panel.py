@@ -0,0 +1,115 @@
+import json
+import os
+
+from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtWidgets import (QWidget, QTreeWidget, QTreeWidgetItem, QPushButton, QLabel, QHBoxLayout, QVBoxLayout,
+                             QFileDialog, QHeaderView)
+
+
+def _format_latency(latency):
+    if not latency.get("count"):
+        return ""
+    return (f"mean {latency['mean']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+            f"min {latency['min']:.2f} / max {latency['max']:.2f} ms")
+
+
+class HciStatsPanel(QWidget):
+
+    """
+    Live view of HciStatistics snapshots: commands, events, statuses and data throughput.
+    """
+
+    headers = ["Name", "Count", "Rate", "Details"]
+
+    def __init__(self, export_directory=None, parent=None):
+        """
+        Initializes the panel.
+
+        Args:
+            export_directory (str, optional): Default directory for Export JSON.
+            parent (QWidget, optional): Parent widget.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.export_directory = export_directory or ""
+        self.snapshot = None
+        self.expanded = {"Commands": True, "Events": True, "Statuses": True, "Data": True}
+
+        self.summary_label = QLabel("No traffic yet")
+        export_button = QPushButton("Export JSON")
+        export_button.clicked.connect(self.export_json)
+        controls = QHBoxLayout()
+        controls.addWidget(self.summary_label, 1)
+        controls.addWidget(export_button)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(self.headers)
+        self.tree.setUniformRowHeights(True)
+        self.tree.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.tree.itemExpanded.connect(lambda item: self.expanded.__setitem__(item.text(0), True))
+        self.tree.itemCollapsed.connect(lambda item: self.expanded.__setitem__(item.text(0), False))
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.tree)
+
+    @pyqtSlot(dict)
+    def update_snapshot(self, snapshot):
+        """
+        Shows a statistics snapshot (HciStatistics.snapshot()).
+
+        Args:
+            snapshot (dict): The snapshot.
+        returns:
+            None
+        """
+        self.snapshot = snapshot
+        elapsed = (snapshot["last_time"] or 0) - (snapshot["first_time"] or 0)
+        self.summary_label.setText(f"{snapshot['packets']} packets in {elapsed:.1f} s, "
+                                   f"rates over the last {snapshot['window_s']} s")
+        scroll = self.tree.verticalScrollBar().value()
+        self.tree.setUpdatesEnabled(False)
+        self.tree.clear()
+        sections = [
+            ("Commands", [(name, entry["count"], "", _format_latency(entry["latency_ms"]) +
+                           ("; " if entry["latency_ms"].get("count") and entry["statuses"] else "") +
+                           ", ".join(f"{status}: {count}" for status, count in entry["statuses"].items()))
+                          for name, entry in snapshot["commands"].items()]),
+            ("Events", [(name, entry["count"], f"{entry['rate_per_s']:.1f}/s", entry["code"] +
+                         (f" / {entry['subevent']}" if entry["subevent"] else ""))
+                        for name, entry in snapshot["events"].items()]),
+            ("Statuses", [(status, count, "", "") for status, count in snapshot["statuses"].items()]),
+            ("Data", [(f"{entry['type']} {handle}", entry["tx_bytes"] + entry["rx_bytes"],
+                       f"tx {entry['tx_bytes_per_s'] / 1000:.1f} kB/s, rx {entry['rx_bytes_per_s'] / 1000:.1f} kB/s",
+                       f"tx {entry['tx_bytes']} B, rx {entry['rx_bytes']} B")
+                      for handle, entry in snapshot["data"].items()]),
+        ]
+        for title, rows in sections:
+            section = QTreeWidgetItem([title, str(len(rows)), "", ""])
+            section.addChildren([QTreeWidgetItem([str(column) for column in row]) for row in rows])
+            self.tree.addTopLevelItem(section)
+            section.setExpanded(self.expanded.get(title, True))
+        self.tree.setUpdatesEnabled(True)
+        self.tree.verticalScrollBar().setValue(scroll)
+
+    def export_json(self):
+        """
+        Asks for a file and writes the latest snapshot to it as JSON.
+
+        args: None
+        returns: None
+        """
+        if self.snapshot is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Statistics",
+                                              os.path.join(self.export_directory, "hci_stats.json"),
+                                              "JSON Files (*.json);;All Files (*)")
+        if not path:
+            return
+        try:
+            with open(path, "w") as fp:
+                json.dump(self.snapshot, fp, indent=2)
+        except OSError as e:
+            self.summary_label.setText(f"Export failed: {e}")
@@ -0,0 +1,263 @@
+import socket
+import struct
+import threading
+import time
+import select
+
+
+# Linux Bluetooth socket constants. Fall back to the kernel values when the
+# interpreter was built without Bluetooth support in the socket module.
+AF_BLUETOOTH = getattr(socket, "AF_BLUETOOTH", 31)
+BTPROTO_HCI = getattr(socket, "BTPROTO_HCI", 1)
+SOL_HCI = getattr(socket, "SOL_HCI", 0)
+HCI_FILTER = getattr(socket, "HCI_FILTER", 2)
+
+# H4 packet indicators
+HCI_COMMAND_PKT = 0x01
+HCI_ACLDATA_PKT = 0x02
+HCI_SCODATA_PKT = 0x03
+HCI_EVENT_PKT = 0x04
+HCI_ISODATA_PKT = 0x05
+
+# Event codes the transport waits on
+EVT_CMD_COMPLETE = 0x0e
+EVT_CMD_STATUS = 0x0f
+
+HCI_COMMAND_TIMEOUT = 5.0
+
+# HCI_FILTER values: events only; Command Complete/Status, or every event code
+_command_events_filter = struct.pack("<IIIH2x", 1 << HCI_EVENT_PKT,
+                                     (1 << EVT_CMD_COMPLETE) | (1 << EVT_CMD_STATUS), 0, 0)
+_all_events_filter = struct.pack("<IIIH2x", 1 << HCI_EVENT_PKT, 0xffffffff, 0xffffffff, 0)
+
+
+class HciTransportError(Exception):
+    """
+    Raised when an HCI command cannot be delivered or is not answered by the controller.
+    """
+
+
+def interface_index(interface):
+    """
+    Converts an interface name to its HCI device index.
+
+    Args:
+        interface (str): Bluetooth interface name (e.g., 'hci0').
+
+    Returns:
+        int: Device index (e.g., 0).
+    """
+    return int(interface.replace("hci", ""))
+
+
+def format_hci_event(packet):
+    """
+    Formats an H4 event packet the same way `hcitool cmd` prints it.
+
+    Args:
+        packet (bytes): H4 event packet (indicator, event code, length, parameters).
+
+    Returns:
+        str: hcitool style event dump.
+    """
+    payload = packet[3:]
+    lines = [f"> HCI Event: 0x{packet[1]:02x} plen {packet[2]}"]
+    for index in range(0, len(payload), 20):
+        lines.append("  " + " ".join(f"{byte:02X}" for byte in payload[index:index + 20]))
+    return "\n".join(lines)
+
+
+class HciSocketTransport:
+    """
+    Persistent raw HCI socket bound to one controller.
+
+    Command packets are written straight to the socket and the matching
+    Command Complete / Command Status event is read back, so no process is
+    spawned per command. A pre-connected socket (e.g. one end of a socketpair
+    served by an emulator) can be passed in place of the kernel socket.
+    """
+
+    def __init__(self, interface, sock=None, log=None):
+        """
+        Initializes the transport.
+
+        Args:
+            interface (str): Bluetooth interface (e.g., 'hci0').
+            sock (socket.socket, optional): Already connected socket carrying H4 packets.
+            log (Logger, optional): Logger instance used for logging.
+        """
+        self.interface = interface
+        self.log = log
+        self.sock = sock
+        self.lock = threading.Lock()
+
+    def open(self):
+        """
+        Opens and binds the raw HCI socket if it is not open yet.
+
+        Raises:
+            OSError: If the socket cannot be created or bound.
+        """
+        if self.sock:
+            return
+        sock = socket.socket(AF_BLUETOOTH, socket.SOCK_RAW, BTPROTO_HCI)
+        try:
+            sock.bind((interface_index(self.interface),))
+            sock.setsockopt(SOL_HCI, HCI_FILTER, _command_events_filter)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        if self.log:
+            self.log.info(f"[INFO] Raw HCI socket opened on {self.interface}")
+
+    def close(self):
+        """
+        Closes the socket.
+
+        args: None
+        returns: None
+        """
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def receive_all_events(self, enabled):
+        """
+        Widens the socket filter to every event, or narrows it back to Command Complete/Status.
+
+        Sockets that are not raw HCI sockets (e.g. an emulator's socketpair) already carry every event.
+
+        Args:
+            enabled (bool): True to receive every event.
+
+        Raises:
+            OSError: If the filter cannot be set.
+        """
+        self.open()
+        if self.sock.family == AF_BLUETOOTH:
+            self.sock.setsockopt(SOL_HCI, HCI_FILTER, _all_events_filter if enabled else _command_events_filter)
+
+    def fileno(self):
+        """
+        Returns the socket file descriptor, opening the socket if needed.
+
+        Returns:
+            int: File descriptor.
+        """
+        self.open()
+        return self.sock.fileno()
+
+    def send_packet(self, packet):
+        """
+        Writes one H4 packet to the controller.
+
+        Args:
+            packet (bytes): H4 packet including the packet indicator.
+        """
+        self.open()
+        self.sock.send(packet)
+
+    def recv_packet(self, timeout=None):
+        """
+        Reads one H4 packet from the controller.
+
+        Args:
+            timeout (float, optional): Seconds to wait. None blocks until a packet arrives.
+
+        Returns:
+            bytes | None: The packet, or None if the timeout expired.
+        """
+        self.open()
+        if timeout is not None:
+            readable, _, _ = select.select([self.sock], [], [], max(timeout, 0))
+            if not readable:
+                return None
+        return self.sock.recv(1024)
+
+    def execute(self, opcode, packet, timeout=HCI_COMMAND_TIMEOUT):
+        """
+        Sends a command packet and waits for its Command Complete or Command Status event.
+
+        Events that belong to other opcodes (e.g. commands issued by bluetoothd)
+        are skipped.
+
+        Args:
+            opcode (int): Command opcode, (OGF << 10) | OCF.
+            packet (bytes): H4 command packet.
+            timeout (float): Seconds to wait for the matching event.
+
+        Returns:
+            bytes: The matching H4 event packet.
+
+        Raises:
+            HciTransportError: If no matching event arrives within the timeout.
+        """
+        with self.lock:
+            self.send_packet(packet)
+            deadline = time.monotonic() + timeout
+            while True:
+                event = self.recv_packet(deadline - time.monotonic())
+                if event is None:
+                    raise HciTransportError(
+                        f"Timed out waiting for opcode 0x{opcode:04x} on {self.interface}")
+                if len(event) < 6 or event[0] != HCI_EVENT_PKT:
+                    continue
+                if event[1] == EVT_CMD_COMPLETE and struct.unpack_from("<H", event, 4)[0] == opcode:
+                    return event
+                if event[1] == EVT_CMD_STATUS and len(event) >= 7 and \
+                        struct.unpack_from("<H", event, 5)[0] == opcode:
+                    return event
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(interface, log=None):
+    """
+    Returns the persistent transport for an interface, creating it on first use.
+
+    Args:
+        interface (str): Bluetooth interface (e.g., 'hci0').
+        log (Logger, optional): Logger instance used for logging.
+
+    Returns:
+        HciSocketTransport: Open transport for the interface.
+    """
+    with _transports_lock:
+        transport = _transports.get(interface)
+        if not transport:
+            transport = HciSocketTransport(interface, log=log)
+            _transports[interface] = transport
+    transport.open()
+    return transport
+
+
+def register_transport(interface, transport):
+    """
+    Registers a transport for an interface name, replacing any existing one.
+
+    Args:
+        interface (str): Interface name the transport should answer for.
+        transport (HciSocketTransport): Transport instance.
+    """
+    with _transports_lock:
+        old = _transports.get(interface)
+        _transports[interface] = transport
+    if old and old is not transport:
+        old.close()
+
+
+def close_transports():
+    """
+    Closes every open transport.
+
+    args: None
+    returns: None
+    """
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.close()
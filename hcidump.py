@@ -0,0 +1,241 @@
+import re
+import struct
+from datetime import datetime
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux import log_rotation
+
+
+timestamp_re = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+|\d+\.\d+)\s+")
+command_re = re.compile(r"^< HCI Command: (?:.*?\(0x([0-9a-fA-F]{2})\|0x([0-9a-fA-F]{4})\)|"
+                        r"ogf 0x([0-9a-fA-F]+), ocf 0x([0-9a-fA-F]+),) plen (\d+)")
+event_re = re.compile(r"^> HCI Event: (?:.*?\(0x([0-9a-fA-F]{2})\)|0x([0-9a-fA-F]{2})) plen (\d+)")
+acl_re = re.compile(r"^[<>] (ACL|SCO|ISO) data: handle (\d+)(?: flags 0x([0-9a-fA-F]+))?(?: dlen (\d+))?")
+decoded_opcode_re = re.compile(r"\(0x([0-9a-fA-F]{2})\|0x([0-9a-fA-F]{4})\)")
+decoded_status_re = re.compile(r"status 0x([0-9a-fA-F]{2})")
+decoded_handle_re = re.compile(r"handle (0x[0-9a-fA-F]+|\d+)")
+_hex_byte_re = re.compile(r"^[0-9a-fA-F]{2}$")
+_hex_offset_re = re.compile(r"^[0-9a-fA-F]{4}:$")
+_data_packet_types = {"ACL": hci_transport.HCI_ACLDATA_PKT, "SCO": hci_transport.HCI_SCODATA_PKT,
+                      "ISO": hci_transport.HCI_ISODATA_PKT}
+
+
+# Last 'YYYY-MM-DD HH:MM:SS' prefix converted; consecutive lines mostly share it
+_second_cache = [None, 0.0]
+
+
+def parse_timestamp(text):
+    """
+    Converts an hcidump timestamp ('2024-05-01 10:00:00.123456' or '1714557600.123456') to Unix seconds.
+    """
+    if text is None:
+        return None
+    if "-" not in text:
+        return float(text)
+    second, _, fraction = text.partition(".")
+    if second != _second_cache[0]:
+        _second_cache[1] = datetime(int(second[0:4]), int(second[5:7]), int(second[8:10]), int(second[11:13]),
+                                    int(second[14:16]), int(second[17:19])).timestamp()
+        _second_cache[0] = second
+    return _second_cache[1] + (int(fraction) / 10 ** len(fraction) if fraction else 0.0)
+
+
+def _raw_length(data):
+    """
+    Total length of a raw H4 packet once its header is known, None while it is incomplete.
+    """
+    if not data:
+        return None
+    header = {hci_transport.HCI_COMMAND_PKT: (4, 3), hci_transport.HCI_EVENT_PKT: (3, 2)}.get(data[0])
+    if header is None:
+        return len(data)
+    size, length_offset = header
+    return size + data[length_offset] if len(data) >= size else None
+
+
+class HcidumpFrame:
+
+    """
+    One '<' or '>' entry of an hcidump text log.
+
+    Attributes:
+        kind: 'command', 'event', 'raw' (hcidump -R bytes) or 'data' (ACL/SCO/ISO header).
+        timestamp: Unix seconds, None if the log has no timestamps.
+        line: line number of the entry's first line.
+        received: True for '>' entries.
+        length: parameter length from the header (total length for raw entries).
+        data: payload bytes collected from hex lines.
+        opcode: command opcode, or the opcode a decoded Command Complete/Status refers to.
+        event_code: event code of event entries.
+        packet_type: H4 indicator of command, event and data entries (from the header), None otherwise.
+        flags: packet boundary/broadcast flags of data entries.
+        status: status parsed from decoded text.
+        handle: connection handle parsed from decoded text.
+    """
+
+    __slots__ = ("kind", "timestamp", "line", "received", "length", "data", "opcode", "event_code",
+                 "packet_type", "flags", "status", "handle")
+
+    def __init__(self, kind, timestamp, line, received, length=None, opcode=None, event_code=None, handle=None,
+                 packet_type=None, flags=0):
+        self.kind = kind
+        self.timestamp = timestamp
+        self.line = line
+        self.received = received
+        self.length = length
+        self.data = bytearray()
+        self.opcode = opcode
+        self.event_code = event_code
+        self.packet_type = packet_type
+        self.flags = flags
+        self.status = None
+        self.handle = handle
+
+    def add_hex(self, tokens):
+        """
+        Appends leading hex byte tokens, up to the frame length. Returns False if none were hex.
+        """
+        if self.length is None or len(tokens) <= self.length - len(self.data):
+            try:
+                data = bytes.fromhex(" ".join(tokens))
+            except ValueError:
+                data = None
+            if data is not None and len(data) == len(tokens):
+                self.data += data
+                return bool(data)
+        added = False
+        for token in tokens:
+            if self.length is not None and len(self.data) >= self.length:
+                break
+            if not _hex_byte_re.match(token):
+                break
+            self.data.append(int(token, 16))
+            added = True
+        return added
+
+    def packet(self):
+        """
+        Returns:
+            bytes: The complete H4 packet, None if the log did not show every byte.
+        """
+        data = bytes(self.data)
+        if self.kind == "raw":
+            return data if data and len(data) == self.length else None
+        if self.kind == "command" and len(data) == self.length:
+            return struct.pack("<BHB", hci_transport.HCI_COMMAND_PKT, self.opcode, self.length) + data
+        if self.kind == "event" and len(data) == self.length:
+            return bytes([hci_transport.HCI_EVENT_PKT, self.event_code, self.length]) + data
+        if self.kind == "data" and self.length is not None and len(data) == self.length:
+            header = (self.flags << 12) | self.handle
+            if self.packet_type == hci_transport.HCI_SCODATA_PKT:
+                return struct.pack("<BHB", self.packet_type, header, self.length) + data
+            return struct.pack("<BHH", self.packet_type, header, self.length) + data
+        return None
+
+
+class HcidumpParser:
+
+    """
+    Incremental parser grouping hcidump text lines into frames.
+
+    Raw dumps (hcidump -R) and decoded dumps with or without hex payloads
+    (hcidump -x / -X) are understood. A frame is returned once the next entry
+    starts, or by finish() at the end of the log.
+    """
+
+    def __init__(self):
+        self.frame = None
+
+    def feed(self, line_number, line):
+        """
+        Parses one line.
+
+        Args:
+            line_number (int): Line number, stored as the frame's line.
+            line (str): The line.
+
+        Returns:
+            HcidumpFrame: The previous frame if this line starts a new entry, None otherwise.
+        """
+        line = line.rstrip()
+        match = timestamp_re.match(line)
+        body = line[match.end():] if match else line.strip()
+        if body.startswith(("<", ">")) and not line[:1].isspace():
+            completed = self.frame
+            self.frame = self._start(line_number, parse_timestamp(match.group(1)) if match else None, body)
+            return completed
+        frame = self.frame
+        if frame is None:
+            return None
+        tokens = body.split()
+        if tokens and _hex_offset_re.match(tokens[0]):
+            tokens = tokens[1:]
+        if frame.kind == "raw":
+            frame.add_hex(tokens)
+            frame.length = _raw_length(frame.data)
+        elif not frame.add_hex(tokens):
+            opcode = decoded_opcode_re.search(body)
+            status = decoded_status_re.search(body)
+            handle = decoded_handle_re.search(body)
+            if opcode and frame.kind == "event":
+                frame.opcode = (int(opcode.group(1), 16) << 10) | int(opcode.group(2), 16)
+            if status and frame.status is None:
+                frame.status = int(status.group(1), 16)
+            if handle and frame.handle is None:
+                frame.handle = int(handle.group(1), 0)
+        return None
+
+    def finish(self):
+        """
+        Returns:
+            HcidumpFrame: The last frame, None if there is none.
+        """
+        completed, self.frame = self.frame, None
+        return completed
+
+    @staticmethod
+    def _start(line_number, timestamp, body):
+        received = body[0] == ">"
+        command = command_re.match(body)
+        if command:
+            ogf = int(command.group(1) or command.group(3), 16)
+            ocf = int(command.group(2) or command.group(4), 16)
+            return HcidumpFrame("command", timestamp, line_number, received, int(command.group(5)),
+                                opcode=(ogf << 10) | ocf, packet_type=hci_transport.HCI_COMMAND_PKT)
+        event = event_re.match(body)
+        if event:
+            return HcidumpFrame("event", timestamp, line_number, received, int(event.group(3)),
+                                event_code=int(event.group(1) or event.group(2), 16),
+                                packet_type=hci_transport.HCI_EVENT_PKT)
+        data = acl_re.match(body)
+        if data:
+            return HcidumpFrame("data", timestamp, line_number, received,
+                                int(data.group(4)) if data.group(4) else None, handle=int(data.group(2)),
+                                packet_type=_data_packet_types[data.group(1)],
+                                flags=int(data.group(3), 16) if data.group(3) else 0)
+        tokens = body[1:].split()
+        frame = HcidumpFrame("raw", timestamp, line_number, received)
+        if tokens and frame.add_hex(tokens) and len(frame.data) == len(tokens):
+            frame.length = _raw_length(frame.data)
+            return frame
+        return HcidumpFrame("other", timestamp, line_number, received)
+
+
+def iter_frames(path):
+    """
+    Parses an hcidump text log into frames, reading rotated and compressed segments first.
+
+    Args:
+        path (str): hcidump log path, or a single (compressed) segment.
+
+    Yields:
+        HcidumpFrame: Frames in log order.
+    """
+    parser = HcidumpParser()
+    for line_number, line in enumerate(log_rotation.iter_lines(path), 1):
+        frame = parser.feed(line_number, line)
+        if frame is not None:
+            yield frame
+    frame = parser.finish()
+    if frame is not None:
+        yield frame
@@ -0,0 +1,349 @@
+import bisect
+import re
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+from Backend_lib.Linux.hcidump import HcidumpParser
+from Backend_lib.Linux.hci_decoder import decode_packet, event_fields, le_subevent_fields
+from Backend_lib.Linux.hci_events import command_names
+from Backend_lib.Linux.log_reader import LineIndex
+
+
+_NONE = -1
+_query_key_re = re.compile(r"\b(opcode|event|subevent|handle|status|name|after|before):", re.IGNORECASE)
+
+
+class HciLogIndex:
+
+    """
+    Incremental index of the HCI frames in an hcidump text log.
+
+    Every frame is indexed by timestamp, opcode, event code, LE subevent,
+    connection handle and status, pointing at the line the frame starts on.
+    Only lines appended since the last update() are parsed, so the index can be
+    kept current while the capture runs and queries never rescan the log.
+    Frames shown only in decoded form are indexed from their text (opcode,
+    'status 0x..', 'handle N'); frames with hex payloads are decoded.
+
+    The frame still open at the end of the log is indexed provisionally, so
+    the last frame is searchable too; it is replaced once its following lines
+    arrive. update() may run on another thread (see LogIndexer) while
+    queries are made: both hold the lock, update() only per block of lines.
+    """
+
+    def __init__(self, lines, block_lines=4096):
+        """
+        Initializes the index.
+
+        Args:
+            lines (LineIndex | str): Line index of the log, or the log path. A LineIndex
+                passed in is shared and its owner keeps calling its update().
+            block_lines (int): Lines read from disk per parsing step.
+        """
+        self.owns_lines = isinstance(lines, str)
+        self.lines = LineIndex(lines) if self.owns_lines else lines
+        self.block_lines = block_lines
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.generation = self.lines.generation
+        self.provisional = False
+        self.parser = HcidumpParser()
+        self.processed = 0
+        self.last_time = 0.0
+        self.frame_lines = array("Q")
+        self.times = array("d")
+        self.opcodes = array("l")
+        self.events = array("l")
+        self.subevents = array("l")
+        self.handles = array("l")
+        self.statuses = array("l")
+        self.postings = {"opcode": {}, "event": {}, "subevent": {}, "handle": {}, "status": {}}
+
+    def __len__(self):
+        return len(self.frame_lines)
+
+    def update(self):
+        """
+        Indexes the frames in lines appended since the last call.
+
+        Returns:
+            int: Number of new frames.
+        """
+        if self.owns_lines:
+            self.lines.update()
+        with self.lock:
+            if self.lines.generation != self.generation:
+                self._reset()
+            before = len(self.frame_lines) - self.provisional
+            if self.processed >= len(self.lines):
+                return 0
+            self._drop_provisional()
+        while True:
+            with self.lock:
+                block = self.lines.read_lines(self.processed, self.block_lines)
+                for number, line in enumerate(block, self.processed):
+                    frame = self.parser.feed(number, line)
+                    if frame is not None:
+                        self._add(frame)
+                self.processed += len(block)
+                if not block or self.processed >= len(self.lines):
+                    # The last frame completes only when the next one starts; index it meanwhile
+                    if self.parser.frame is not None:
+                        self._add(self.parser.frame)
+                        self.provisional = True
+                    return len(self.frame_lines) - self.provisional - before
+
+    def pending(self):
+        """
+        Returns:
+            bool: True if lines known to the line index are not indexed yet.
+        """
+        return self.processed < len(self.lines)
+
+    def _drop_provisional(self):
+        if not self.provisional:
+            return
+        self.provisional = False
+        entry = len(self.frame_lines) - 1
+        self.frame_lines.pop()
+        self.times.pop()
+        self.last_time = self.times[-1] if self.times else 0.0
+        for key, values in (("opcode", self.opcodes), ("event", self.events), ("subevent", self.subevents),
+                            ("handle", self.handles), ("status", self.statuses)):
+            value = values.pop()
+            if value == _NONE:
+                continue
+            entries = self.postings[key][value]
+            if entries and entries[-1] == entry:
+                entries.pop()
+            if not entries:
+                del self.postings[key][value]
+
+    def _add(self, frame):
+        opcode, event, subevent, handle, status = frame.opcode, frame.event_code, None, frame.handle, frame.status
+        packet = frame.packet()
+        if packet is not None:
+            record = decode_packet(frame.timestamp, frame.received, packet)
+            opcode, event, subevent, handle, status = (record.opcode, record.event, record.subevent,
+                                                       record.handle, record.status)
+        if frame.timestamp is not None:
+            self.last_time = frame.timestamp
+        entry = len(self.frame_lines)
+        self.frame_lines.append(frame.line)
+        self.times.append(self.last_time)
+        for key, values, value in (("opcode", self.opcodes, opcode), ("event", self.events, event),
+                                   ("subevent", self.subevents, subevent), ("handle", self.handles, handle),
+                                   ("status", self.statuses, status)):
+            values.append(_NONE if value is None else value)
+            if value is not None:
+                self.postings[key].setdefault(value, array("Q")).append(entry)
+
+    def _entry_range(self, after=None, before=None):
+        low = bisect.bisect_left(self.times, after) if after is not None else 0
+        high = bisect.bisect_right(self.times, before) if before is not None else len(self.times)
+        return low, high
+
+    def query(self, opcode=None, event=None, subevent=None, handle=None, status=None, after=None, before=None,
+              limit=None):
+        """
+        Finds frames matching every given criterion.
+
+        Args:
+            opcode (int, optional): Command opcode (also matches Command Complete/Status for it).
+            event (int, optional): Event code.
+            subevent (int, optional): LE Meta subevent code.
+            handle (int, optional): Connection handle.
+            status (int, optional): Status code.
+            after (float, optional): Earliest timestamp, Unix seconds.
+            before (float, optional): Latest timestamp, Unix seconds.
+            limit (int, optional): Maximum number of matches.
+
+        Returns:
+            list: Line numbers of the matching frames, in log order.
+        """
+        with self.lock:
+            return self._query(opcode, event, subevent, handle, status, after, before, limit)
+
+    def _query(self, opcode, event, subevent, handle, status, after, before, limit):
+        low, high = self._entry_range(after, before)
+        criteria = [(key, value) for key, value in (("opcode", opcode), ("event", event), ("subevent", subevent),
+                                                    ("handle", handle), ("status", status)) if value is not None]
+        if criteria:
+            postings = sorted((self.postings[key].get(value, ()) for key, value in criteria), key=len)
+            candidates = postings[0]
+            start, stop = bisect.bisect_left(candidates, low), bisect.bisect_left(candidates, high)
+            candidates = candidates[start:stop]
+            columns = {"opcode": self.opcodes, "event": self.events, "subevent": self.subevents,
+                       "handle": self.handles, "status": self.statuses}
+            checks = [(columns[key], value) for key, value in criteria]
+            entries = (entry for entry in candidates if all(column[entry] == value for column, value in checks))
+        else:
+            entries = range(low, high)
+        matches = []
+        for entry in entries:
+            matches.append(self.frame_lines[entry])
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def first_time(self):
+        """
+        Returns:
+            float: Timestamp of the first timestamped frame, None if there is none.
+        """
+        with self.lock:
+            position = bisect.bisect_right(self.times, 0.0)
+            return self.times[position] if position < len(self.times) else None
+
+    def close(self):
+        if self.owns_lines:
+            self.lines.close()
+
+
+class LogIndexer:
+
+    """
+    Keeps an HciLogIndex current on a background thread while its log grows.
+
+    notify() (e.g. from a LogTailer tick) wakes the thread, which indexes
+    the lines appended since its last pass, so the index is built alongside
+    the capture and searches never parse the log on the caller's thread.
+    """
+
+    def __init__(self, index, log=None):
+        """
+        Starts the indexing thread and indexes what the log already holds.
+
+        Args:
+            index (HciLogIndex): Index to keep current; it should own its LineIndex (built from a path).
+            log (Logger, optional): Logger instance used for logging.
+        """
+        self.index = index
+        self.log = log
+        self.wake = threading.Event()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="hci-log-indexer", daemon=True)
+        self.thread.start()
+        self.notify()
+
+    def notify(self):
+        """
+        Asks for the lines appended since the last pass to be indexed.
+
+        args: None
+        returns: None
+        """
+        self.wake.set()
+
+    def busy(self):
+        """
+        Returns:
+            bool: True while lines already in the log are waiting to be indexed.
+        """
+        return self.wake.is_set() or self.index.pending()
+
+    def _run(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            if not self.running:
+                return
+            try:
+                self.index.update()
+            except (OSError, ValueError) as e:
+                if self.log:
+                    self.log.error(f"[ERROR] Indexing {self.index.lines.path} failed: {e}")
+
+    def stop(self, timeout=2.0):
+        """
+        Stops the thread and closes the index.
+
+        args: timeout (float): Seconds to wait for a pass in progress.
+        returns: None
+        """
+        self.running = False
+        self.wake.set()
+        self.thread.join(timeout)
+        self.index.close()
+
+
+def _resolve_name(name):
+    """
+    Maps a command or event name to query criteria.
+    """
+    wanted = name.strip().lower()
+    for code, (event_name, _, _) in event_fields.items():
+        if event_name.lower() == wanted:
+            return {"event": code}
+    for code, (event_name, _, _) in le_subevent_fields.items():
+        if event_name.lower() == wanted:
+            return {"event": 0x3e, "subevent": code}
+    for opcode, command_name in command_names.items():
+        if command_name.lower() == wanted:
+            return {"opcode": opcode}
+    raise ValueError(f"Unknown command or event name: {name}")
+
+
+def _resolve_time(text, reference):
+    """
+    Converts 'YYYY-MM-DD HH:MM:SS[.f]' or 'HH:MM:SS[.f]' to Unix seconds. A time of day is taken
+    on the day of the reference timestamp, or the next day if that is earlier than the reference.
+    """
+    text = text.strip()
+    for layout in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(text, layout).timestamp()
+        except ValueError:
+            pass
+    for layout in ("%H:%M:%S.%f", "%H:%M:%S", "%H:%M"):
+        try:
+            clock = datetime.strptime(text, layout).time()
+            break
+        except ValueError:
+            pass
+    else:
+        raise ValueError(f"Invalid time: {text}")
+    day = datetime.fromtimestamp(reference) if reference else datetime.now()
+    moment = datetime.combine(day.date(), clock)
+    if reference and moment.timestamp() < reference:
+        moment += timedelta(days=1)
+    return moment.timestamp()
+
+
+def parse_query(text, reference_time=None):
+    """
+    Parses a search box query into HciLogIndex.query criteria.
+
+    Queries are 'key:value' terms: opcode, event, subevent, handle and status
+    take numbers (hex with 0x), name takes a command or event name, after and
+    before take a time. For example:
+        name:Disconnection Complete handle:0x0040
+        event:0x3e subevent:0x01 after:14:02:11
+
+    Args:
+        text (str): Query text.
+        reference_time (float, optional): First timestamp of the log, used to place times of day.
+
+    Returns:
+        dict: Criteria, None if the text has no 'key:' terms (a plain text search).
+
+    Raises:
+        ValueError: If a value cannot be parsed.
+    """
+    keys = list(_query_key_re.finditer(text))
+    if not keys:
+        return None
+    criteria = {}
+    for position, match in enumerate(keys):
+        end = keys[position + 1].start() if position + 1 < len(keys) else len(text)
+        key, value = match.group(1).lower(), text[match.end():end].strip()
+        if key == "name":
+            criteria.update(_resolve_name(value))
+        elif key in ("after", "before"):
+            criteria[key] = _resolve_time(value, reference_time)
+        else:
+            criteria[key] = int(value, 0)
+    return criteria
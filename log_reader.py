@@ -0,0 +1,136 @@
+import os
+from array import array
+
+
+class LineIndex:
+    """
+    Incremental index of line start offsets in a growing text log.
+
+    Only the bytes appended since the last update are scanned, and lines are
+    read back from disk on demand, so the memory cost is 8 bytes per line
+    whatever the log size. A trailing line without a newline is not indexed
+    until it is complete. A file that shrinks or is replaced (truncated, or
+    rotated to a new inode) is re-indexed from the start and `generation` is
+    incremented.
+    """
+
+    def __init__(self, path, chunk_size=1 << 20):
+        """
+        Initializes the index; call update() to scan the file.
+
+        Args:
+            path (str): Log file path.
+            chunk_size (int): Bytes read per scan step.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.offsets = array("Q")
+        self.end = 0
+        self.scanned = 0
+        self.generation = 0
+        self.inode = None
+        self.fp = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _open(self):
+        if self.fp is None:
+            self.fp = open(self.path, "rb")
+        return self.fp
+
+    def close(self):
+        """
+        Closes the log file.
+
+        args: None
+        returns: None
+        """
+        if self.fp is not None:
+            self.fp.close()
+            self.fp = None
+
+    def reset(self):
+        """
+        Drops the index so the next update() rescans the file.
+
+        args: None
+        returns: None
+        """
+        self.close()
+        self.offsets = array("Q")
+        self.end = 0
+        self.scanned = 0
+        self.inode = None
+        self.generation += 1
+
+    def update(self):
+        """
+        Indexes lines appended since the last call.
+
+        Returns:
+            int: Number of new complete lines.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return 0
+        size = stat.st_size
+        if size < self.scanned or (self.inode is not None and stat.st_ino != self.inode):
+            self.reset()
+        if size == self.scanned:
+            return 0
+        fp = self._open()
+        self.inode = os.fstat(fp.fileno()).st_ino
+        fp.seek(self.scanned)
+        before = len(self.offsets)
+        offsets = self.offsets
+        line_start = self.end
+        position = self.scanned
+        while position < size:
+            chunk = fp.read(min(self.chunk_size, size - position))
+            if not chunk:
+                break
+            newline = chunk.find(b"\n")
+            while newline != -1:
+                offsets.append(line_start)
+                line_start = position + newline + 1
+                newline = chunk.find(b"\n", newline + 1)
+            position += len(chunk)
+        self.end = line_start
+        self.scanned = position
+        return len(offsets) - before
+
+    def read_lines(self, start, count):
+        """
+        Reads indexed lines from disk.
+
+        Args:
+            start (int): First line number.
+            count (int): Maximum number of lines.
+
+        Returns:
+            list: Lines without their newline, decoded as UTF-8 with replacement.
+        """
+        stop = min(start + count, len(self.offsets))
+        if start >= stop:
+            return []
+        begin = self.offsets[start]
+        finish = self.offsets[stop] if stop < len(self.offsets) else self.end
+        fp = self._open()
+        fp.seek(begin)
+        data = fp.read(finish - begin)
+        return data.decode("utf-8", errors="replace").split("\n")[:stop - start]
+
+    def read_line(self, number):
+        """
+        Reads one indexed line from disk.
+
+        Args:
+            number (int): Line number.
+
+        Returns:
+            str: The line without its newline.
+        """
+        lines = self.read_lines(number, 1)
+        return lines[0] if lines else ""
@@ -0,0 +1,400 @@
+import gzip
+import io
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+default_max_bytes = 64 * 1024 * 1024
+default_max_age = 60 * 60
+compression_suffixes = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _segment_re(path):
+    return re.compile(re.escape(os.path.basename(path)) + r"\.(\d+)(\.gz|\.zst)?$")
+
+
+def closed_segments(path):
+    """
+    Lists the rotated segments of a log, oldest first.
+
+    A segment still being compressed is listed under its uncompressed name
+    until the compressed file is complete.
+
+    Args:
+        path (str): Path of the active log file.
+
+    Returns:
+        list: (sequence number, segment path) tuples.
+    """
+    directory = os.path.dirname(path) or "."
+    pattern = _segment_re(path)
+    segments = {}
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if not match:
+            continue
+        number = int(match.group(1))
+        if match.group(2) or number not in segments:
+            segments[number] = os.path.join(directory, name)
+    return sorted(segments.items())
+
+
+def segment_paths(path):
+    """
+    Lists every file holding a rotated log, oldest first: the closed segments followed by the active file.
+
+    Args:
+        path (str): Path of the active log file, or of a single segment.
+
+    Returns:
+        list: File paths.
+    """
+    if path.endswith(tuple(compression_suffixes.values())):
+        return [path]
+    paths = [segment for _, segment in closed_segments(path)]
+    if os.path.exists(path):
+        paths.append(path)
+    return paths
+
+
+def open_segment(path):
+    """
+    Opens one log segment for binary reading, decompressing .gz and .zst segments on the fly.
+
+    Args:
+        path (str): Segment path.
+
+    Returns:
+        file object: Readable binary stream.
+
+    Raises:
+        RuntimeError: If the segment is zstd compressed and zstandard is not installed.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def iter_lines(path, errors="replace"):
+    """
+    Iterates the lines of a rotated log across its compressed and uncompressed segments.
+
+    Args:
+        path (str): Path of the active log file, or of a single segment.
+        errors (str): UTF-8 decoding error handler.
+
+    Yields:
+        str: Lines, with their newline.
+    """
+    for segment in segment_paths(path):
+        try:
+            stream = open_segment(segment)
+        except FileNotFoundError:
+            # Compressed and removed between listing and opening; its .gz/.zst is read instead
+            compressed = [name for name in segment_paths(path) if name.startswith(segment + ".")]
+            if not compressed:
+                continue
+            stream = open_segment(compressed[0])
+        with io.TextIOWrapper(stream, encoding="utf-8", errors=errors) as fp:
+            yield from fp
+
+
+def compress_segment(path, compression="gzip", level=None):
+    """
+    Compresses a closed segment in a streaming fashion and removes the original.
+
+    The compressed data is written to a temporary file that is renamed once
+    complete, so readers never see a truncated segment.
+
+    Args:
+        path (str): Segment path.
+        compression (str): 'gzip' or 'zstd'.
+        level (int, optional): Compression level; 6 for gzip and 3 for zstd by default.
+
+    Returns:
+        str: Path of the compressed segment.
+    """
+    target = path + compression_suffixes[compression]
+    temporary = target + ".tmp"
+    with open(path, "rb") as source:
+        if compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            with compressor.stream_writer(open(temporary, "wb"), closefd=True) as sink:
+                shutil.copyfileobj(source, sink, 1 << 20)
+        else:
+            with gzip.open(temporary, "wb", compresslevel=6 if level is None else level) as sink:
+                shutil.copyfileobj(source, sink, 1 << 20)
+    os.replace(temporary, target)
+    os.unlink(path)
+    return target
+
+
+class RotatingLogWriter:
+
+    """
+    Append-only log file that rotates by size and age and compresses closed segments.
+
+    The active segment keeps the log's name, so tools tailing it keep working.
+    On rotation it is renamed to '<name>.<sequence>' and compressed in a
+    background thread to '<name>.<sequence>.gz' (or '.zst'). Rotation only
+    happens at a line boundary, so no line is split across segments.
+    """
+
+    def __init__(self, path, max_bytes=default_max_bytes, max_age=default_max_age, compression="gzip",
+                 max_segments=None, log=None):
+        """
+        Opens the log for appending.
+
+        Args:
+            path (str): Log file path.
+            max_bytes (int): Size at which the active segment is rotated, None for no size limit.
+            max_age (float): Seconds after which the active segment is rotated, None for no age limit.
+            compression (str): 'gzip', 'zstd' or None to keep closed segments uncompressed.
+                zstd falls back to gzip when zstandard is not installed.
+            max_segments (int, optional): Number of closed segments kept; older ones are deleted.
+                None keeps every segment.
+            log (Logger, optional): Logger instance used for logging.
+        """
+        if compression not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            if log:
+                log.info("[WARN] zstandard is not installed, compressing log segments with gzip")
+            compression = "gzip"
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.max_segments = max_segments
+        self.log = log
+        segments = closed_segments(path)
+        self.sequence = segments[-1][0] + 1 if segments else 1
+        self.lock = threading.Lock()
+        self.compressor = ThreadPoolExecutor(max_workers=1) if compression else None
+        self.fp = None
+        self._open()
+
+    def _open(self):
+        # Unbuffered: every write() reaches the file at once, for viewers tailing it
+        self.fp = open(self.path, "ab", buffering=0)
+        self.size = self.fp.tell()
+        self.opened = time.monotonic()
+
+    def _rotation_due(self, incoming):
+        if self.max_bytes is not None and self.size + incoming > self.max_bytes:
+            return True
+        return self.max_age is not None and self.size and time.monotonic() - self.opened >= self.max_age
+
+    def write(self, data):
+        """
+        Appends bytes, rotating first at the last line boundary if the segment is full or too old.
+
+        Args:
+            data (bytes): Data to append.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if self.fp is None:
+                raise ValueError("write to a closed RotatingLogWriter")
+            if self.size and self._rotation_due(len(data)):
+                cut = data.rfind(b"\n") + 1
+                if cut:
+                    self.fp.write(data[:cut])
+                    data = data[cut:]
+                    self._rotate()
+            if data:
+                self.fp.write(data)
+                self.size += len(data)
+
+    def rotate(self):
+        """
+        Closes the active segment and starts a new one.
+
+        args: None
+        returns: None
+        """
+        with self.lock:
+            if self.fp is not None and self.size:
+                self._rotate()
+
+    def _rotate(self):
+        self.fp.close()
+        segment = f"{self.path}.{self.sequence:06d}"
+        os.replace(self.path, segment)
+        self.sequence += 1
+        self._open()
+        if self.compressor:
+            self.compressor.submit(self._compress, segment)
+        else:
+            self._prune()
+
+    def _compress(self, segment):
+        # Runs in the compressor thread, which also prunes so a segment is never removed mid-compression
+        try:
+            compress_segment(segment, self.compression)
+        except FileNotFoundError:
+            pass    # Already pruned while waiting for its turn
+        except (OSError, EOFError) as e:
+            if self.log:
+                self.log.info(f"[ERROR] Failed to compress log segment {segment}: {e}")
+        self._prune()
+
+    def _prune(self):
+        if not self.max_segments:
+            return
+        for _, old in closed_segments(self.path)[:-self.max_segments]:
+            self._remove(old)
+
+    def _remove(self, segment):
+        try:
+            os.unlink(segment)
+        except OSError as e:
+            if self.log:
+                self.log.info(f"[ERROR] Failed to remove log segment {segment}: {e}")
+
+    def close(self):
+        """
+        Closes the active segment, leaving it uncompressed, and waits for pending compressions.
+
+        args: None
+        returns: None
+        """
+        with self.lock:
+            if self.fp is not None:
+                self.fp.close()
+                self.fp = None
+        if self.compressor:
+            self.compressor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LogPump(threading.Thread):
+
+    """
+    Copies a process's output pipe into a RotatingLogWriter until the process closes it.
+
+    Write errors (a full disk) are logged once and the pipe keeps being
+    drained, so the process never blocks on a full pipe. With timestamp_lines,
+    each line is prefixed with its local arrival time in the hcidump -t format
+    ('YYYY-MM-DD HH:MM:SS.ffffff '), for daemons whose output has no wall-clock
+    timestamps. A stream_filter (an object with feed(bytes) -> bytes and
+    flush() -> bytes, such as hci_filter.HcidumpStreamFilter) drops output
+    before it reaches the disk.
+    """
+
+    def __init__(self, stream, writer, chunk_size=1 << 16, log=None, timestamp_lines=False, stream_filter=None):
+        """
+        Initializes the pump; call start() to run it.
+
+        Args:
+            stream (file object): Readable pipe.
+            writer (RotatingLogWriter): Destination log.
+            chunk_size (int): Maximum bytes read per call.
+            log (Logger, optional): Logger instance used for logging.
+            timestamp_lines (bool): Prefix every line with its arrival time.
+            stream_filter (object, optional): Filter applied to the output before it is written.
+        """
+        super().__init__(name=f"log-pump-{os.path.basename(writer.path)}", daemon=True)
+        self.stream = stream
+        self.writer = writer
+        self.chunk_size = chunk_size
+        self.log = log
+        self.timestamp_lines = timestamp_lines
+        self.stream_filter = stream_filter
+        self.line_start = True
+        self.failed = False
+
+    def _stamp(self, data):
+        now = time.time()
+        prefix = (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)) + f".{int(now * 1e6) % 1000000:06d} "
+                  ).encode()
+        body = data.replace(b"\n", b"\n" + prefix)
+        if self.line_start:
+            body = prefix + body
+        self.line_start = data.endswith(b"\n")
+        return body[:-len(prefix)] if self.line_start else body
+
+    def run(self):
+        fd = self.stream.fileno()
+        try:
+            while True:
+                data = os.read(fd, self.chunk_size)
+                if not data:
+                    break
+                if self.stream_filter is not None:
+                    data = self.stream_filter.feed(data)
+                self._write(data)
+            if self.stream_filter is not None:
+                self._write(self.stream_filter.flush())
+        finally:
+            self.stream.close()
+            self.writer.close()
+
+    def _write(self, data):
+        if not data:
+            return
+        if self.timestamp_lines:
+            data = self._stamp(data)
+        try:
+            self.writer.write(data)
+            self.failed = False
+        except OSError as e:
+            if not self.failed and self.log:
+                self.log.info(f"[ERROR] Failed to write {self.writer.path}: {e}")
+            self.failed = True
+
+
+def start_logged_process(command, path, log=None, timestamp_lines=False, stream_filter=None, start_new_session=False,
+                         **rotation):
+    """
+    Starts a process with its stdout and stderr written to a rotating, compressed log.
+
+    Args:
+        command (list): Command and arguments.
+        path (str): Log file path.
+        log (Logger, optional): Logger instance used for logging.
+        timestamp_lines (bool): Prefix every line with its arrival time (see LogPump).
+        stream_filter (object, optional): Output filter (see LogPump).
+        start_new_session (bool): Run the process in its own session and process group, so it can be
+            signalled together with its children.
+        **rotation: RotatingLogWriter options (max_bytes, max_age, compression, max_segments).
+
+    Returns:
+        tuple: (subprocess.Popen, LogPump). The pump finishes once the process exits;
+            join() it after stopping the process to flush the log.
+    """
+    writer = RotatingLogWriter(path, log=log, **rotation)
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   start_new_session=start_new_session)
+    except OSError:
+        writer.close()
+        raise
+    pump = LogPump(process.stdout, writer, log=log, timestamp_lines=timestamp_lines, stream_filter=stream_filter)
+    pump.start()
+    return process, pump
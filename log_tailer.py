@@ -0,0 +1,191 @@
+import os
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer
+
+
+class LogChange:
+
+    """
+    Change of one log file between two tailer ticks.
+
+    Attributes:
+        path: log file path.
+        previous_size: size at the previous tick, None if the file did not exist.
+        size: current size, None if the file no longer exists.
+        replaced: True if the path now names a different file (rotated or recreated).
+    """
+
+    __slots__ = ("path", "previous_size", "size", "replaced")
+
+    def __init__(self, path, previous_size, size, replaced):
+        self.path = path
+        self.previous_size = previous_size
+        self.size = size
+        self.replaced = replaced
+
+    @property
+    def appended(self):
+        """
+        Bytes appended since the previous tick, None if the file was replaced or truncated.
+        """
+        if self.replaced or self.size is None or self.previous_size is None or self.size < self.previous_size:
+            return None
+        return self.size - self.previous_size
+
+    def __repr__(self):
+        return ('LogChange(path = %r, previous_size = %r, size = %r, replaced = %r)'
+                ) % (self.path, self.previous_size, self.size, self.replaced)
+
+
+class _Subscription:
+
+    __slots__ = ("paths", "callback", "owner")
+
+    def __init__(self, paths, callback, owner):
+        self.paths = paths
+        self.callback = callback
+        self.owner = owner
+
+
+class LogTailer(QObject):
+
+    """
+    Single service watching every session log file for its subscribers.
+
+    Files are checked with one stat() each per tick, at refresh_hz (20 Hz by
+    default), however often the daemons write to them. All changes seen in a
+    tick are coalesced and each subscriber is called at most once per tick with
+    the LogChange list of its files, so UI work is bounded by the refresh rate
+    rather than the traffic rate. Unlike QFileSystemWatcher, a file that is
+    rotated or created later keeps being followed. The timer only runs while
+    there are subscribers.
+
+    Subscribers are plain callables, which Qt does not disconnect when their
+    widget is deleted. A subscription with an owner QObject therefore ends
+    when the owner is destroyed, as a signal connection would.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls, refresh_hz=20):
+        """
+        Returns the application wide tailer, creating it on first use.
+
+        Args:
+            refresh_hz (int): Ticks per second of a newly created tailer.
+
+        Returns:
+            LogTailer: The shared tailer.
+        """
+        if cls._instance is None:
+            cls._instance = cls(refresh_hz)
+        return cls._instance
+
+    def __init__(self, refresh_hz=20, parent=None):
+        """
+        Initializes the tailer.
+
+        Args:
+            refresh_hz (int): Ticks per second.
+            parent (QObject, optional): Parent object.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.files = {}
+        self.subscriptions = []
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.set_refresh_rate(refresh_hz)
+
+    def set_refresh_rate(self, refresh_hz):
+        """
+        Changes the number of ticks per second.
+
+        Args:
+            refresh_hz (int): Ticks per second.
+        returns:
+            None
+        """
+        self.timer.setInterval(max(int(1000 / refresh_hz), 1))
+
+    def subscribe(self, paths, callback, owner=None):
+        """
+        Calls callback with a list of LogChange objects whenever some of the files change.
+
+        Subscribers read what they need from the files themselves; the first
+        call comes at the first change after subscribing.
+
+        Args:
+            paths (list): Log file paths; files that do not exist yet are reported once created.
+            callback (callable): Called with the changes of one tick.
+            owner (QObject, optional): Object the callback works on (e.g. the widget); the
+                subscription ends when it is destroyed.
+
+        Returns:
+            object: Subscription to pass to unsubscribe().
+        """
+        subscription = _Subscription([path for path in paths if path], callback, owner)
+        if owner is not None:
+            owner.destroyed.connect(lambda _=None, subscription=subscription: self.unsubscribe(subscription))
+        for path in subscription.paths:
+            if path not in self.files:
+                self.files[path] = self._stat(path)
+        self.subscriptions.append(subscription)
+        if not self.timer.isActive():
+            self.timer.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Stops the calls of a subscription; files nobody watches any more are dropped.
+
+        Args:
+            subscription (object): Value returned by subscribe().
+        returns:
+            None
+        """
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        watched = {path for remaining in self.subscriptions for path in remaining.paths}
+        for path in list(self.files):
+            if path not in watched:
+                del self.files[path]
+        if not self.subscriptions:
+            self.timer.stop()
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_ino, stat.st_mtime_ns
+
+    def poll(self):
+        """
+        Checks the watched files once and notifies the subscribers of changed ones.
+
+        args: None
+        returns: None
+        """
+        changes = {}
+        for path, previous in self.files.items():
+            current = self._stat(path)
+            if current == previous:
+                continue
+            self.files[path] = current
+            replaced = previous is not None and current is not None and current[1] != previous[1]
+            changes[path] = LogChange(path, previous[0] if previous else None, current[0] if current else None,
+                                      replaced)
+        if not changes:
+            return
+        for subscription in list(self.subscriptions):
+            if subscription.owner is not None and sip.isdeleted(subscription.owner):
+                self.unsubscribe(subscription)
+                continue
+            delta = [changes[path] for path in subscription.paths if path in changes]
+            if delta:
+                subscription.callback(delta)
@@ -0,0 +1,207 @@
+import argparse
+import heapq
+import os
+import sys
+import time
+
+from Backend_lib.Linux.hcidump import timestamp_re, parse_timestamp
+from Backend_lib.Linux.log_reader import LineIndex
+from Backend_lib.Linux.log_rotation import iter_lines
+
+
+def source_label(path):
+    """
+    Short label for a log file, its name without the .log extension (e.g. 'bluetoothd', 'hci0_hcidump').
+    """
+    name = os.path.basename(path)
+    return name[:-4] if name.endswith(".log") else name
+
+
+class _SourceClock:
+
+    """
+    Assigns a timeline key to each line of one source.
+
+    Lines starting with a timestamp (hcidump -t, or the arrival time LogPump
+    adds to bluetoothd and pulseaudio output) set the source's clock; other
+    lines (hcidump payload and decoded lines, wrapped messages) take the time
+    of the last timestamped line. The key (timestamp, source, sequence) keeps
+    those continuation lines right after their first line in the merge.
+    """
+
+    __slots__ = ("source", "timestamp", "sequence")
+
+    def __init__(self, source):
+        self.source = source
+        self.timestamp = 0.0
+        self.sequence = 0
+
+    def entry(self, line):
+        match = timestamp_re.match(line)
+        if match:
+            self.timestamp = parse_timestamp(match.group(1))
+        self.sequence += 1
+        return self.timestamp, self.source, self.sequence, line
+
+
+def iter_source(path, source):
+    """
+    Iterates the timeline entries of one log, across its rotated segments.
+
+    Args:
+        path (str): Log file path.
+        source (int): Source number stored in the entries.
+
+    Yields:
+        tuple: (timestamp, source, sequence, line) entries in file order.
+    """
+    clock = _SourceClock(source)
+    for line in iter_lines(path):
+        yield clock.entry(line.rstrip("\n"))
+
+
+def merge_logs(paths):
+    """
+    Merges logs into one time-ordered stream.
+
+    Each log is read lazily and the logs are k-way merged on their
+    timestamps, so memory use does not depend on the log sizes.
+
+    Args:
+        paths (list): Log file paths; the source number of an entry is the position of its log.
+
+    Returns:
+        iterator: (timestamp, source, sequence, line) entries in time order.
+    """
+    return heapq.merge(*(iter_source(path, source) for source, path in enumerate(paths)))
+
+
+def format_entry(entry, labels):
+    """
+    Formats a timeline entry as '[label] line'.
+
+    Args:
+        entry (tuple): (timestamp, source, sequence, line).
+        labels (list): Source labels.
+
+    Returns:
+        str: The formatted line.
+    """
+    return f"[{labels[entry[1]]}] {entry[3]}"
+
+
+def export_timeline(paths, output, after=None, before=None):
+    """
+    Writes the merged timeline of logs to a file.
+
+    Args:
+        paths (list): Log file paths.
+        output (str | file object): Output path or writable text stream.
+        after (float, optional): Skip entries before this Unix time.
+        before (float, optional): Stop at entries after this Unix time.
+
+    Returns:
+        int: Number of lines written.
+    """
+    labels = [source_label(path) for path in paths]
+    fp = open(output, "w") if isinstance(output, str) else output
+    written = 0
+    try:
+        for entry in merge_logs(paths):
+            if after is not None and entry[0] < after:
+                continue
+            if before is not None and entry[0] > before:
+                break
+            fp.write(format_entry(entry, labels) + "\n")
+            written += 1
+    finally:
+        if fp is not output:
+            fp.close()
+    return written
+
+
+class TimelineFollower:
+
+    """
+    Follows growing logs and returns their new lines as time-ordered timeline entries.
+
+    Only the lines appended since the last poll() are read. Lines of a poll
+    are merged with each other, but a log that flushes late (hcidump output
+    is block buffered) can return entries older than ones already returned;
+    consumers insert entries by key rather than append them. After a log
+    rotates, following continues in the new active file.
+    """
+
+    def __init__(self, paths, block_lines=4096):
+        """
+        Initializes the follower; logs that do not exist yet are picked up once created.
+
+        Args:
+            paths (list): Log file paths; the source number of an entry is the position of its log.
+            block_lines (int): Lines read from disk per step.
+        """
+        self.paths = list(paths)
+        self.labels = [source_label(path) for path in self.paths]
+        self.block_lines = block_lines
+        self.lines = [LineIndex(path) for path in self.paths]
+        self.clocks = [_SourceClock(source) for source in range(len(self.paths))]
+        self.processed = [0] * len(self.paths)
+        self.generations = [0] * len(self.paths)
+
+    def poll(self):
+        """
+        Reads the lines appended to the logs since the last call.
+
+        Returns:
+            list: New (timestamp, source, sequence, line) entries in time order.
+        """
+        batches = []
+        for source, lines in enumerate(self.lines):
+            lines.update()
+            if lines.generation != self.generations[source]:
+                # Rotated or truncated: start over in the new file, the clock and sequence carry on
+                self.generations[source] = lines.generation
+                self.processed[source] = 0
+            clock = self.clocks[source]
+            batch = []
+            while self.processed[source] < len(lines):
+                block = lines.read_lines(self.processed[source], self.block_lines)
+                batch.extend(clock.entry(line) for line in block)
+                self.processed[source] += len(block)
+            if batch:
+                batches.append(batch)
+        if len(batches) == 1:
+            return batches[0]
+        return list(heapq.merge(*batches))
+
+    def close(self):
+        for lines in self.lines:
+            lines.close()
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Example:
+        python -m Backend_lib.Linux.log_timeline logs/bluetoothd.log logs/pulseaudio.log logs/hci0_hcidump.log
+        python -m Backend_lib.Linux.log_timeline logs/*.log -o timeline.log --after "2024-05-01 10:00:00"
+    """
+    parser = argparse.ArgumentParser(description="Merge bluetoothd, pulseaudio and hcidump logs into one timeline")
+    parser.add_argument("logs", nargs="+", help="log files (rotated segments are included)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default stdout)")
+    parser.add_argument("--after", help="first time to include, 'YYYY-MM-DD HH:MM:SS'")
+    parser.add_argument("--before", help="last time to include, 'YYYY-MM-DD HH:MM:SS'")
+    args = parser.parse_args(argv)
+
+    after, before = (time.mktime(time.strptime(value, "%Y-%m-%d %H:%M:%S")) if value else None
+                     for value in (args.after, args.before))
+    output = sys.stdout if args.output == "-" else args.output
+    written = export_timeline(args.logs, output, after, before)
+    if output is not sys.stdout:
+        print(f"{written} lines written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
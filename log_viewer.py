@@ -0,0 +1,191 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QListView, QAbstractItemView
+
+from Backend_lib.Linux.log_reader import LineIndex
+
+
+class LogLineModel(QAbstractListModel):
+
+    """
+    List model over the lines of a growing log file.
+
+    Rows come from a LineIndex of line offsets; only a bounded ring of lines is
+    kept in memory and anything else is read back from disk in blocks when the
+    view asks for it.
+    """
+
+    def __init__(self, path, cache_lines=5000, block_lines=256, parent=None):
+        """
+        Initializes the model.
+
+        Args:
+            path (str): Log file path.
+            cache_lines (int): Maximum number of lines held in memory.
+            block_lines (int): Lines read from disk per cache miss.
+            parent (QObject, optional): Parent object.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.lines = LineIndex(path)
+        self.cache_lines = cache_lines
+        self.block_lines = block_lines
+        self.cache = OrderedDict()
+        self.rows = 0
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self.line(index.row())
+
+    def line(self, row):
+        """
+        Returns one line, reading its surrounding block from disk on a cache miss.
+
+        Args:
+            row (int): Line number.
+
+        Returns:
+            str: The line.
+        """
+        text = self.cache.get(row)
+        if text is not None:
+            self.cache.move_to_end(row)
+            return text
+        start = max(row - self.block_lines // 2, 0)
+        for number, line in enumerate(self.lines.read_lines(start, self.block_lines), start):
+            self._remember(number, line)
+        return self.cache.get(row, "")
+
+    def _remember(self, row, text):
+        self.cache[row] = text
+        self.cache.move_to_end(row)
+        while len(self.cache) > self.cache_lines:
+            self.cache.popitem(last=False)
+
+    def refresh(self):
+        """
+        Picks up lines appended to the log since the last refresh.
+
+        Returns:
+            int: Number of new lines.
+        """
+        generation = self.lines.generation
+        new_lines = self.lines.update()
+        if self.lines.generation != generation:
+            self.beginResetModel()
+            self.cache.clear()
+            self.rows = 0
+            self.endResetModel()
+        if not new_lines:
+            return 0
+        first = len(self.lines) - new_lines
+        # The newest lines are what a following view shows next, keep them in the ring
+        tail = min(new_lines, self.cache_lines)
+        for number, line in enumerate(self.lines.read_lines(len(self.lines) - tail, tail), len(self.lines) - tail):
+            self._remember(number, line)
+        self.beginInsertRows(QModelIndex(), first, len(self.lines) - 1)
+        self.rows = len(self.lines)
+        self.endInsertRows()
+        return new_lines
+
+    def close(self):
+        """
+        Closes the underlying log file.
+
+        args: None
+        returns: None
+        """
+        self.lines.close()
+
+
+class LogViewer(QListView):
+
+    """
+    Read-only log view that follows the end of the file while scrolled to the bottom.
+    """
+
+    def __init__(self, path, cache_lines=5000, parent=None):
+        """
+        Initializes the viewer.
+
+        Args:
+            path (str): Log file path.
+            cache_lines (int): Maximum number of lines held in memory.
+            parent (QWidget, optional): Parent widget.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.log_model = LogLineModel(path, cache_lines, parent=self)
+        self.setModel(self.log_model)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(500)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setFont(QFont("Monospace", 9))
+        self.scrollToBottom()
+
+    def refresh(self):
+        """
+        Loads new log lines and keeps the view at the end if it was there.
+
+        args: None
+        returns: None
+        """
+        scroll_bar = self.verticalScrollBar()
+        following = scroll_bar.value() >= scroll_bar.maximum()
+        if self.log_model.refresh() and following:
+            self.scrollToBottom()
+
+    def scroll_to_line(self, row):
+        """
+        Selects a line and scrolls it to the middle of the view.
+
+        Args:
+            row (int): Line number.
+        returns:
+            None
+        """
+        index = self.log_model.index(row)
+        self.setCurrentIndex(index)
+        self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def find_text(self, text, after_row=-1, block_lines=4096):
+        """
+        Finds the next line containing a text, wrapping around to the start.
+
+        Args:
+            text (str): Text to look for, case-insensitive.
+            after_row (int): Search starts on the line after this one.
+            block_lines (int): Lines read from disk per step.
+
+        Returns:
+            int: Line number of the match, None if no line contains the text.
+        """
+        wanted = text.lower()
+        lines = self.log_model.lines
+        total = self.log_model.rowCount()
+        for start, stop in ((after_row + 1, total), (0, after_row + 1)):
+            row = start
+            while row < stop:
+                block = lines.read_lines(row, min(block_lines, stop - row))
+                if not block:
+                    break
+                for number, line in enumerate(block, row):
+                    if wanted in line.lower():
+                        return number
+                row += len(block)
+        return None
+
+    def closeEvent(self, event):
+        self.log_model.close()
+        super().closeEvent(event)
@@ -0,0 +1,384 @@
+import atexit
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+from Backend_lib.Linux.log_rotation import start_logged_process
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def terminate_pids(pids, timeout=2.0):
+    """
+    Stops processes that are not our children: SIGTERM to all of them at once, SIGKILL to those still alive
+    after the grace period.
+
+    Args:
+        pids (list): Process ids.
+        timeout (float): Grace period in seconds, shared by all the processes.
+
+    Returns:
+        list: Process ids that had to be killed.
+    """
+    pending = set()
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            pending.add(pid)
+        except (ProcessLookupError, PermissionError):
+            pass
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        time.sleep(0.05)
+        pending = {pid for pid in pending if _pid_alive(pid)}
+    for pid in pending:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    return sorted(pending)
+
+
+def kill_matching(pattern, timeout=2.0):
+    """
+    Stops stray processes whose command line matches a pattern (pgrep -f), e.g. left over by an earlier session.
+
+    Args:
+        pattern (str): pgrep -f pattern.
+        timeout (float): Grace period in seconds before SIGKILL.
+
+    Returns:
+        list: Process ids that were signalled.
+    """
+    result = subprocess.run(["pgrep", "-f", pattern], capture_output=True, text=True)
+    pids = [int(pid) for pid in result.stdout.split() if int(pid) != os.getpid()]
+    if pids:
+        terminate_pids(pids, timeout)
+    return pids
+
+
+class ManagedProcess:
+
+    """
+    A child process owned by the ProcessSupervisor, with the options needed to start it again.
+
+    Attributes:
+        name: Supervisor key, e.g. 'bluetoothd' or 'hcidump-hci0'.
+        process: The subprocess.Popen of the current run.
+        pump: LogPump copying the output to log_path, None for unlogged processes.
+        restart: Whether the supervisor restarts the process when it exits on its own.
+        restarts: Number of restarts so far.
+    """
+
+    def __init__(self, name, command, log_path=None, restart=False, shell=False, logging_options=None):
+        self.name = name
+        self.command = command
+        self.log_path = log_path
+        self.restart = restart
+        self.shell = shell
+        self.logging_options = logging_options or {}
+        self.process = None
+        self.pump = None
+        self.started = None
+        self.restarts = 0
+        self.restart_times = deque()
+        self.restart_at = None
+        self.stopping = False
+        self.reported = False
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def fds(self):
+        """
+        Returns:
+            list: File descriptors this process holds open: the output pipe and the log file.
+        """
+        fds = []
+        if self.pump is not None:
+            if not self.pump.stream.closed:
+                fds.append(self.pump.stream.fileno())
+            fp = self.pump.writer.fp
+            if fp is not None and not fp.closed:
+                fds.append(fp.fileno())
+        return fds
+
+    def status(self):
+        """
+        Returns:
+            dict: Name, pid, state, exit status, restarts, uptime and open file descriptors.
+        """
+        running = self.running()
+        return {"name": self.name, "pid": self.pid, "running": running,
+                "exit_status": None if running or self.process is None else self.process.returncode,
+                "restarts": self.restarts, "uptime_s": time.monotonic() - self.started if running else 0.0,
+                "fds": self.fds(), "log": self.log_path}
+
+
+class ProcessSupervisor:
+
+    """
+    Owns every child process the application starts (daemons, loggers, helpers).
+
+    Each process runs in its own process group, so stopping it also stops the
+    children it forked. stop_all() signals every process at once and waits
+    for all of them within one grace period before killing the rest, so
+    teardown takes at most the grace period however many controllers are
+    logged. Processes started with restart=True are restarted with an
+    exponential backoff when they exit on their own, unless they crash more
+    than max_restarts times within restart_window seconds.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, log=None, poll_interval=0.5, restart_delay=1.0, max_restarts=5, restart_window=60.0):
+        """
+        Initializes the supervisor.
+
+        Args:
+            log (Logger, optional): Logger instance used for logging.
+            poll_interval (float): Seconds between checks for exited processes.
+            restart_delay (float): Delay before the first restart; doubled on each restart within the window.
+            max_restarts (int): Restarts allowed within restart_window before giving up on a process.
+            restart_window (float): Seconds over which restarts are counted.
+        """
+        self.log = log
+        self.poll_interval = poll_interval
+        self.restart_delay = restart_delay
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.processes = {}
+        self.lock = threading.RLock()
+        self.stop_event = threading.Event()
+        self.monitor = None
+
+    @classmethod
+    def get_instance(cls, log=None):
+        """
+        Returns the application-wide supervisor, creating it on first use.
+
+        Its processes are stopped when the interpreter exits.
+
+        Args:
+            log (Logger, optional): Logger used if the supervisor is created by this call.
+
+        Returns:
+            ProcessSupervisor: The shared supervisor.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(log)
+                atexit.register(cls._instance.shutdown)
+            elif cls._instance.log is None:
+                cls._instance.log = log
+            return cls._instance
+
+    def _info(self, message):
+        if self.log:
+            self.log.info(message)
+
+    def start(self, name, command, log_path=None, restart=False, shell=False, **logging_options):
+        """
+        Starts a process, stopping a running process of the same name first.
+
+        Args:
+            name (str): Unique name of the process.
+            command (list | str): Command and arguments (a string with shell=True).
+            log_path (str, optional): Rotating log receiving stdout and stderr; discarded if omitted.
+            restart (bool): Restart the process when it exits without being stopped.
+            shell (bool): Run the command through the shell (unlogged processes only).
+            **logging_options: start_logged_process options (timestamp_lines, stream_filter, max_bytes, ...).
+
+        Returns:
+            ManagedProcess: The started process.
+
+        Raises:
+            OSError: If the process cannot be started.
+        """
+        self.stop(name)
+        managed = ManagedProcess(name, command, log_path, restart, shell, logging_options)
+        self._spawn(managed)
+        with self.lock:
+            self.processes[name] = managed
+            if self.monitor is None:
+                self.monitor = threading.Thread(target=self._monitor, name="process-supervisor", daemon=True)
+                self.monitor.start()
+        self._info(f"[INFO] Started {name} (pid {managed.pid})")
+        return managed
+
+    def _spawn(self, managed):
+        if managed.log_path:
+            managed.process, managed.pump = start_logged_process(
+                managed.command, managed.log_path, self.log, start_new_session=True, **managed.logging_options)
+        else:
+            managed.process = subprocess.Popen(managed.command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                               stderr=subprocess.DEVNULL, shell=managed.shell,
+                                               start_new_session=True)
+        managed.started = time.monotonic()
+
+    def get(self, name):
+        """
+        Returns:
+            ManagedProcess: The process of that name, None if there is none.
+        """
+        with self.lock:
+            return self.processes.get(name)
+
+    def is_running(self, name):
+        managed = self.get(name)
+        return managed is not None and managed.running()
+
+    def status(self):
+        """
+        Returns:
+            list: status() of every supervised process.
+        """
+        with self.lock:
+            return [managed.status() for managed in self.processes.values()]
+
+    @staticmethod
+    def _signal(managed, sig):
+        try:
+            os.killpg(managed.process.pid, sig)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            managed.process.send_signal(sig)
+
+    def stop(self, name, timeout=5.0):
+        """
+        Stops a process and the children in its process group.
+
+        Args:
+            name (str): Process name.
+            timeout (float): Grace period after SIGTERM before SIGKILL.
+
+        Returns:
+            bool: True if a process of that name was supervised.
+        """
+        return bool(self.stop_many([name], timeout))
+
+    def stop_many(self, names, timeout=5.0):
+        """
+        Stops several processes in parallel: all are sent SIGTERM, then waited for within one shared grace
+        period, and those still running get SIGKILL. Their logs are then flushed and closed.
+
+        Args:
+            names (list): Process names; unknown names are ignored.
+            timeout (float): Grace period in seconds, shared by all the processes.
+
+        Returns:
+            dict: Name -> exit status of the stopped processes.
+        """
+        with self.lock:
+            stopping = [self.processes.pop(name) for name in names if name in self.processes]
+        if not stopping:
+            return {}
+        begin = time.monotonic()
+        deadline = begin + timeout
+        for managed in stopping:
+            managed.stopping = True
+            if managed.running():
+                self._signal(managed, signal.SIGTERM)
+        pending = [managed for managed in stopping if managed.running()]
+        while pending and time.monotonic() < deadline:
+            time.sleep(0.02)
+            pending = [managed for managed in pending if managed.running()]
+        for managed in pending:
+            self._info(f"[WARN] {managed.name} did not exit within {timeout} s, killing it")
+            self._signal(managed, signal.SIGKILL)
+        statuses = {}
+        for managed in stopping:
+            managed.process.wait()
+            statuses[managed.name] = managed.process.returncode
+        for managed in stopping:
+            if managed.pump is not None:
+                managed.pump.join(timeout=max(deadline - time.monotonic(), 1.0))
+                if managed.pump.is_alive():
+                    self._info(f"[WARN] Output of {managed.name} is still open, its log may be incomplete")
+        self._info(f"[INFO] Stopped {', '.join(statuses)} in {time.monotonic() - begin:.2f} s")
+        return statuses
+
+    def stop_all(self, timeout=5.0):
+        """
+        Stops every supervised process in parallel (see stop_many).
+
+        Returns:
+            dict: Name -> exit status of the stopped processes.
+        """
+        with self.lock:
+            names = list(self.processes)
+        return self.stop_many(names, timeout)
+
+    def shutdown(self, timeout=5.0):
+        """
+        Stops every process and the restart monitor.
+
+        args: timeout (float): Grace period in seconds.
+        returns: None
+        """
+        self.stop_event.set()
+        self.stop_all(timeout)
+
+    def _monitor(self):
+        while not self.stop_event.wait(self.poll_interval):
+            with self.lock:
+                exited = [managed for managed in self.processes.values()
+                          if not managed.stopping and not managed.reported and managed.process.poll() is not None]
+            for managed in exited:
+                self._handle_exit(managed)
+
+    def _handle_exit(self, managed):
+        now = time.monotonic()
+        if managed.restart_at is None:
+            if managed.pump is not None:
+                managed.pump.join(timeout=1.0)
+            if not managed.restart:
+                self._info(f"[WARN] {managed.name} exited with status {managed.process.returncode}")
+                managed.reported = True
+                return
+            while managed.restart_times and managed.restart_times[0] < now - self.restart_window:
+                managed.restart_times.popleft()
+            if len(managed.restart_times) >= self.max_restarts:
+                self._info(f"[ERROR] {managed.name} exited with status {managed.process.returncode} "
+                           f"{self.max_restarts} times within {self.restart_window:.0f} s, not restarting it")
+                managed.restart = False
+                managed.reported = True
+                return
+            delay = self.restart_delay * 2 ** len(managed.restart_times)
+            managed.restart_at = now + delay
+            self._info(f"[WARN] {managed.name} exited with status {managed.process.returncode}, "
+                       f"restarting in {delay:.1f} s")
+            return
+        if now < managed.restart_at:
+            return
+        with self.lock:
+            if managed.stopping or self.processes.get(managed.name) is not managed:
+                return
+            managed.restart_at = None
+            managed.restart_times.append(now)
+            managed.restarts += 1
+            try:
+                self._spawn(managed)
+            except OSError as e:
+                self._info(f"[ERROR] Failed to restart {managed.name}: {e}")
+                managed.restart = False
+                managed.reported = True
+                return
+        self._info(f"[INFO] Restarted {managed.name} (pid {managed.pid}, restart {managed.restarts})")
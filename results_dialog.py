@@ -0,0 +1,46 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton, QLabel
+
+
+class ResultsTableDialog(QDialog):
+
+    """
+    Dialog showing one row per controller for a multi-controller operation.
+    """
+
+    def __init__(self, title, headers, rows, summary=None, parent=None):
+        """
+        Initializes the dialog.
+
+        Args:
+            title (str): Window title.
+            headers (list[str]): Column headers.
+            rows (list[list]): Table rows; values are converted to text.
+            summary (str, optional): Line shown above the table.
+            parent (QWidget, optional): Parent widget.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumSize(800, 400)
+        layout = QVBoxLayout()
+
+        if summary:
+            summary_label = QLabel(summary)
+            summary_label.setStyleSheet("color: black; font-weight: bold;")
+            layout.addWidget(summary_label)
+
+        table = QTableWidget(len(rows), len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        for row_index, row in enumerate(rows):
+            for column_index, value in enumerate(row):
+                table.setItem(row_index, column_index, QTableWidgetItem("" if value is None else str(value)))
+        table.resizeRowsToContents()
+        layout.addWidget(table)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+        self.setLayout(layout)
@@ -4,24 +4,59 @@ import subprocess
 import threading
 import time
 
-from PyQt6.QtWidgets import (QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QTextEdit,
-                             QScrollArea, QWidget, QListWidget, QComboBox, QTreeWidget, QTreeWidgetItem, QGridLayout)
-from PyQt6.QtCore import Qt, QFileSystemWatcher
+from PyQt6.QtWidgets import (QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QTextEdit, QFileDialog, QTabWidget,
+                             QTableView, QHeaderView, QLineEdit, QScrollArea, QWidget, QListWidget, QComboBox, QTreeWidget,
+                             QTreeWidgetItem, QGridLayout)
+from PyQt6.QtCore import Qt
 
 import style_sheet as ss
 from logger import Logger
 
 from Backend_lib.Linux import hci_commands as hci
+from Backend_lib.Linux import hci_transport
 from utils import run,keep_l2cap_connection_alive, start_dump_logs, run_hci_cmd, get_connection_handles
+from utils import get_controllers_connected, run_hci_cmd_on_controllers, start_btsnoop_capture, set_capture_filter
+from Backend_lib.Linux.hci_events import status_text
+from Backend_lib.Linux.hci_script import load_script, run_script, run_script_on_controllers
+from Backend_lib.Linux.log_index import HciLogIndex, LogIndexer, parse_query
+from Backend_lib.Linux.hci_filter import parse_filter
+from UI_lib.results_dialog import ResultsTableDialog
+from UI_lib.background_task import BackgroundTask
+from UI_lib.log_viewer import LogViewer
+from UI_lib.log_tailer import LogTailer
+from UI_lib.hci_decode_worker import HciRecordModel, start_decode_worker, stop_decode_worker
+from UI_lib.hci_stats_panel import HciStatsPanel
 from Backend_lib.Linux.bluez import BluetoothDeviceManager
 
+
+def _stop_background_work(background):
+    """
+    Stops the background work recorded for a TestControllerUI screen, each item once.
+
+    Args:
+        background (dict): Optional "log_subscription", "decoder" ((worker, thread)) and "indexer" entries;
+            each is removed as it is stopped.
+    returns:
+        None
+    """
+    subscription = background.pop("log_subscription", None)
+    if subscription:
+        LogTailer.get_instance().unsubscribe(subscription)
+    decoder = background.pop("decoder", None)
+    if decoder:
+        stop_decode_worker(*decoder)
+    indexer = background.pop("indexer", None)
+    if indexer:
+        indexer.stop()
+
+
 class TestControllerUI(QWidget):
 
     """
     UI component for displaying and executing HCI commands for a Bluetooth controller.
 
     Allows dynamic construction of command parameter inputs, executes commands through a backend controller,
-    and displays real-time HCI dump logs using QFileSystemWatcher.
+    and displays real-time HCI dump logs in a LogViewer refreshed by the shared LogTailer.
     """
 
     def __init__(self, interface=None, back_callback=None, log_path=None):
@@ -56,9 +91,29 @@ class TestControllerUI(QWidget):
         self.empty_list = None
         self.logs_layout = None
         self.dump_log_output = None
-        self.file_watcher = None
+        self.log_subscription = None
+        self.command_result_output = None
+        self.decoded_model = None
+        self.decoded_view = None
+        self.decode_worker = None
+        self.decode_thread = None
+        self.dump_log_index = None
+        self.dump_log_indexer = None
+        # Background work to stop when the screen goes away, keyed for _stop_background_work
+        self.background = {}
+        self.log_search_input = None
+        self.log_search_status = None
+        self.capture_filter_input = None
+        self.hci_stats_panel = None
+        self.capture_filter_status = None
+        self.controllers_task = None
+        self.script_task = None
+        self.script_run = None
 
         self.controller_ui()
+        # setCentralWidget deletes the screen on navigation without a closeEvent; the lambda holds
+        # the resources, not the screen, so they outlive its Python wrapper until they are stopped
+        self.destroyed.connect(lambda _=None, background=self.background: _stop_background_work(background))
 
     def controller_ui(self):
         """
@@ -91,8 +146,20 @@ class TestControllerUI(QWidget):
         self.commands_list_tree_widget.clicked.connect(self.run_hci_cmd)
 
         vertical_layout.addWidget(self.commands_list_tree_widget, 0, 0)
+
+        run_script_btn = QPushButton("Run Script")
+        run_script_btn.setStyleSheet("font-size: 16px; padding: 6px;")
+        run_script_btn.clicked.connect(self.run_hci_script)
+        vertical_layout.addWidget(run_script_btn, 1, 0)
+
+        run_script_all_btn = QPushButton("Run Script on all controllers")
+        run_script_all_btn.setStyleSheet("font-size: 16px; padding: 6px;")
+        run_script_all_btn.clicked.connect(self.run_hci_script_on_all_controllers)
+        vertical_layout.addWidget(run_script_all_btn, 2, 0)
+
         vertical_layout.setRowStretch(0, 1)
         vertical_layout.setRowStretch(1, 1)
+        vertical_layout.setRowStretch(2, 1)
         main_layout.addLayout(vertical_layout, 0, 0)
 
         # Middle column: Input area for selected command parameters
@@ -109,24 +176,75 @@ class TestControllerUI(QWidget):
         logs_label.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         self.logs_layout.addWidget(logs_label)
 
-        self.dump_log_output = QTextEdit()
-        self.dump_log_output.setReadOnly(True)
-        self.dump_log_output.setStyleSheet("background: transparent;color: black;border: 2px solid black;")
-
         # Start HCI dump logging
         self.hcidump_log_name = start_dump_logs(self.interface, self.log, self.log_path)
         self.log_file_path = self.hcidump_log_name
-        self.log_file_fd = open(self.log_file_path, "r")
 
-        if self.log_file_fd:
-            content = self.log_file_fd.read()
-            self.dump_log_output.append(content)
-            self.file_position = self.log_file_fd.tell()
+        self.dump_log_output = LogViewer(self.log_file_path)
+        self.dump_log_output.setStyleSheet("background: transparent;color: black;border: 2px solid black;")
 
-        self.file_watcher = QFileSystemWatcher()
-        self.file_watcher.addPath(self.log_file_path)
-        self.file_watcher.fileChanged.connect(self.update_log)
-        self.logs_layout.addWidget(self.dump_log_output)
+        self.log_subscription = LogTailer.get_instance().subscribe([self.log_file_path], self.update_log, owner=self)
+        self.background["log_subscription"] = self.log_subscription
+
+        # Decoded view of the binary capture, decoded in a worker thread
+        self.decoded_model = HciRecordModel(parent=self)
+        self.decoded_view = QTableView()
+        self.decoded_view.setModel(self.decoded_model)
+        self.decoded_view.setStyleSheet("background: transparent;color: black;border: 2px solid black;")
+        self.decoded_view.verticalHeader().setVisible(False)
+        self.decoded_view.verticalHeader().setDefaultSectionSize(18)
+        self.decoded_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.decoded_view.horizontalHeader().setStretchLastSection(True)
+        self.decoded_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+
+        # Live statistics of the same capture, computed by the decode worker
+        self.hci_stats_panel = HciStatsPanel(self.log_path)
+
+        capture_path = start_btsnoop_capture(self.interface, self.log, self.log_path)
+        if capture_path:
+            self.decode_worker, self.decode_thread = start_decode_worker(capture_path)
+            self.decode_worker.records_decoded.connect(self.add_decoded_records)
+            self.decode_worker.statistics_updated.connect(self.hci_stats_panel.update_snapshot)
+            self.background["decoder"] = (self.decode_worker, self.decode_thread)
+
+        # Search over the dump log, answered from a frame index built in the background as the log grows
+        self.dump_log_index = HciLogIndex(self.log_file_path)
+        self.dump_log_indexer = LogIndexer(self.dump_log_index, self.log)
+        self.background["indexer"] = self.dump_log_indexer
+        search_layout = QHBoxLayout()
+        self.log_search_input = QLineEdit()
+        self.log_search_input.setPlaceholderText("text, or e.g. name:Disconnection Complete handle:0x0040 after:14:02:11")
+        self.log_search_input.setStyleSheet("color: black; border: 2px solid black;")
+        self.log_search_input.returnPressed.connect(self.search_dump_log)
+        search_layout.addWidget(self.log_search_input)
+        search_btn = QPushButton("Find")
+        search_btn.clicked.connect(self.search_dump_log)
+        search_layout.addWidget(search_btn)
+        self.log_search_status = QLabel("")
+        self.log_search_status.setStyleSheet("color: black;")
+        search_layout.addWidget(self.log_search_status)
+        self.logs_layout.addLayout(search_layout)
+
+        # Capture filter, applied to the hcidump log and btsnoop capture before packets are written
+        filter_layout = QHBoxLayout()
+        self.capture_filter_input = QLineEdit()
+        self.capture_filter_input.setPlaceholderText("capture filter, e.g. exclude subevent:0x02,0x0d")
+        self.capture_filter_input.setStyleSheet("color: black; border: 2px solid black;")
+        self.capture_filter_input.returnPressed.connect(self.apply_capture_filter)
+        filter_layout.addWidget(self.capture_filter_input)
+        filter_btn = QPushButton("Apply")
+        filter_btn.clicked.connect(self.apply_capture_filter)
+        filter_layout.addWidget(filter_btn)
+        self.capture_filter_status = QLabel("")
+        self.capture_filter_status.setStyleSheet("color: black;")
+        filter_layout.addWidget(self.capture_filter_status)
+        self.logs_layout.addLayout(filter_layout)
+
+        logs_tabs = QTabWidget()
+        logs_tabs.addTab(self.dump_log_output, "Dump")
+        logs_tabs.addTab(self.decoded_view, "Decoded")
+        logs_tabs.addTab(self.hci_stats_panel, "Statistics")
+        self.logs_layout.addWidget(logs_tabs)
 
         # Add the logs_layout to the main_layout in column 2, row 0
         main_layout.addLayout(self.logs_layout, 0, 2)
@@ -146,7 +264,7 @@ class TestControllerUI(QWidget):
                         background-color: #333333;
                     }
                 """)
-        back_button.clicked.connect(self.back_callback)
+        back_button.clicked.connect(self.go_back)
 
         # Create a horizontal layout for the back button and align it to the right
         button_layout = QHBoxLayout()
@@ -161,19 +279,117 @@ class TestControllerUI(QWidget):
 
         self.setLayout(main_layout)
 
-    def update_log(self):
+    def update_log(self, changes=None):
         """
         Updates the log output widget when the log file changes.
 
+        Args:
+            changes (list, optional): LogChange objects of the tailer tick.
+        returns:
+            None
+        """
+        self.dump_log_output.refresh()
+        if self.dump_log_indexer:
+            self.dump_log_indexer.notify()
+
+    def search_dump_log(self):
+        """
+        Jumps to the next dump log line matching the search box, after the selected line.
+
+        'key:value' queries are answered from the frame index, anything else is a plain text search.
+        The index is kept current by the LogIndexer thread; lines it has not reached yet are not searched.
+
+        args: None
+        returns: None
+        """
+        text = self.log_search_input.text().strip()
+        if not text:
+            return
+        current = self.dump_log_output.currentIndex()
+        after_row = current.row() if current.isValid() else -1
+
+        self.dump_log_output.refresh()
+        try:
+            criteria = parse_query(text, self.dump_log_index.first_time())
+        except ValueError as e:
+            self.log_search_status.setText(str(e))
+            return
+
+        if criteria is None:
+            row = self.dump_log_output.find_text(text, after_row)
+            matches = None
+        else:
+            matches = self.dump_log_index.query(**criteria)
+            row = next((line for line in matches if line > after_row), matches[0] if matches else None)
+
+        indexing = " (indexing...)" if matches is not None and self.dump_log_indexer.busy() else ""
+        if row is None:
+            self.log_search_status.setText("No match" + indexing)
+            return
+        self.dump_log_output.scroll_to_line(row)
+        self.log_search_status.setText((f"{matches.index(row) + 1}/{len(matches)}" if matches else f"Line {row + 1}")
+                                       + indexing)
+
+    def apply_capture_filter(self):
+        """
+        Applies the capture filter box to the running hcidump log and btsnoop capture.
+
         args: None
         returns: None
         """
-        if not self.log_file_fd:
+        try:
+            capture_filter = parse_filter(self.capture_filter_input.text())
+        except ValueError as e:
+            self.capture_filter_status.setText(str(e))
             return
-        self.log_file_fd.seek(self.file_position)
-        content = self.log_file_fd.read()
-        self.file_position = self.log_file_fd.tell()
-        self.dump_log_output.append(content)
+        set_capture_filter(self.log, self.interface, capture_filter)
+        self.capture_filter_status.setText("Filtering" if capture_filter else "No filter")
+
+    def add_decoded_records(self, records):
+        """
+        Appends a batch of decoded records, following the end of the table while scrolled to the bottom.
+
+        Args:
+            records (list): HciRecord objects from the decode worker.
+        returns:
+            None
+        """
+        scroll_bar = self.decoded_view.verticalScrollBar()
+        following = scroll_bar.value() >= scroll_bar.maximum()
+        self.decoded_model.add_records(records)
+        if following:
+            self.decoded_view.scrollToBottom()
+
+    def go_back(self):
+        """
+        Stops the screen's background work and returns to the previous screen, which deletes this one.
+
+        args: None
+        returns: None
+        """
+        self.stop_background_work()
+        self.back_callback()
+
+    def stop_background_work(self):
+        """
+        Ends the log subscription and stops the decode worker thread and the dump log indexer.
+        Safe to call more than once; the hcidump log and btsnoop capture keep running.
+
+        args: None
+        returns: None
+        """
+        _stop_background_work(self.background)
+        self.log_subscription = None
+        self.decode_worker = None
+        self.decode_thread = None
+        self.dump_log_indexer = None
+
+    def closeEvent(self, event):
+        """
+        Stops the screen's background work when the widget is closed.
+        """
+        self.stop_background_work()
+        super().closeEvent(event)
 
     def run_hci_cmd(self, text_selected):
         """
@@ -254,6 +470,13 @@ class TestControllerUI(QWidget):
         execute_btn.clicked.connect(self.execute_hci_cmd)
         self.content_layout.addWidget(execute_btn)
 
+        execute_all_btn = QPushButton("Execute on all controllers")
+        execute_all_btn.setStyleSheet(
+            "font-size: 18px; color: white; background: transparent; padding: 10px;"
+        )
+        execute_all_btn.clicked.connect(self.execute_hci_cmd_on_all_controllers)
+        self.content_layout.addWidget(execute_all_btn)
+
         if parameters:
             reset_btn = QPushButton("Reset to default")
             reset_btn.setStyleSheet(
@@ -262,6 +485,12 @@ class TestControllerUI(QWidget):
             reset_btn.clicked.connect(self.reset_default_params)
             self.content_layout.addWidget(reset_btn)
 
+        self.command_result_output = QTextEdit()
+        self.command_result_output.setReadOnly(True)
+        self.command_result_output.setPlaceholderText("Command result")
+        self.command_result_output.setStyleSheet("background: transparent; color: black; border: 2px solid black;")
+        self.content_layout.addWidget(self.command_result_output)
+
         self.scroll.setWidget(self.content_widget)
         self.command_input_layout.addWidget(self.scroll)
 
@@ -305,12 +534,13 @@ class TestControllerUI(QWidget):
         run_hci_cmd(self.ocf, self.ogf, self.interface, self.log, parameters)'''
 
 
-    def execute_hci_cmd(self):
+    def get_command_parameters(self):
         """
-        Gathers parameters from the UI and sends the HCI command via the backend controller.
+        Gathers the parameter values entered for the selected HCI command.
 
         args: None
-        returns: None
+        Returns:
+            list: Parameter values, stopping at the first 'None'.
         """
         parameters = []
         handles = get_connection_handles(self.log, self.interface)
@@ -330,6 +560,16 @@ class TestControllerUI(QWidget):
 
         setattr(self, f"{self.ogf}_values", parameters)
         self.log.debug(f"{self.ocf=} {self.ogf=} {parameters=}")
+        return parameters
+
+    def execute_hci_cmd(self):
+        """
+        Gathers parameters from the UI and sends the HCI command via the backend controller.
+
+        args: None
+        returns: None
+        """
+        parameters = self.get_command_parameters()
 
         if self.ogf == "Create Connection":
             try:
@@ -346,7 +586,206 @@ class TestControllerUI(QWidget):
             except Exception as e:
                 self.log.error(f"[ERROR] L2CAP setup failed: {e}")
         else:
-            run_hci_cmd(self.ocf, self.ogf, self.interface, self.log, parameters)
+            result = run_hci_cmd(self.ocf, self.ogf, self.interface, self.log, parameters)
+            self.command_result_output.setPlainText(str(result.event) if result.event else
+                                                    result.stdout or result.stderr)
+
+    def _start_controllers_task(self, function, *args):
+        """
+        Runs a call across all controllers in a BackgroundTask so the GUI thread never waits for the slowest
+        controller. Only one such run is allowed at a time.
+
+        Args:
+            function (callable): Blocking call returning (results, elapsed seconds).
+            *args: Its arguments.
+
+        Returns:
+            BackgroundTask | None: The started task, None if one is still running.
+        """
+        if self.controllers_task is not None and self.controllers_task.is_running():
+            self._show_result_text("Still waiting for the previous run on all controllers")
+            return None
+        self.controllers_task = BackgroundTask(function, *args)
+        self.controllers_task.failed.connect(self._controllers_task_failed)
+        return self.controllers_task
+
+    def _controllers_task_failed(self, error):
+        self.log.error(f"[ERROR] Run on all controllers failed: {error}")
+        self._show_result_text(error)
+
+    def _show_result_text(self, text):
+        if self.command_result_output:
+            self.command_result_output.setPlainText(text)
+
+    @staticmethod
+    def _connected_interfaces(log):
+        """
+        Returns:
+            tuple: (interfaces ordered by device index, {interface: BD address}).
+        """
+        controllers = get_controllers_connected(log)
+        interfaces = sorted(controllers.values(), key=hci_transport.interface_index)
+        return interfaces, {interface: address for address, interface in controllers.items()}
+
+    def execute_hci_cmd_on_all_controllers(self):
+        """
+        Sends the selected HCI command to every connected controller in parallel,
+        in a worker thread, and shows the per-controller results and timings in
+        one table when all of them have answered.
+
+        args: None
+        returns: None
+        """
+        parameters = self.get_command_parameters()
+        interfaces, addresses = self._connected_interfaces(self.log)
+        ogf, command, log = self.ocf, self.ogf, self.log
+
+        def fan_out():
+            start = time.perf_counter()
+            results = run_hci_cmd_on_controllers(ogf, command, interfaces, log, parameters)
+            return results, time.perf_counter() - start
+
+        task = self._start_controllers_task(fan_out)
+        if task is None:
+            return
+        task.finished.connect(lambda outcome: self.show_all_controllers_results(command, addresses, *outcome))
+        self._show_result_text(f"{command}: running on {len(interfaces)} controllers...")
+        task.start()
+
+    def show_all_controllers_results(self, command, addresses, results, total):
+        """
+        Shows the results of execute_hci_cmd_on_all_controllers.
+
+        Args:
+            command (str): Command name.
+            addresses (dict): Interface -> BD address.
+            results (dict): Interface -> (Result, elapsed seconds).
+            total (float): Seconds for all the controllers.
+        returns:
+            None
+        """
+        rows = []
+        for interface, (result, elapsed) in results.items():
+            if result.event is not None:
+                status = status_text(result.event.status) if result.event.status is not None else "-"
+                details = str(result.event)
+            else:
+                status = "Failed" if result.exit_status else "Done"
+                details = result.stderr or result.stdout
+            rows.append([interface, addresses.get(interface), status, f"{elapsed * 1000:.2f}", details])
+
+        summary = f"{command}: {len(results)} controllers in {total * 1000:.1f} ms"
+        self._show_result_text(summary)
+        ResultsTableDialog("Execute on all controllers", ["Interface", "BD Address", "Status", "Time (ms)", "Result"],
+                           rows, summary=summary, parent=self).exec()
+
+    def run_hci_script(self):
+        """
+        Loads a JSON HCI script, runs it on the controller in one HCI session
+        in a worker thread and shows the per-step timing report when it ends.
+
+        args: None
+        returns: None
+        """
+        path, _ = QFileDialog.getOpenFileName(self, "Select HCI script", "", "HCI scripts (*.json)")
+        if not path:
+            return
+        if self.script_task is not None and self.script_task.is_running():
+            self._show_result_text("Still waiting for the previous script run")
+            return
+        try:
+            steps = load_script(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.log.error(f"[ERROR] Failed to load HCI script {path}: {e}")
+            return
+
+        name = os.path.basename(path)
+        self.script_run = (name, len(steps))
+        # Bound methods, so the task's signals are dropped if the screen is deleted before it finishes
+        self.script_task = BackgroundTask(run_script, self.interface, self.log, steps)
+        self.script_task.finished.connect(self.show_script_report)
+        self.script_task.failed.connect(self._script_task_failed)
+        self._show_result_text(f"{name}: running on {self.interface}...")
+        self.script_task.start()
+
+    def _script_task_failed(self, error):
+        self.log.error(f"[ERROR] Script run failed: {error}")
+        self._show_result_text(error)
+
+    def show_script_report(self, report):
+        """
+        Shows the per-step timing report of run_hci_script.
+
+        args: report (ScriptReport): Report of the run.
+        returns: None
+        """
+        name, total_steps = self.script_run
+        self._show_result_text(report.format())
+        if report.error is not None:
+            return
+        summary = (f"{name}: {len(report.steps)}/{total_steps} steps in "
+                   f"{report.elapsed * 1000:.1f} ms, {'PASS' if report.passed else 'FAIL'}")
+        ResultsTableDialog("Run Script", ["Step", "Command", "Sent at (ms)", "Latency (ms)", "Status", "Result"],
+                           report.rows(), summary=summary, parent=self).exec()
+
+    def run_hci_script_on_all_controllers(self):
+        """
+        Loads a JSON HCI script and runs it on every connected controller in
+        parallel, one HCI session each, in a worker thread; shows one row per
+        controller when all runs have finished.
+
+        args: None
+        returns: None
+        """
+        path, _ = QFileDialog.getOpenFileName(self, "Select HCI script", "", "HCI scripts (*.json)")
+        if not path:
+            return
+        try:
+            steps = load_script(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.log.error(f"[ERROR] Failed to load HCI script {path}: {e}")
+            return
+        interfaces, addresses = self._connected_interfaces(self.log)
+        log = self.log
+
+        def run_all():
+            start = time.perf_counter()
+            reports = run_script_on_controllers(interfaces, log, steps)
+            return reports, time.perf_counter() - start
+
+        task = self._start_controllers_task(run_all)
+        if task is None:
+            return
+        name = os.path.basename(path)
+        task.finished.connect(lambda outcome: self.show_all_controllers_script_reports(name, addresses, *outcome))
+        self._show_result_text(f"{name}: running on {len(interfaces)} controllers...")
+        task.start()
+
+    def show_all_controllers_script_reports(self, name, addresses, reports, total):
+        """
+        Shows the results of run_hci_script_on_all_controllers.
+
+        Args:
+            name (str): Script file name.
+            addresses (dict): Interface -> BD address.
+            reports (dict): Interface -> ScriptReport.
+            total (float): Seconds for all the controllers.
+        returns:
+            None
+        """
+        rows = []
+        for interface, report in reports.items():
+            failed = [f"{step.index}: {step.command}" for step in report.steps if not step.passed]
+            if report.error is not None:
+                failed.append(report.error)
+            rows.append([interface, addresses.get(interface), f"{len(report.steps)}",
+                         f"{report.elapsed * 1000:.1f}", "PASS" if report.passed else "FAIL", ", ".join(failed)])
+        passed = sum(report.passed for report in reports.values())
+        summary = f"{name}: {passed}/{len(reports)} controllers passed in {total * 1000:.1f} ms"
+        self._show_result_text("\n\n".join(report.format() for report in reports.values()))
+        ResultsTableDialog("Run Script on all controllers",
+                           ["Interface", "BD Address", "Steps", "Time (ms)", "Result", "Failed steps"],
+                           rows, summary=summary, parent=self).exec()
 
     def reset_default_params(self):
         """
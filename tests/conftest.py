@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from Backend_lib.Linux.hci_emulator import VirtualController
+
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture
+def hcidump_log():
+    """
+    hcidump -t -X log of a short LE session; its last entry (Disconn Complete) is decoded text only.
+    """
+    return os.path.join(FIXTURES, "hcidump.log")
+
+
+@pytest.fixture
+def btsnoop_capture():
+    """
+    btsnoop H4 capture of the same session, with the Disconnection Complete bytes.
+    """
+    return os.path.join(FIXTURES, "hci0.btsnoop")
+
+
+@pytest.fixture
+def virtual_controller():
+    """
+    Starts VirtualController instances (not registered under their interface name) and stops them afterwards.
+    """
+    controllers = []
+
+    def start(**kwargs):
+        controller = VirtualController(**kwargs).start(register=False)
+        controllers.append(controller)
+        return controller
+
+    yield start
+    for controller in controllers:
+        controller.stop()
@@ -0,0 +1,77 @@
+import pytest
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import CommandComplete, CommandStatus, decode_command_event
+
+
+def execute(controller, group, name, parameters=()):
+    encoder = get_encoder(group, name)
+    return decode_command_event(controller.transport.execute(encoder.opcode, encoder.encode(list(parameters))))
+
+
+def test_encode_packet_layout():
+    encoder = get_encoder("LE Controller commands", "LE Set Scan Enable")
+    assert encoder.opcode == 0x200c
+    assert encoder.encode(["0x01", "0x00"]) == bytes.fromhex("010c20020100")
+    # Fewer parameters than the table defines encode only that prefix
+    assert encoder.encode(["0x01"]) == bytes.fromhex("010c200101")
+
+
+def test_encode_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        get_encoder("LE Controller commands", "LE Set Scan Enable").encode(["0x01", "0x00", "0x00"])
+    with pytest.raises(ValueError):
+        get_encoder("Controller and Baseband commands", "Write Page Timeout").encode(["0x12345"])
+
+
+def test_read_bd_addr_round_trip(virtual_controller):
+    controller = virtual_controller(bd_address="00:1B:DC:0A:0B:0C")
+    event = execute(controller, "Informational parameters", "Read BD_ADDR")
+    assert isinstance(event, CommandComplete)
+    assert event.opcode == 0x1009
+    assert event.command == "Read BD_ADDR"
+    assert event.num_hci_command_packets == 1
+    assert event.status == 0
+    assert event.return_parameters.BD_ADDR == "00:1B:DC:0A:0B:0C"
+
+
+def test_return_parameters_round_trip(virtual_controller):
+    controller = virtual_controller(return_values={"Read Local Name": {"Local_Name": "Bench Controller"}})
+    name = execute(controller, "Controller and Baseband commands", "Read Local Name")
+    assert name.return_parameters.Local_Name == "Bench Controller"
+    version = execute(controller, "Informational parameters", "Read Local Version Information")
+    assert version.return_parameters.HCI_Version == 0x0c
+    assert version.return_parameters.Company_Identifier == 0x05f1
+
+
+def test_failure_status(virtual_controller):
+    controller = virtual_controller()
+    controller.set_status("Read Local Name", 0x0c)
+    event = execute(controller, "Controller and Baseband commands", "Read Local Name")
+    assert event.status == 0x0c
+    controller.set_status("Read Local Name", None)
+    assert execute(controller, "Controller and Baseband commands", "Read Local Name").status == 0
+
+
+def test_unknown_command(virtual_controller):
+    controller = virtual_controller()
+    event = decode_command_event(controller.transport.execute(0xfc00, bytes.fromhex("0100fc00")))
+    assert event.command is None
+    assert event.status == 0x01
+
+
+def test_command_status_and_follow_up_event(virtual_controller):
+    controller = virtual_controller()
+    encoder = get_encoder("Link Control commands", "Create Connection")
+    packet = encoder.encode(["0x665544332211", "0xcc18", "0x00", "0x00", "0x0000", "0x01"])
+    event = decode_command_event(controller.transport.execute(encoder.opcode, packet))
+    assert isinstance(event, CommandStatus)
+    assert (event.opcode, event.status) == (0x0405, 0)
+
+    complete = controller.transport.recv_packet(1.0)
+    assert complete[:3] == bytes([hci_transport.HCI_EVENT_PKT, 0x03, 11])
+    assert complete[3] == 0
+    # The BD_ADDR parameter comes back byte for byte in the Connection Complete event
+    assert complete[6:12] == packet[4:10] == bytes.fromhex("112233445566")
+    assert decode_command_event(complete) is None
@@ -0,0 +1,59 @@
+import struct
+
+import pytest
+
+from Backend_lib.Linux import btsnoop
+from Backend_lib.Linux.hci_export import (LINKTYPE_BLUETOOTH_HCI_H4_WITH_PHDR, PCAP_MAGIC, export_capture,
+                                          iter_packets, open_writer)
+
+
+def read_pcap(path):
+    with open(path, "rb") as fp:
+        data = fp.read()
+    magic, major, minor, _, _, _, linktype = struct.unpack_from("<IHHiIII", data)
+    assert (magic, major, minor, linktype) == (PCAP_MAGIC, 2, 4, LINKTYPE_BLUETOOTH_HCI_H4_WITH_PHDR)
+    records = []
+    position = 24
+    while position < len(data):
+        seconds, microseconds, included, original = struct.unpack_from("<IIII", data, position)
+        assert included == original
+        direction, = struct.unpack_from(">I", data, position + 16)
+        packet = data[position + 20:position + 16 + included]
+        records.append((seconds + microseconds / 1e6, bool(direction), packet))
+        position += 16 + included
+    return records
+
+
+def test_hcidump_to_btsnoop(hcidump_log, btsnoop_capture, tmp_path):
+    output = str(tmp_path / "session.btsnoop")
+    # The Disconn Complete entry has no hex payload and cannot be exported
+    assert export_capture(hcidump_log, output) == 10
+    exported = list(btsnoop.iter_records(output))
+    expected = list(btsnoop.iter_records(btsnoop_capture))[:10]
+    assert [(record.received, record.packet) for record in exported] == \
+        [(record.received, record.packet) for record in expected]
+    for record, reference in zip(exported, expected):
+        assert record.timestamp - exported[0].timestamp == pytest.approx(reference.timestamp - expected[0].timestamp)
+
+
+def test_btsnoop_to_pcap(btsnoop_capture, tmp_path):
+    output = str(tmp_path / "session.pcap")
+    assert export_capture(btsnoop_capture, output) == 11
+    expected = list(iter_packets(btsnoop_capture))
+    records = read_pcap(output)
+    assert [(received, packet) for _, received, packet in records] == \
+        [(received, packet) for _, received, packet in expected]
+    assert [timestamp for timestamp, _, _ in records] == \
+        pytest.approx([timestamp for timestamp, _, _ in expected], abs=1e-6)
+
+
+def test_export_replaces_output(btsnoop_capture, tmp_path):
+    output = str(tmp_path / "session.btsnoop")
+    assert export_capture(btsnoop_capture, output) == 11
+    assert export_capture(btsnoop_capture, output) == 11
+    assert len(list(btsnoop.iter_records(output))) == 11
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer(str(tmp_path / "session.txt"), "text")
@@ -0,0 +1,97 @@
+import struct
+
+import pytest
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux import hcidump
+from Backend_lib.Linux.hci_export import iter_packets
+from Backend_lib.Linux.hci_filter import HcidumpStreamFilter, packet_addresses, parse_address, parse_filter
+
+
+PEER = "11:22:33:44:55:66"
+OTHER = "AA:BB:CC:DD:EE:FF"
+
+
+def command_packet(opcode, params):
+    return bytes([hci_transport.HCI_COMMAND_PKT]) + struct.pack("<HB", opcode, len(params)) + params
+
+
+def le_extended_create_connection(address):
+    # Initiator_Filter_Policy, Own_Address_Type, Peer_Address_Type, Peer_Address, Initiating_PHYs (1M)
+    params = bytes([0x00, 0x00, 0x00]) + parse_address(address) + bytes([0x01])
+    # Scan_Interval, Scan_Window, Connection_Interval_Min/Max, Max_Latency, Supervision_Timeout, CE_Length Min/Max
+    params += struct.pack("<HHHHHHHH", 0x0060, 0x0060, 0x0018, 0x0028, 0, 0x01f4, 0, 0)
+    return command_packet(0x2043, params)
+
+
+def le_create_connection(address):
+    # LE_Scan_Interval, LE_Scan_Window, Initiator_Filter_Policy, Peer_Address_Type, Peer_Address, ...
+    params = struct.pack("<HHBB", 0x0060, 0x0060, 0x00, 0x00) + parse_address(address)
+    params += struct.pack("<BHHHHHH", 0x00, 0x0018, 0x0028, 0, 0x01f4, 0, 0)
+    return command_packet(0x200d, params)
+
+
+def test_le_extended_create_connection_address():
+    packet = le_extended_create_connection(PEER)
+    assert packet_addresses(packet) == {parse_address(PEER)}
+    assert parse_filter(f"include address:{PEER}").matches(packet)
+    assert not parse_filter(f"include address:{OTHER}").matches(packet)
+    assert not parse_filter(f"exclude address:{PEER}").matches(packet)
+
+
+def test_le_create_connection_address():
+    packet = le_create_connection(PEER)
+    assert packet_addresses(packet) == {parse_address(PEER)}
+    assert parse_filter(f"include address:{PEER}").matches(packet)
+    assert not parse_filter(f"include address:{OTHER}").matches(packet)
+
+
+def test_format_round_trip():
+    text = "exclude type:acl,sco; include type:command opcode:0x0c03; exclude event:0x3e subevent:0x02"
+    capture_filter = parse_filter(text)
+    assert parse_filter(capture_filter.format()).format() == capture_filter.format()
+    assert "type:acl,sco" in capture_filter.format()
+
+
+def kept(text, path):
+    capture_filter = parse_filter(text)
+    return [number for number, (_, _, packet) in enumerate(iter_packets(path)) if capture_filter.matches(packet)]
+
+
+def test_capture_rules(btsnoop_capture):
+    # Packets: Reset, its completion, Read BD_ADDR, its completion, LE Set Scan Enable, its completion,
+    # LE Connection Complete, ACL data, Disconnect, its Command Status, Disconnection Complete
+    assert kept("", btsnoop_capture) == list(range(11))
+    assert kept("exclude opcode:0x200c", btsnoop_capture) == [0, 1, 2, 3, 6, 7, 8, 9, 10]
+    assert kept("include type:command", btsnoop_capture) == [0, 2, 4, 8]
+    assert kept("exclude type:acl; exclude event:0x3e", btsnoop_capture) == [0, 1, 2, 3, 4, 5, 8, 9, 10]
+    assert kept("include event:0x3e subevent:0x01; include handle:0x0040", btsnoop_capture) == [6, 7, 8, 10]
+
+
+def test_address_rule_follows_the_connection(btsnoop_capture):
+    # The handle learnt from LE Connection Complete carries the address to the connection's traffic
+    assert kept(f"include address:{PEER}", btsnoop_capture) == [6, 7, 8, 10]
+    assert kept(f"include address:{OTHER}", btsnoop_capture) == []
+
+
+def test_hcidump_frames(hcidump_log):
+    capture_filter = parse_filter("include handle:64")
+    kept_frames = [frame.line for frame in hcidump.iter_frames(hcidump_log) if capture_filter.matches_frame(frame)]
+    # The Disconn Complete entry has no hex payload and is judged on its decoded handle
+    assert kept_frames == [13, 16, 18, 22]
+
+
+def test_hcidump_stream_filter(hcidump_log):
+    with open(hcidump_log, "rb") as fp:
+        data = fp.read()
+    stream = HcidumpStreamFilter(parse_filter("exclude type:acl"))
+    # Fed in uneven chunks, as hcidump output arrives
+    output = b"".join(stream.feed(data[start:start + 100]) for start in range(0, len(data), 100)) + stream.flush()
+    lines = data.splitlines(keepends=True)
+    assert output == b"".join(lines[:15] + lines[17:])
+
+
+@pytest.mark.parametrize("text", ["include", "bogus:1", "type:radio", "address:11:22", "opcode:"])
+def test_invalid_filters(text):
+    with pytest.raises(ValueError):
+        parse_filter(text)
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event
+from Backend_lib.Linux.hci_scheduler import HciCommandScheduler
+
+
+GROUP = "Controller and Baseband commands"
+NAME = "Read Local Name"
+
+
+def outstanding_recorder(controller, delay):
+    """
+    Latency callable recording how many commands the controller holds when it answers one.
+    The delay lets every command the host has written reach the command buffer first.
+    """
+    counts = []
+
+    def latency():
+        time.sleep(delay)
+        counts.append(controller.command_queue.qsize() + 1)
+        return 0
+
+    return counts, latency
+
+
+async def send_all(controller, count, timeout=hci_transport.HCI_COMMAND_TIMEOUT):
+    async with HciCommandScheduler(controller.transport, timeout=timeout) as scheduler:
+        return await asyncio.gather(*(scheduler.send(GROUP, NAME) for _ in range(count)), return_exceptions=True)
+
+
+def test_single_credit_is_never_exceeded(virtual_controller):
+    controller = virtual_controller()
+    counts, controller.latency = outstanding_recorder(controller, 0.01)
+    results = asyncio.run(send_all(controller, 5))
+    assert [result.status for result in results] == [0] * 5
+    assert counts == [1] * 5
+
+
+def test_pipelines_up_to_advertised_credits(virtual_controller):
+    controller = virtual_controller(num_command_packets=4)
+    counts, controller.latency = outstanding_recorder(controller, 0.05)
+    results = asyncio.run(send_all(controller, 12))
+    assert [result.status for result in results] == [0] * 12
+    # The first command goes out alone; once 4 credits are advertised the rest are pipelined
+    assert counts[0] == 1
+    assert max(counts) == 4
+
+
+def test_timeout_counts_from_send(virtual_controller):
+    controller = virtual_controller(latency=0.1)
+    start = time.monotonic()
+    results = asyncio.run(send_all(controller, 6, timeout=0.25))
+    # Each command waits 0.1 s once sent, although the last one is queued for 0.5 s
+    assert [getattr(result, "status", result) for result in results] == [0] * 6
+    assert time.monotonic() - start >= 0.6
+
+
+def test_unanswered_command_times_out(virtual_controller):
+    controller = virtual_controller(latency=0.5)
+
+    async def run():
+        async with HciCommandScheduler(controller.transport, timeout=0.1) as scheduler:
+            start = time.monotonic()
+            with pytest.raises(hci_transport.HciTransportError):
+                await scheduler.send(GROUP, NAME)
+            return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.4
+
+
+def test_late_completion_is_discarded(virtual_controller):
+    controller = virtual_controller()
+    calls = []
+
+    def latency():
+        # The first command fails late; the next one succeeds at once
+        calls.append(None)
+        if len(calls) == 1:
+            controller.set_status(NAME, 0x0c)
+            return 0.4
+        controller.set_status(NAME, None)
+        return 0
+
+    controller.latency = latency
+
+    async def run():
+        async with HciCommandScheduler(controller.transport, timeout=0.2) as scheduler:
+            with pytest.raises(hci_transport.HciTransportError):
+                await scheduler.send(GROUP, NAME)
+            return await scheduler.send(GROUP, NAME, timeout=1.0)
+
+    # Without the discard the second command would get the first one's status
+    assert asyncio.run(run()).status == 0
+
+
+def test_other_events_go_to_listeners(virtual_controller):
+    controller = virtual_controller()
+    received = []
+
+    async def run():
+        async with HciCommandScheduler(controller.transport) as scheduler:
+            scheduler.add_event_listener(received.append)
+            controller.emit_advertising_report("11:22:33:44:55:66", b"\x02\x01\x06")
+            return await scheduler.send(GROUP, NAME)
+
+    assert asyncio.run(run()).status == 0
+    assert len(received) == 1
+    assert received[0][1] == 0x3e and received[0][3] == 0x02
+
+
+def test_execute_waits_while_the_scheduler_runs(virtual_controller):
+    controller = virtual_controller(latency=0.01)
+    encoder = get_encoder("Informational parameters", "Read BD_ADDR")
+    events = []
+
+    def execute():
+        events.append(decode_command_event(controller.transport.execute(encoder.opcode, encoder.encode([]))))
+
+    async def run():
+        async with HciCommandScheduler(controller.transport) as scheduler:
+            thread = threading.Thread(target=execute)
+            thread.start()
+            results = await asyncio.gather(*(scheduler.send(GROUP, NAME) for _ in range(5)))
+            # The concurrent command is held back instead of taking one of the scheduler's completions
+            assert not events
+        return thread, results
+
+    thread, results = asyncio.run(run())
+    thread.join(2.0)
+    assert [result.status for result in results] == [0] * 5
+    assert [event.opcode for event in events] == [0x1009]
+    assert not controller.transport.lock.locked()
@@ -0,0 +1,37 @@
+import logging
+
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_script import ScriptStep, run_script, run_script_on_controllers
+
+
+LOG = logging.getLogger("hci_script")
+
+STEPS = [ScriptStep.from_dict({"group": "Controller and Baseband commands", "command": "Reset",
+                               "expect_status": "0x00"}),
+         ScriptStep.from_dict({"group": "Informational parameters", "command": "Read BD_ADDR"})]
+
+
+def test_script_runs_on_the_registered_transport(virtual_controller):
+    controller = virtual_controller(interface="hci98")
+    hci_transport.register_transport(controller.interface, controller.transport)
+    try:
+        report = run_script(controller.interface, LOG, STEPS)
+    finally:
+        hci_transport.close_transports()
+    assert report.passed and report.error is None
+    assert [step.status for step in report.steps] == [0, 0]
+
+
+def test_socket_failure_is_reported(virtual_controller):
+    controller = virtual_controller(interface="hci98")
+    hci_transport.register_transport(controller.interface, controller.transport)
+    try:
+        # hci97 has no controller, so its socket cannot be opened; the other run is unaffected
+        reports = run_script_on_controllers([controller.interface, "hci97"], LOG, STEPS)
+    finally:
+        hci_transport.close_transports()
+    assert reports[controller.interface].passed
+    failed = reports["hci97"]
+    assert not failed.passed and failed.steps == []
+    assert "cannot open HCI socket" in failed.error
+    assert failed.format().startswith("hci97: not run")
@@ -0,0 +1,76 @@
+from Backend_lib.Linux import hcidump
+from Backend_lib.Linux.log_index import HciLogIndex, parse_query
+
+
+def test_parser_frames(hcidump_log):
+    frames = list(hcidump.iter_frames(hcidump_log))
+    assert [frame.kind for frame in frames] == ["command", "event"] * 3 + ["event", "data", "command", "event",
+                                                                           "event"]
+    assert [frame.line for frame in frames[:3]] == [3, 4, 6]
+    assert frames[3].packet() == bytes.fromhex("040e0a01091000010000dc1b00")
+    acl = frames[7]
+    assert (acl.handle, acl.received) == (64, False)
+    assert acl.packet() == bytes.fromhex("0240000700030004000a0100")
+    # Decoded text only: no packet, but its fields are parsed from the text
+    last = frames[-1]
+    assert last.packet() is None
+    assert (last.event_code, last.status, last.handle) == (0x05, 0x00, 64)
+
+
+def test_parser_returns_frames_when_the_next_starts(hcidump_log):
+    with open(hcidump_log) as fp:
+        lines = fp.readlines()
+    parser = hcidump.HcidumpParser()
+    completed = [frame for number, line in enumerate(lines) if (frame := parser.feed(number, line))]
+    assert len(completed) == 10
+    assert parser.frame.event_code == 0x05
+    assert parser.finish().event_code == 0x05
+    assert parser.finish() is None
+
+
+def test_index_queries(hcidump_log):
+    index = HciLogIndex(hcidump_log)
+    try:
+        # The last frame is indexed too, provisionally, although no entry follows it
+        assert index.update() == 10
+        assert len(index) == 11
+        assert index.query(handle=64) == [12, 15, 17, 21]
+        assert index.query(opcode=0x0406) == [17, 19]
+        assert index.query(event=0x3e, subevent=0x01) == [12]
+        assert index.query(event=0x05, status=0x00) == [21]
+        assert index.query(opcode=0x0c03) == [2, 3]
+        assert index.query(handle=64, limit=2) == [12, 15]
+        after = hcidump.parse_timestamp("2024-05-01 10:00:01.000000")
+        before = hcidump.parse_timestamp("2024-05-01 10:00:02.000000")
+        assert index.query(after=after, before=before) == [8, 10, 12, 15]
+        assert index.first_time() == hcidump.parse_timestamp("2024-05-01 10:00:00.100000")
+        assert index.update() == 0
+    finally:
+        index.close()
+
+
+def test_index_follows_a_growing_log(hcidump_log, tmp_path):
+    with open(hcidump_log) as fp:
+        lines = fp.readlines()
+    path = tmp_path / "hcidump.log"
+    # Cut inside the Disconnect command's entry: its hex line is still missing
+    path.write_text("".join(lines[:18]))
+    index = HciLogIndex(str(path))
+    try:
+        assert index.update() == 8
+        assert index.query(opcode=0x0406) == [17]
+        with open(path, "a") as fp:
+            fp.writelines(lines[18:])
+        assert index.update() == 2
+        # The provisional entry was replaced, not duplicated
+        assert index.query(opcode=0x0406) == [17, 19]
+        assert index.query(handle=64) == [12, 15, 17, 21]
+        assert len(index) == 11
+    finally:
+        index.close()
+
+
+def test_parse_query():
+    assert parse_query("event:0x05 handle:64") == {"event": 0x05, "handle": 64}
+    assert parse_query("name:LE Connection Complete") == {"event": 0x3e, "subevent": 0x01}
+    assert parse_query("Disconnect") is None
@@ -0,0 +1,175 @@
+import bisect
+import os
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtWidgets import (QWidget, QListView, QAbstractItemView, QPushButton, QHBoxLayout, QVBoxLayout,
+                             QFileDialog, QLabel)
+
+from Backend_lib.Linux.log_timeline import TimelineFollower, export_timeline, format_entry
+from UI_lib.log_tailer import LogTailer
+
+
+source_colors = ["#1f4e9c", "#8a3b12", "#1d6b2f", "#6b1d6b", "#5c5c00"]
+
+
+class TimelineModel(QAbstractListModel):
+
+    """
+    List model over merged timeline entries, kept sorted by (timestamp, source, sequence).
+
+    Entries arriving in order are appended in bulk; late ones are inserted at
+    their position. At most max_rows rows are kept, the oldest are dropped.
+    """
+
+    def __init__(self, labels, max_rows=200000, parent=None):
+        """
+        Initializes the model.
+
+        Args:
+            labels (list): Source labels, indexed by source number.
+            max_rows (int): Maximum number of rows kept.
+            parent (QObject, optional): Parent object.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.labels = labels
+        self.max_rows = max_rows
+        self.keys = []
+        self.entries = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_entry(entry, self.labels)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QColor(source_colors[entry[1] % len(source_colors)])
+        return None
+
+    def add_entries(self, entries):
+        """
+        Adds time-ordered entries, dropping the oldest rows beyond max_rows.
+
+        Args:
+            entries (list): (timestamp, source, sequence, line) entries.
+        returns:
+            None
+        """
+        if not entries:
+            return
+        if not self.keys or entries[0][:3] >= self.keys[-1]:
+            first = len(self.entries)
+            self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+            self.keys.extend(entry[:3] for entry in entries)
+            self.entries.extend(entries)
+            self.endInsertRows()
+        else:
+            for entry in entries:
+                row = bisect.bisect_right(self.keys, entry[:3])
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.keys.insert(row, entry[:3])
+                self.entries.insert(row, entry)
+                self.endInsertRows()
+        overflow = len(self.entries) - self.max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            del self.keys[:overflow]
+            del self.entries[:overflow]
+            self.endRemoveRows()
+
+
+class TimelineViewer(QWidget):
+
+    """
+    Live merged timeline of several logs (bluetoothd, pulseaudio, hcidump) with export.
+    """
+
+    def __init__(self, paths, parent=None):
+        """
+        Initializes the viewer and starts following the logs through the shared LogTailer.
+
+        Args:
+            paths (list): Log file paths; logs that do not exist yet are picked up once created.
+            parent (QWidget, optional): Parent widget.
+        returns:
+            None
+        """
+        super().__init__(parent)
+        self.paths = [path for path in paths if path]
+        self.follower = TimelineFollower(self.paths)
+        self.model = TimelineModel(self.follower.labels, parent=self)
+
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.view.setBatchSize(500)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.view.setFont(QFont("Monospace", 9))
+
+        self.status_label = QLabel()
+        export_button = QPushButton("Export")
+        export_button.clicked.connect(self.export)
+        controls = QHBoxLayout()
+        controls.addWidget(self.status_label, 1)
+        controls.addWidget(export_button)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.view)
+
+        self.log_subscription = LogTailer.get_instance().subscribe(self.paths, self.refresh, owner=self)
+        # The viewer is deleted with its screen on navigation, which sends no closeEvent
+        self.destroyed.connect(lambda _=None, follower=self.follower: follower.close())
+        self.refresh()
+
+    def refresh(self, changes=None):
+        """
+        Adds the lines appended to the logs, keeping the view at the end if it was there.
+
+        Args:
+            changes (list, optional): LogChange objects of the tailer tick.
+        returns:
+            None
+        """
+        entries = self.follower.poll()
+        if not entries:
+            return
+        scroll_bar = self.view.verticalScrollBar()
+        following = scroll_bar.value() >= scroll_bar.maximum()
+        self.model.add_entries(entries)
+        if following:
+            self.view.scrollToBottom()
+        self.status_label.setText(f"{self.model.rowCount()} lines from {', '.join(self.follower.labels)}")
+
+    def export(self):
+        """
+        Asks for a file and writes the full merged timeline, rotated segments included, to it.
+
+        args: None
+        returns: None
+        """
+        directory = os.path.dirname(self.paths[0]) if self.paths else ""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timeline", os.path.join(directory, "timeline.log"),
+                                              "Log Files (*.log);;All Files (*)")
+        if not path:
+            return
+        try:
+            written = export_timeline(self.paths, path)
+        except OSError as e:
+            self.status_label.setText(f"Export failed: {e}")
+            return
+        self.status_label.setText(f"{written} lines exported to {path}")
+
+    def closeEvent(self, event):
+        LogTailer.get_instance().unsubscribe(self.log_subscription)
+        self.follower.close()
+        super().closeEvent(event)
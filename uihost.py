@@ -5,7 +5,8 @@ import time
 import constants
 
 
-from PyQt6.QtCore import QTimer, QFileSystemWatcher
+from PyQt6 import sip
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QScrollArea, QListWidgetItem, QGroupBox, QDialog, QHeaderView, QSizePolicy
@@ -29,6 +30,9 @@ from PyQt6.QtWidgets import QFileDialog
 
 from logger import Logger
 from Backend_lib.Linux.bluez import BluetoothDeviceManager
+from Backend_lib.Linux.bluez_async import media_commands
+from UI_lib.async_bridge import AsyncBridge
+from UI_lib.timeline_viewer import TimelineViewer
 
 
 class Controller:
@@ -48,6 +52,24 @@ class Controller:
         self.manufacturer = None
 
 
+def _close_async_backend(backend):
+    """
+    Closes the AsyncBluetoothDeviceManager and AsyncBridge recorded for a TestApplication, once.
+
+    Args:
+        backend (dict): Optional "manager" and "bridge" entries; each is removed as it is closed.
+    returns:
+        None
+    """
+    manager = backend.pop("manager", None)
+    bridge = backend.pop("bridge", None)
+    if bridge is None:
+        return
+    if manager is not None:
+        # The buses belong to the bridge's event loop, so they are disconnected there before it stops;
+        # BlueZ ends a discovery started by the manager when its bus goes away
+        bridge.loop.call_soon_threadsafe(manager.close)
+    bridge.close()
 
 
 class TestApplication(QWidget):
@@ -81,7 +103,13 @@ class TestApplication(QWidget):
             log_path=log_path
         )
         self.bluetooth_device_manager.initialize_adapter(self.interface)
+        # asyncio backend for device operations, started on first use by _async_manager
+        self.async_backend = {}
+        self.discovery_button = None
+        self.device_address = None
         self.test_application_clicked()
+        # setCentralWidget deletes the screen on navigation without a closeEvent
+        self.destroyed.connect(lambda _=None, backend=self.async_backend: _close_async_backend(backend))
 
 
     def load_connected_devices(self):
@@ -149,6 +177,186 @@ class TestApplication(QWidget):
                 self.profile_description_text_browser.append("GAP Profile Selected")
                 self.profile_description_text_browser.setFont(bold_font)
                 self.profile_description_text_browser.append("Use the below methods as required:")
+                self.load_gap_methods()
+
+    def _async_manager(self):
+        """
+        Returns the asyncio device manager, starting it and its AsyncBridge on first use.
+
+        Returns:
+            AsyncBluetoothDeviceManager | None: None if the asyncio D-Bus backend is unavailable.
+        """
+        if "manager" not in self.async_backend:
+            try:
+                manager = self.bluetooth_device_manager.get_async_manager()
+            except RuntimeError as e:
+                self.log.error(f"[ERROR] Device operations unavailable: {e}")
+                self.profile_description_text_browser.append(f"Device operations unavailable: {e}")
+                return None
+            self.async_backend["manager"] = manager
+            # A child of the screen, so results of operations still running when it is deleted are dropped
+            self.async_backend["bridge"] = AsyncBridge(self.log, self)
+        return self.async_backend["manager"]
+
+    def run_device_operation(self, description, operation, show_result):
+        """
+        Runs an AsyncBluetoothDeviceManager coroutine through the AsyncBridge, so the GUI never waits
+        for BlueZ and several operations can run at once; the outcome is added to the methods browser.
+
+        Args:
+            description (str): Text shown while the operation runs, e.g. 'Pairing with <address>'.
+            operation (callable): Takes the AsyncBluetoothDeviceManager and returns the coroutine to run.
+            show_result (callable): Turns the coroutine's result into the text shown when it finishes.
+        returns:
+            None
+        """
+        manager = self._async_manager()
+        if manager is None:
+            return
+        self.profile_description_text_browser.append(f"{description}...")
+        self.async_backend["bridge"].submit(
+            operation(manager),
+            callback=lambda result: self.profile_description_text_browser.append(show_result(result)),
+            errback=lambda error: self.device_operation_failed(description, error))
+
+    def device_operation_failed(self, description, error):
+        self.log.error(f"[ERROR] {description} failed: {error!r}")
+        self.profile_description_text_browser.append(f"{description} failed: {error}")
+
+    @staticmethod
+    def _methods_widget(buttons):
+        """
+        Lays out (label, slot) pairs as a row of buttons.
+
+        Returns:
+            tuple: (QWidget row, list of its QPushButtons).
+        """
+        widget = QWidget()
+        layout = QHBoxLayout()
+        created = []
+        for label, slot in buttons:
+            button = QPushButton(label)
+            button.setStyleSheet("color: black; border: 2px solid black; padding: 4px;")
+            button.clicked.connect(slot)
+            layout.addWidget(button)
+            created.append(button)
+        widget.setLayout(layout)
+        return widget, created
+
+    def load_gap_methods(self):
+        """
+        Shows the GAP methods (discovery and inquiry) under the methods browser.
+
+        args: None
+        returns: None
+        """
+        self.profile_methods_widget, buttons = self._methods_widget([
+            ("Stop Discovery" if self.discovery_active else "Start Discovery", self.toggle_discovery),
+            ("Inquiry (10 s)", lambda: self.inquiry(10))])
+        self.discovery_button = buttons[0]
+        self.main_grid_layout.addWidget(self.profile_methods_widget, 11, 2, 1, 2)
+
+    def toggle_discovery(self):
+        """
+        Starts discovery on the adapter, or stops the discovery started here.
+
+        args: None
+        returns: None
+        """
+        starting = not self.discovery_active
+
+        def discovery_changed(_):
+            self.discovery_active = starting
+            if self.discovery_button and not sip.isdeleted(self.discovery_button):
+                self.discovery_button.setText("Stop Discovery" if starting else "Start Discovery")
+            return "Discovery started" if starting else "Discovery stopped"
+
+        if starting:
+            self.run_device_operation("Starting discovery", lambda manager: manager.start_discovery(),
+                                      discovery_changed)
+        else:
+            self.run_device_operation("Stopping discovery", lambda manager: manager.stop_discovery(),
+                                      discovery_changed)
+
+    def inquiry(self, timeout):
+        self.run_device_operation(
+            f"Scanning for {timeout} s", lambda manager: manager.inquiry(timeout),
+            lambda devices: "Discovered devices:\n" + "\n".join(devices) if devices else "No devices found")
+
+    def load_profile_tabs_for_device(self, address):
+        """
+        Shows the operations for a paired or connected device, one tab per profile, under the methods browser.
+
+        Args:
+            address (str): Bluetooth MAC address of the device.
+        returns:
+            None
+        """
+        self.device_tab_widget = QTabWidget()
+        self.device_tab_widget.addTab(self._methods_widget([
+            ("Connect", lambda: self.run_device_operation(
+                f"Connecting to {address}", lambda manager: manager.connect(address),
+                lambda ok: f"Connected to {address}" if ok else f"Connection to {address} failed")),
+            ("Disconnect", lambda: self.run_device_operation(
+                f"Disconnecting {address}", lambda manager: manager.disconnect(address),
+                lambda ok: f"Disconnected {address}" if ok else f"Disconnecting {address} failed")),
+            ("Pair", lambda: self.run_device_operation(
+                f"Pairing with {address}", lambda manager: manager.pair(address),
+                lambda ok: f"Paired with {address}" if ok else f"Pairing with {address} failed")),
+            ("Remove", lambda: self.run_device_operation(
+                f"Removing {address}", lambda manager: manager.remove_device(address),
+                lambda ok: f"Removed {address}" if ok else f"Removing {address} failed"))])[0], "GAP")
+        self.device_tab_widget.addTab(self._methods_widget([
+            ("Send File...", lambda: self.send_file(address))])[0], "OPP")
+        self.device_tab_widget.addTab(self._methods_widget([
+            (command.capitalize(), lambda _=None, command=command: self.run_device_operation(
+                f"Sending AVRCP {command} to {address}", lambda manager: manager.media_control(command, address),
+                str)) for command in media_commands])[0], "AVRCP")
+        self.device_tab_widget.currentChanged.connect(self.on_profile_tab_changed)
+        self.device_address = address
+        self.profile_methods_widget = self.device_tab_widget
+        self.main_grid_layout.addWidget(self.profile_methods_widget, 11, 2, 1, 2)
+
+    def on_profile_tab_changed(self, index):
+        """
+        Describes the selected device tab in the methods browser.
+
+        args: index (int): Tab index.
+        returns: None
+        """
+        if index < 0 or sip.isdeleted(self.device_tab_widget):
+            return
+        bold_font = QFont()
+        bold_font.setBold(True)
+        self.profile_description_text_browser.clear()
+        self.profile_description_text_browser.setFont(bold_font)
+        self.profile_description_text_browser.append(
+            f"{self.device_address}: {self.device_tab_widget.tabText(index)} Profile Selected")
+        self.profile_description_text_browser.append("Use the below methods as required:")
+
+    def send_file(self, address):
+        """
+        Pushes a file chosen by the user to the device over OBEX.
+
+        args: address (str): Bluetooth MAC address of the device.
+        returns: None
+        """
+        path, _ = QFileDialog.getOpenFileName(self, "Select file to send")
+        if not path:
+            return
+        self.run_device_operation(f"Sending {os.path.basename(path)} to {address}",
+                                  lambda manager: manager.send_file_via_obex(address, path),
+                                  lambda outcome: outcome[1])
+
+    def go_back(self):
+        """
+        Closes the device operations backend and returns to the previous screen, which deletes this one.
+
+        args: None
+        returns: None
+        """
+        _close_async_backend(self.async_backend)
+        self.back_callback()
 
 
     def test_application_clicked(self):
@@ -389,6 +597,14 @@ class TestApplication(QWidget):
         tab_bar.setExpanding(True)
         self.dump_logs_text_browser.setFixedWidth(400)
 
+        # Timeline tab: bluetoothd, pulseaudio and hcidump logs merged in time order
+        manager = self.bluetooth_device_manager
+        hcidump_log_name = manager.hcidump_log_name or (
+            os.path.join(manager.log_path, f"{self.interface}_hcidump.log") if manager.log_path else None)
+        self.timeline_viewer = TimelineViewer(
+            [manager.bluetoothd_log_name, manager.pulseaudio_log_name, hcidump_log_name])
+        self.dump_logs_text_browser.addTab(self.timeline_viewer, "Timeline")
+
 
         back_button = QPushButton("Back")
         back_button.setFixedSize(100, 40)
@@ -406,7 +622,7 @@ class TestApplication(QWidget):
             }
         """)
 
-        back_button.clicked.connect(lambda: self.back_callback())
+        back_button.clicked.connect(self.go_back)
         back_button_layout = QHBoxLayout()
         back_button_layout.addWidget(back_button)
         back_button_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
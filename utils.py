@@ -1,12 +1,19 @@
 import socket
 import subprocess
-import re
 import os
 import constants
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 
-from Backend_lib.Linux import hci_commands as hci
+from Backend_lib.Linux import hci_capture
+from Backend_lib.Linux.controller_registry import ControllerRegistry
+from Backend_lib.Linux import controller_details
+from Backend_lib.Linux.process_supervisor import ProcessSupervisor, kill_matching
+from Backend_lib.Linux.hci_filter import HcidumpStreamFilter
+from Backend_lib.Linux import hci_transport
+from Backend_lib.Linux.hci_encoder import get_encoder
+from Backend_lib.Linux.hci_events import decode_command_event
 
 
 class Result:
@@ -19,13 +26,15 @@ class Result:
         exit_status: command's exit status.
         stdout: command's output.
         stderr: command's error.
+        event: decoded Command Complete/Status event for HCI commands sent over the raw socket.
     """
-    def __init__(self, command, stdout, stderr, pid, exit_status):
+    def __init__(self, command, stdout, stderr, pid, exit_status, event=None):
         self.command = command
         self.stdout = stdout
         self.stderr = stderr
         self.pid = pid
         self.exit_status = exit_status
+        self.event = event
 
     def __repr__(self):
         return ('Result(command = %r, stdout = %r, stderr = %r, exit_status = %r)'
@@ -49,8 +58,10 @@ def run(log, command, logfile=None, subprocess_input=""):
         result: result object of executed command, False on error.
     """
     if logfile:
-        proc = subprocess.Popen(command, stdout=open(logfile, 'w+'), stderr=open(logfile, 'w+'), stdin=subprocess.PIPE,
-                                shell=True)
+        # The child keeps its own copy of the descriptor; ours is closed once it is started
+        with open(logfile, 'w+') as output:
+            proc = subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT, stdin=subprocess.PIPE,
+                                    shell=True)
         return proc
     proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE, shell=True)
 
@@ -71,15 +82,8 @@ def get_controllers_connected(log):
         Returns:
             dict: Dictionary with BD address as key and interface as value.
     """
-    controllers_list = {}
-    result = run(log, 'hciconfig -a | grep -B 2 \"BD A\"')
-    result = result.stdout.split("--")
-    if result[0]:
-        for res in result:
-            res = res.strip("\n").replace('\n', '')
-            if match := re.match('(.*):	Type:.+BD Address: (.*) ACL(.*)', res):
-                controllers_list[match[2]] = match[1]
-        log.info("Controllers {} found on host".format(controllers_list))
+    controllers_list = ControllerRegistry.get_instance(log).addresses()
+    log.info("Controllers {} found on host".format(controllers_list))
     return controllers_list
 
 
@@ -93,12 +97,15 @@ def get_controller_interface_details(log, controllers_list, bd_address):
         Returns:
             str: Interface and Bus information.
         """
-    interface = controllers_list[bd_address]
-    result = run(log, f"hciconfig -a {interface} | grep Bus")
-    return f"Interface: {interface} \t Bus: {result.stdout.split('Bus:')[1].strip()}"
+    controller = ControllerRegistry.get_instance(log).get(controllers_list[bd_address])
+    return controller.details() if controller else f"Interface: {controllers_list[bd_address]} \t Bus: "
 
 
-def start_dump_logs(interface, log, log_path):
+def _hcidump_name(interface):
+    return f"hcidump-{interface}"
+
+
+def start_dump_logs(interface, log, log_path, capture_filter=None):
     """
       Stops the hcidump logging process, if running.
 
@@ -106,6 +113,7 @@ def start_dump_logs(interface, log, log_path):
           log (Logger): Logger instance used for logging.
           interface (str): The Bluetooth interface to stop logging for.
           log_path : log file path
+          capture_filter (CaptureFilter, optional): Filter applied to hcidump frames before they are written.
 
       Returns:
           bool: True if the process was stopped or not running, False if an error occurred.
@@ -123,13 +131,10 @@ def start_dump_logs(interface, log, log_path):
         hcidump_log_name = os.path.join(log_path, f"{interface}_hcidump.log")
         log.info(f"[INFO] Starting hcidump: {constants.hcidump_command}")
 
-        hcidump_process = subprocess.Popen(
-            constants.hcidump_command.format(interface=interface).split(),
-            stdout=open(hcidump_log_name, 'a+'),
-            stderr=subprocess.STDOUT,
-            bufsize=1,
-            universal_newlines=True
-        )
+        stream_filter = HcidumpStreamFilter(capture_filter.clone()) if capture_filter else None
+        ProcessSupervisor.get_instance(log).start(
+            _hcidump_name(interface), constants.hcidump_command.format(interface=interface).split(),
+            hcidump_log_name, restart=True, stream_filter=stream_filter)
 
         log.info(f"[INFO] hcidump process started: {hcidump_log_name}")
         return hcidump_log_name
@@ -149,27 +154,20 @@ def convert_to_little_endian(num, num_of_octets):
     Returns:
          str: Little-endian formatted hex string.
     """
-    data = None
-    if isinstance(num, str) and '0x' in num:
-        data = num.replace("0x", "")
-    elif isinstance(num, str) and '0x' not in num:
-        data = int(num)
-        data = str(hex(data)).replace("0x", "")
-    elif isinstance(num, int):
-        data = str(hex(num)).replace("0x", "")
-    while True:
-        if len(data) == (num_of_octets * 2):
-            break
-        data = "0" + data
-    out = [(data[i:i + 2]) for i in range(0, len(data), 2)]
-    out.reverse()
-    return ' '.join(out)
+    if isinstance(num, str):
+        num = int(num.replace("0x", ""), 16) if '0x' in num else int(num)
+    return num.to_bytes(num_of_octets, 'little').hex(' ')
 
 
 def run_hci_cmd(ogf, command, interface, log, parameters):
     """
     Executes an HCI command with provided parameters.
 
+    The command is written to the interface's persistent raw HCI socket and the
+    matching Command Complete/Status event is returned as hcitool style output
+    and decoded into typed return parameters on Result.event.
+    Falls back to `hcitool cmd` if the raw socket cannot be opened.
+
     Args:
         ogf (str): Opcode Group Field (e.g., '0x03').
         command (str): Specific HCI command name.
@@ -178,22 +176,66 @@ def run_hci_cmd(ogf, command, interface, log, parameters):
         parameters (list): List of parameters for the command.
 
     Returns:
-        subprocess.CompletedProcess: Result of command execution.
+        Result: Result of command execution.
     """
-    _ogf = ogf.lower().replace(' ', '_')
-    _ocf_info = getattr(hci, _ogf)[command]
-    hci_command = 'hcitool -i {} cmd {} {}'.format(interface, hci.hci_commands[ogf], _ocf_info[0])
-
-    for index in range(len(parameters)):
-        param_len = list(_ocf_info[1][index].values())[1] if len(
-            _ocf_info[1][index].values()) > 1 else None
-        if param_len:
-            parameter = convert_to_little_endian(parameters[index], param_len)
-        else:
-            parameter = parameters[index].replace('0x', '')
-        hci_command = ' '.join([hci_command, parameter])
+    encoder = get_encoder(ogf, command)
+    packet = encoder.encode(parameters)
+    hci_command = 'hcitool -i {} cmd 0x{:02x} 0x{:04x} {}'.format(interface, encoder.ogf, encoder.ocf,
+                                                               packet[4:].hex(' ')).strip()
+
     log.info(f"Executing command: {hci_command}")
-    return run(log, hci_command)
+    try:
+        transport = hci_transport.get_transport(interface, log)
+    except OSError as e:
+        log.info(f"[WARN] Raw HCI socket unavailable on {interface} ({e}), using hcitool")
+        return run(log, hci_command)
+
+    output = f"< HCI Command: ogf 0x{encoder.ogf:02x}, ocf 0x{encoder.ocf:04x}, plen {packet[3]}"
+    try:
+        event = transport.execute(encoder.opcode, packet)
+    except (OSError, hci_transport.HciTransportError) as e:
+        log.info(f"[ERROR] {e}")
+        return Result(command=hci_command, stdout=output, stderr=str(e), pid=None, exit_status=1)
+    controller_details.command_sent(interface, encoder.opcode)
+
+    result = Result(command=hci_command, stdout='\n'.join([output, hci_transport.format_hci_event(event)]),
+                    stderr='', pid=None, exit_status=0, event=decode_command_event(event))
+    log.info("Command: {}\nOutput: {}\n{}".format(hci_command, result.stdout, result.event))
+    return result
+
+
+def run_hci_cmd_on_controllers(ogf, command, interfaces, log, parameters):
+    """
+    Executes the same HCI command on several controllers concurrently.
+
+    Each interface has its own persistent transport, so the commands are sent in
+    parallel threads and the slowest controller bounds the total time.
+
+    Args:
+        ogf (str): Opcode Group Field name (e.g., 'Informational parameters').
+        command (str): Specific HCI command name.
+        interfaces (list): Bluetooth interfaces (e.g., ['hci0', 'hci1']).
+        log (Logger): Logger instance used for logging output and errors.
+        parameters (list): List of parameters for the command.
+
+    Returns:
+        dict: Interface as key and (Result, elapsed seconds) as value, in the order given.
+    """
+    def _timed(interface):
+        start = time.perf_counter()
+        try:
+            result = run_hci_cmd(ogf, command, interface, log, parameters)
+        except Exception as e:
+            log.error(f"[ERROR] {command} failed on {interface}: {e}")
+            result = Result(command=command, stdout='', stderr=str(e), pid=None, exit_status=1)
+        return result, time.perf_counter() - start
+
+    if not interfaces:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(interfaces)) as executor:
+        futures = {interface: executor.submit(_timed, interface) for interface in interfaces}
+    return {interface: future.result() for interface, future in futures.items()}
+
 
 def keep_l2cap_connection_alive(log, bd_addr):
     try:
@@ -236,31 +278,85 @@ def stop_dump_logs(log, interface):
     Returns:
         bool: True if the process was stopped or not running, False if an error occurred.
     """
-    hcidump_process = None
     log.info("[INFO] Stopping HCI dump logs")
-    if hcidump_process:
-        try:
-            hcidump_process.terminate()
-            hcidump_process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            hcidump_process.kill()
-            hcidump_process.wait()
-        hcidump_process = None
+    ProcessSupervisor.get_instance(log).stop(_hcidump_name(interface))
 
     if interface:
         try:
-            result = subprocess.run(['pgrep', '-f', f'hcidump.*{interface}'],
-                                    capture_output=True, text=True)
-            if result.stdout.strip():
-                pids = result.stdout.strip().split('\n')
-                for pid in pids:
-                    subprocess.run(['kill', '-TERM', pid], stderr=subprocess.DEVNULL)
-                    time.sleep(1)
-                for pid in pids:
-                    subprocess.run(['kill', '-KILL', pid], stderr=subprocess.DEVNULL)
+            # hcidump instances not started by this session, e.g. left over by a crashed one
+            kill_matching(f'hcidump.*{interface}')
         except Exception as e:
             log.info(f"[ERROR] Error killing hcidump: {e}")
             return False
 
     log.info("[INFO] HCI dump logs stopped successfully")
     return True
+
+
+def start_btsnoop_capture(interface, log, log_path, capture_filter=None):
+    """
+    Starts a binary btsnoop capture of the interface's HCI traffic from the monitor channel.
+
+    Args:
+        interface (str): The Bluetooth interface (e.g., 'hci0') to capture.
+        log (Logger): Logger instance used for logging.
+        log_path : log file path
+        capture_filter (CaptureFilter, optional): Filter applied to HCI packets before they are written.
+
+    Returns:
+        str | bool: Path to the capture file if successful, False if an error occurs.
+    """
+    if not interface:
+        log.info("[ERROR] Interface is not provided for btsnoop capture")
+        return False
+    capture_name = os.path.join(log_path, f"{interface}_hci.btsnoop")
+    try:
+        hci_capture.start_capture(capture_name, interface, log,
+                                  capture_filter.clone() if capture_filter else None)
+    except (OSError, ValueError) as e:
+        log.info(f"[ERROR] Failed to start btsnoop capture: {e}")
+        return False
+    return capture_name
+
+
+def stop_btsnoop_capture(log, interface):
+    """
+    Stops the btsnoop capture of an interface, if running.
+
+    Args:
+        log (Logger): Logger instance used for logging.
+        interface (str): The Bluetooth interface the capture was started for.
+
+    Returns:
+        bool: True if a capture was stopped, False if none was running.
+    """
+    log.info("[INFO] Stopping btsnoop capture")
+    return hci_capture.stop_capture(interface)
+
+
+def set_capture_filter(log, interface, capture_filter):
+    """
+    Applies a capture filter to the running hcidump log and btsnoop capture of an interface.
+
+    Args:
+        log (Logger): Logger instance used for logging.
+        interface (str): The Bluetooth interface the logs were started for.
+        capture_filter (CaptureFilter): New filter; an empty filter keeps everything.
+
+    Returns:
+        bool: True if a running hcidump log or btsnoop capture was updated.
+    """
+    updated = hci_capture.set_capture_filter(interface, capture_filter.clone())
+    managed = ProcessSupervisor.get_instance(log).get(_hcidump_name(interface))
+    if managed:
+        # The same stream filter is handed to the log pump of a restarted hcidump
+        stream_filter = managed.logging_options.get("stream_filter")
+        if stream_filter is not None:
+            stream_filter.capture_filter = capture_filter.clone()
+        elif capture_filter:
+            stream_filter = managed.logging_options["stream_filter"] = HcidumpStreamFilter(capture_filter.clone())
+        if managed.pump:
+            managed.pump.stream_filter = stream_filter
+        updated = True
+    log.info(f"[INFO] Capture filter for {interface}: {capture_filter.format() or 'none'}")
+    return updated